@@ -0,0 +1,203 @@
+"""Measure cold-start cost of the scraper: module import and first handler call.
+
+Each run starts a fresh interpreter, imports ``apple_web_scrape`` the way the
+Lambda runtime does (flat module path) and invokes the handler against a
+localhost stand-in that answers the page fetch with 304 Not Modified and the
+page-state BatchGetItem with a stored ETag, i.e. the common "nothing changed"
+invocation. A second call shows the warm cost. ``-X importtime`` output from
+the child lists the heaviest top-level imports:
+
+    python benchmarks/bench_cold_start.py --runs 10
+    python benchmarks/bench_cold_start.py --runs 10 --baseline HEAD~1
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.sample_pages import release_list_html  # noqa: E402
+
+TABLE_NAME = "apple_os_updates_bench"
+PAGE_PATH = "/en-us/100100"
+PAGE_ETAG = '"bench-v1"'
+
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+import apple_web_scrape
+imported = time.perf_counter()
+apple_web_scrape.lambda_handler({}, None)
+first_call = time.perf_counter()
+apple_web_scrape.lambda_handler({}, None)
+warm_call = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "first_call_ms": (first_call - imported) * 1000,
+    "warm_call_ms": (warm_call - first_call) * 1000,
+    "boto3_loaded": "boto3" in sys.modules,
+    "bs4_loaded": "bs4" in sys.modules,
+}))
+"""
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves the release page (with ETag) and a minimal DynamoDB JSON API."""
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == PAGE_ETAG:
+            self._reply(304, b"")
+        else:
+            self._reply(200, release_list_html().encode(), {"ETag": PAGE_ETAG})
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        operation = self.headers.get("X-Amz-Target", "").rsplit(".", 1)[-1]
+        body = {}
+        if operation == "BatchGetItem":
+            page_url = f"http://{self.headers['Host']}{PAGE_PATH}"
+            body = {
+                "Responses": {
+                    TABLE_NAME: [
+                        {"device": {"S": f"page#{page_url}"}, "ETag": {"S": PAGE_ETAG}}
+                    ]
+                },
+                "UnprocessedKeys": {},
+            }
+        self._reply(
+            200,
+            json.dumps(body).encode(),
+            {"Content-Type": "application/x-amz-json-1.0"},
+        )
+
+    def _reply(self, status, body, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def extract_lambdas(ref, destination):
+    """Writes ``lambdas/`` as of a git ref into ``destination``."""
+    archive = subprocess.run(
+        ["git", "archive", ref, "lambdas"],
+        cwd=REPO_ROOT,
+        check=True,
+        capture_output=True,
+    ).stdout
+    with tarfile.open(fileobj=BytesIO(archive)) as tar:
+        tar.extractall(destination, filter="data")
+    return os.path.join(destination, "lambdas")
+
+
+def top_imports(importtime_output, count):
+    """Top-level modules from ``-X importtime`` output by cumulative microseconds."""
+    imports = []
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if not name.startswith("  "):
+            imports.append((int(cumulative), name.strip()))
+    return sorted(imports, reverse=True)[:count]
+
+
+def run_child(lambda_dir, endpoint):
+    env = {
+        **os.environ,
+        "AWS_ACCESS_KEY_ID": "testing",
+        "AWS_SECRET_ACCESS_KEY": "testing",
+        "AWS_DEFAULT_REGION": "us-east-2",
+        "AWS_ENDPOINT_URL_DYNAMODB": endpoint,
+        "dynamodb_table_name": TABLE_NAME,
+        "apple_release_urls": f"{endpoint}{PAGE_PATH}",
+        "emit_metrics": "false",
+        "PYTHONDONTWRITEBYTECODE": "1",
+    }
+    env.pop("trace_export_path", None)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD],
+        cwd=lambda_dir,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1]), result.stderr
+
+
+def measure(label, lambda_dir, endpoint, runs):
+    samples = [run_child(lambda_dir, endpoint) for _ in range(runs)]
+    results = [sample for sample, _ in samples]
+    summary = {
+        name: statistics.median(result[name] for result in results)
+        for name in ("import_ms", "first_call_ms", "warm_call_ms")
+    }
+    print(
+        f"{label:<10} import {summary['import_ms']:8.1f} ms"
+        f"   first call {summary['first_call_ms']:8.1f} ms"
+        f"   cold total {summary['import_ms'] + summary['first_call_ms']:8.1f} ms"
+        f"   warm call {summary['warm_call_ms']:6.1f} ms"
+    )
+    print(
+        f"{'':<10} boto3 loaded: {results[-1]['boto3_loaded']}"
+        f"   bs4 loaded: {results[-1]['bs4_loaded']}"
+    )
+    for cumulative, name in top_imports(samples[-1][1], 5):
+        print(f"{'':<10}   {cumulative / 1000:8.1f} ms  {name}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--baseline", help="Git ref whose lambdas/ to measure for comparison"
+    )
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            if args.baseline:
+                baseline = measure(
+                    args.baseline,
+                    extract_lambdas(args.baseline, workdir),
+                    endpoint,
+                    args.runs,
+                )
+            current = measure(
+                "current", os.path.join(REPO_ROOT, "lambdas"), endpoint, args.runs
+            )
+            if args.baseline:
+                before = baseline["import_ms"] + baseline["first_call_ms"]
+                after = current["import_ms"] + current["first_call_ms"]
+                print(
+                    f"import: {baseline['import_ms'] / current['import_ms']:.1f}x faster"
+                    f"   cold total: {before - after:.1f} ms saved"
+                )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Compare per-device GetItem reads with a single BatchGetItem read.
+
+Runs against moto with an injected per-request delay so the numbers reflect
+round trips rather than moto's own overhead:
+
+    python benchmarks/bench_dynamodb_reads.py --latency-ms 15 --runs 20
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import boto3
+from moto import mock_aws
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-2")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from lambdas.apple_utils import get_device_item, get_device_items  # noqa: E402
+
+DEVICES = ["iOS", "macOS", "watchOS", "tvOS", "visionOS"]
+
+
+def create_table():
+    dynamodb = boto3.resource("dynamodb", region_name="us-east-2")
+    table = dynamodb.create_table(
+        TableName="apple_os_updates_bench",
+        KeySchema=[{"AttributeName": "device", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "device", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    for device in DEVICES:
+        table.put_item(Item={"device": device, "ReleaseVersion": "26.0.1"})
+    return table
+
+
+def inject_latency(client, latency_seconds):
+    def delay(**kwargs):
+        time.sleep(latency_seconds)
+
+    client.meta.events.register("before-send.dynamodb.*", delay)
+
+
+def measure(label, func, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    print(
+        f"{label:<22} median {statistics.median(samples):8.2f} ms"
+        f"   p95 {sorted(samples)[int(len(samples) * 0.95) - 1]:8.2f} ms"
+    )
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency-ms", type=float, default=15.0)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    with mock_aws():
+        table = create_table()
+        inject_latency(table.meta.client, args.latency_ms / 1000)
+
+        print(f"{len(DEVICES)} devices, {args.latency_ms} ms injected per request")
+        serial = measure(
+            "GetItem per device",
+            lambda: [get_device_item(table, device) for device in DEVICES],
+            args.runs,
+        )
+        batched = measure(
+            "BatchGetItem", lambda: get_device_items(table, DEVICES), args.runs
+        )
+        print(f"speedup: {serial / batched:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Compare the sequential and concurrent scrape pipelines end to end.
+
+Runs ``scrape_releases`` against moto (with an injected per-request DynamoDB
+delay) and a localhost page server (with an injected response delay). Each
+run resets the table so exactly one device has a new release, the common
+"something changed" invocation. Both pipelines issue a conditional write
+per device; the sequential one sends them one after another, the concurrent
+one in parallel:
+
+    python benchmarks/bench_pipeline.py --fetch-ms 120 --latency-ms 15 --runs 20
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from moto import mock_aws
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-2")
+os.environ["emit_metrics"] = "false"
+os.environ["release_notification_mode"] = "stream"
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from benchmarks.sample_pages import RELEASES, apple_release_page  # noqa: E402
+from lambdas import apple_web_scrape  # noqa: E402
+from lambdas.apple_utils import (  # noqa: E402
+    clear_release_state_cache,
+    create_dynamodb_resource,
+)
+
+TABLE_NAME = "apple_os_updates_bench"
+PAGE_PATH = "/en-us/100100"
+
+
+def serve_page(delay_seconds):
+    body = apple_release_page().encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            time.sleep(delay_seconds)
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def create_table():
+    table = create_dynamodb_resource().create_table(
+        TableName=TABLE_NAME,
+        KeySchema=[{"AttributeName": "device", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "device", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    return table
+
+
+def reset_table(table, page_url):
+    """Stores the current releases except an older iOS, and no page state."""
+    # The table is edited behind the scraper's back, so start with no cache
+    clear_release_state_cache()
+    for device, statement in RELEASES.items():
+        version = statement.rstrip(".").rsplit(" ", 1)[-1]
+        table.put_item(
+            Item={
+                "device": device,
+                "ReleaseVersion": "26.0" if device == "iOS" else version,
+            }
+        )
+    table.delete_item(Key={"device": f"page#{page_url}"})
+
+
+def inject_latency(client, latency_seconds):
+    def delay(**kwargs):
+        time.sleep(latency_seconds)
+
+    client.meta.events.register("before-send.dynamodb.*", delay)
+
+
+def measure(label, mode, table, page_url, runs):
+    os.environ["pipeline_mode"] = mode
+    calls = {}
+
+    def record(model, **kwargs):
+        calls[model.name] = calls.get(model.name, 0) + 1
+
+    samples = []
+    for _ in range(runs):
+        reset_table(table, page_url)
+        calls.clear()
+        table.meta.client.meta.events.register("before-call.*.*", record)
+        start = time.perf_counter()
+        apple_web_scrape.scrape_releases(None)
+        samples.append((time.perf_counter() - start) * 1000)
+        table.meta.client.meta.events.unregister("before-call.*.*", record)
+    print(
+        f"{label:<12} median {statistics.median(samples):8.2f} ms"
+        f"   p95 {sorted(samples)[int(len(samples) * 0.95) - 1]:8.2f} ms"
+        f"   requests/run {dict(sorted(calls.items()))}"
+    )
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fetch-ms", type=float, default=120.0)
+    parser.add_argument("--latency-ms", type=float, default=15.0)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    server = serve_page(args.fetch_ms / 1000)
+    page_url = f"http://127.0.0.1:{server.server_address[1]}{PAGE_PATH}"
+    os.environ["apple_release_urls"] = page_url
+    os.environ["dynamodb_table_name"] = TABLE_NAME
+
+    try:
+        with mock_aws():
+            table = create_table()
+            inject_latency(table.meta.client, args.latency_ms / 1000)
+            print(
+                f"page fetch {args.fetch_ms} ms, "
+                f"{args.latency_ms} ms injected per DynamoDB request"
+            )
+            sequential = measure("sequential", "sequential", table, page_url, args.runs)
+            concurrent = measure("concurrent", "concurrent", table, page_url, args.runs)
+            print(
+                f"speedup: {sequential / concurrent:.2f}x"
+                f"   saved {sequential - concurrent:.1f} ms per run"
+            )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Compare the streaming release-list parser with the BeautifulSoup DOM path.
+
+Reports wall time and peak Python memory (tracemalloc) for each path on a
+synthetic page, or on a saved page passed with --page:
+
+    python benchmarks/bench_release_parse.py --runs 10
+    python benchmarks/bench_release_parse.py --page saved_100100.html
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-2")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from benchmarks.sample_pages import apple_release_page  # noqa: E402
+from lambdas.apple_web_scrape import (  # noqa: E402
+    match_release_statements,
+    parse_release_paragraphs_fast,
+    parse_release_paragraphs_soup,
+)
+
+
+def measure(label, func, page, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = match_release_statements(func(page))
+        samples.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    func(page)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{label:<6} median {statistics.median(samples):8.2f} ms"
+        f"   peak {peak / 1024 / 1024:7.2f} MiB   devices {len(result)}"
+    )
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--page", help="Saved HTML page to parse instead of a synthetic one"
+    )
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.page:
+        with open(args.page, encoding="utf-8", errors="ignore") as page_file:
+            page = page_file.read()
+    else:
+        page = apple_release_page()
+
+    print(f"page size: {len(page) / 1024:.0f} KiB")
+    fast_ms, fast = measure("fast", parse_release_paragraphs_fast, page, args.runs)
+    soup_ms, soup = measure("soup", parse_release_paragraphs_soup, page, args.runs)
+    print(f"speedup: {soup_ms / fast_ms:.1f}x   identical output: {fast == soup}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Match release changes against a large synthetic subscriber registry.
+
+Builds the device/version-range index from --subscriptions synthetic rules and
+compares matching one scrape's changed releases with a linear scan of every
+rule:
+
+    python benchmarks/bench_subscriber_match.py --subscriptions 100000 --runs 20
+
+``--patch-versions`` draws ``MinVersion`` from patch-level versions
+("17.4.12"), so almost every rule adds its own range boundary; the build
+reports its peak traced memory for that worst case.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-2")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from lambdas.apple_subscription import (  # noqa: E402
+    SubscriptionIndex,
+    is_major_release,
+    subscription_rule,
+)
+from lambdas.apple_utils import release_history_sort_key  # noqa: E402
+
+DEVICES = ["iOS", "macOS", "watchOS", "tvOS", "visionOS"]
+CHANGED_RELEASES = [
+    {"device": "iOS", "release_version": "26.0.1"},
+    {"device": "macOS", "release_version": "26.0"},
+    {"device": "watchOS", "release_version": "26.0.2"},
+    {"device": "tvOS", "release_version": "18.6"},
+    {"device": "visionOS", "release_version": "2.6"},
+]
+
+
+def min_version(rng, patch_versions):
+    if patch_versions:
+        return f"{rng.randint(2, 26)}.{rng.randint(0, 9)}.{rng.randint(0, 99)}"
+    return f"{rng.randint(2, 26)}.{rng.choice([0, 0, 2, 4])}"
+
+
+def synthetic_subscriptions(count, channels, patch_versions=False, seed=13):
+    rng = random.Random(seed)
+    subscriptions = []
+    for number in range(count):
+        item = {
+            "SubscriptionId": f"sub-{number}",
+            "Device": rng.choice(DEVICES),
+            "Channel": f"arn:aws:sns:us-east-2:123456789012:apple-subscribers-{number % channels}",
+        }
+        if rng.random() < 0.7:
+            item["MinVersion"] = min_version(rng, patch_versions)
+        if rng.random() < 0.2:
+            item["MaxVersion"] = f"{rng.randint(3, 27)}"
+        if rng.random() < 0.15:
+            item["MajorOnly"] = True
+        subscriptions.append(item)
+    return subscriptions
+
+
+def linear_deliveries(rules, changed_releases):
+    deliveries = {}
+    for release in changed_releases:
+        key = release_history_sort_key(release["release_version"])
+        major = is_major_release(release["release_version"])
+        channels = set()
+        for low, high, subscription in rules:
+            if subscription["Device"] != release["device"]:
+                continue
+            if subscription.get("MajorOnly") and not major:
+                continue
+            if (low is None or low <= key) and (high is None or key < high):
+                channels.add(subscription["Channel"])
+        for channel in channels:
+            deliveries.setdefault(channel, []).append(release)
+    return deliveries
+
+
+def timed(func, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--subscriptions", type=int, default=100_000)
+    parser.add_argument("--channels", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument(
+        "--patch-versions",
+        action="store_true",
+        help="Patch-level MinVersion values (one range boundary per rule)",
+    )
+    args = parser.parse_args()
+
+    subscriptions = synthetic_subscriptions(
+        args.subscriptions, args.channels, args.patch_versions
+    )
+
+    start = time.perf_counter()
+    index = SubscriptionIndex(subscriptions)
+    build_ms = (time.perf_counter() - start) * 1000
+    # Tracing slows the build several times over, so measure memory separately
+    tracemalloc.start()
+    SubscriptionIndex(subscriptions)
+    build_peak_mib = tracemalloc.get_traced_memory()[1] / (1 << 20)
+    tracemalloc.stop()
+    rules = [subscription_rule(subscription) for subscription in subscriptions]
+
+    index_ms, indexed = timed(lambda: index.deliveries(CHANGED_RELEASES), args.runs)
+    linear_ms, linear = timed(
+        lambda: linear_deliveries(rules, CHANGED_RELEASES), args.runs
+    )
+    matched = sum(
+        len(index.match(r["device"], r["release_version"])) for r in CHANGED_RELEASES
+    )
+
+    print(
+        f"subscriptions: {index.size}   channels: {args.channels}   "
+        f"matched rules: {matched}   channels delivered: {len(indexed)}"
+    )
+    print(
+        f"index build  {build_ms:9.2f} ms (once per warm container), "
+        f"peak {build_peak_mib:.1f} MiB traced"
+    )
+    print(f"index match  {index_ms:9.2f} ms median")
+    print(f"linear scan  {linear_ms:9.2f} ms median")
+    print(
+        f"speedup: {linear_ms / index_ms:.1f}x   identical deliveries: "
+        f"{ {c: len(r) for c, r in indexed.items()} == {c: len(r) for c, r in linear.items()} }"
+    )
+
+
+if __name__ == "__main__":
+    main()
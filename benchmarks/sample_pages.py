@@ -0,0 +1,69 @@
+"""Synthetic Apple security-release pages shaped like support.apple.com/100100."""
+
+RELEASES = {
+    "iOS": "The latest version of iOS and iPadOS is 26.0.1.",
+    "macOS": "The latest version of macOS is 26.0.1.",
+    "watchOS": "The latest version of watchOS is 26.0.2.",
+    "tvOS": "The latest version of tvOS is 26.0.1.",
+    "visionOS": "The latest version of visionOS is 26.0.1.",
+}
+
+HISTORY_NAMES = [
+    "iOS {v} and iPadOS {v}",
+    "macOS Tahoe {v}",
+    "watchOS {v}",
+    "tvOS {v}",
+    "visionOS {v}",
+    "Safari {v}",
+]
+
+MONTHS = [
+    "Jan",
+    "Feb",
+    "Mar",
+    "Apr",
+    "May",
+    "Jun",
+    "Jul",
+    "Aug",
+    "Sep",
+    "Oct",
+    "Nov",
+    "Dec",
+]
+
+
+def release_list_html():
+    items = "".join(
+        f'<li class="gb-list_item"><p class="gb-paragraph">{text}</p></li>'
+        for text in RELEASES.values()
+    )
+    return f'<ul class="list gb-list">{items}</ul>'
+
+
+def history_rows_html(rows):
+    parts = []
+    for index in range(rows):
+        major, minor = 26 - index // 60, (index // 6) % 10
+        name = HISTORY_NAMES[index % len(HISTORY_NAMES)].format(v=f"{major}.{minor}")
+        day, month, year = 1 + index % 28, MONTHS[index % 12], 2025 - index // 300
+        parts.append(
+            f'<tr><td><a href="https://support.apple.com/en-us/{120000 + index}">'
+            f"{name}</a></td><td>iPhone XS and later</td>"
+            f"<td>{day:02d} {month} {year}</td></tr>"
+        )
+    return "".join(parts)
+
+
+def apple_release_page(history_rows=3000, script_bytes=200_000):
+    """Return a page with the release list followed by a long history table."""
+    script = "<script>window.__token='" + "x" * script_bytes + "';</script>"
+    return (
+        "<!DOCTYPE html><html><head><title>Apple security releases</title>"
+        f"{script}</head><body><div class='main'>"
+        f"<h2>Latest releases</h2>{release_list_html()}"
+        "<h2>Apple security releases</h2><div class='table-wrapper'><table>"
+        "<tr><th>Name and information link</th><th>Available for</th>"
+        f"<th>Release date</th></tr>{history_rows_html(history_rows)}</table></div>"
+        f"</div><footer>{script}</footer></body></html>"
+    )
@@ -11,7 +11,29 @@ SCRIPT_DIR="$(cd -- "$(dirname -- "${BASH_SOURCE[0]}")" &>/dev/null && pwd)"
 cd "$SCRIPT_DIR"
 
 # Define Lambda handlers to package
-LAMBDA_HANDLERS=("apple_web_scrape")
+LAMBDA_HANDLERS=("apple_web_scrape" "apple_release_stream" "apple_release_api")
+
+# Modules copied into every package alongside the handler
+SHARED_MODULES=("apple_utils" "apple_web_scrape" "apple_subscription" "apple_metrics" "apple_tracing" "apple_snapshot" "apple_feed")
+
+# Python version of the Lambda runtime (terraform/locals.tf python_version).
+# Sourceless bytecode only loads on the interpreter version that compiled it.
+LAMBDA_RUNTIME_PYTHON="${LAMBDA_RUNTIME_PYTHON:-3.13}"
+
+# Ship optimized (-OO), sourceless .pyc files instead of .py sources
+PRECOMPILE_BYTECODE="${PRECOMPILE_BYTECODE:-true}"
+
+# Build fails when an artifact exceeds either budget
+ZIP_SIZE_BUDGET_BYTES="${ZIP_SIZE_BUDGET_BYTES:-1048576}"
+IMPORT_TIME_BUDGET_MS="${IMPORT_TIME_BUDGET_MS:-300}"
+IMPORT_TIME_RUNS="${IMPORT_TIME_RUNS:-5}"
+
+# Files the handlers never load: tests, docs and typing stubs
+PRUNE_DIRS=("tests" "test" "docs" "bin")
+PRUNE_FILES=("*.pyi" "py.typed" "*.md" "*.rst")
+# bs4 tree builders for lxml/html5lib (neither is installed; bs4 skips them on
+# ImportError) and its debugging helper
+PRUNE_PATHS=("bs4/builder/_lxml.py" "bs4/builder/_html5lib.py" "bs4/diagnose.py")
 
 # --- Pick a Python interpreter compatible with pyproject requires-python (>=3.13) ---
 is_compatible_python() {
@@ -59,15 +81,105 @@ fi
 echo "Using Python interpreter: $PYTHON_BIN"
 "$PYTHON_BIN" --version || true
 
+BUILD_PYTHON_VERSION="$("$PYTHON_BIN" -c 'import sys; print(f"{sys.version_info.major}.{sys.version_info.minor}")')"
+if [[ "$PRECOMPILE_BYTECODE" == "true" && "$BUILD_PYTHON_VERSION" != "$LAMBDA_RUNTIME_PYTHON" ]]; then
+  echo "Warning: building with Python $BUILD_PYTHON_VERSION but the runtime is $LAMBDA_RUNTIME_PYTHON; shipping sources instead of bytecode."
+  PRECOMPILE_BYTECODE="false"
+fi
+
 # Always start clean
 echo "Removing any previous artifacts"
-rm -f *.zip
-rm -rf package_*
+rm -f *.zip *.manifest.json
+rm -rf package_* .lambda_runtime_sdk
 
 LAMBDA_REQ_FILE=".tmp_lambda_requirements.txt"
 echo "Exporting runtime dependency lock from pyproject.toml"
+# boto3/botocore are dev-only dependencies: the Lambda runtime provides them
 uv export --no-dev --no-hashes --format requirements-txt > "$LAMBDA_REQ_FILE"
 
+# The runtime's SDK, installed outside the packages, so import time is
+# measured against the same modules Lambda will load
+RUNTIME_SDK_DIR=".lambda_runtime_sdk"
+BOTO3_PIN="$(grep -o '"boto3==[^"]*"' pyproject.toml | tr -d '"')"
+echo "Installing runtime SDK for import measurement: $BOTO3_PIN"
+uv pip install --quiet --compile-bytecode --python "$PYTHON_BIN" --target "$RUNTIME_SDK_DIR" "$BOTO3_PIN"
+
+prune_package() {
+  local pkg_dir="$1"
+  for name in "${PRUNE_DIRS[@]}"; do
+    find "$pkg_dir" -mindepth 2 -type d -name "$name" -prune -exec rm -rf {} +
+  done
+  for pattern in "${PRUNE_FILES[@]}"; do
+    find "$pkg_dir" -mindepth 2 -type f -name "$pattern" -not -path "*.dist-info/*" -delete
+  done
+  for path in "${PRUNE_PATHS[@]}"; do
+    rm -f "$pkg_dir/$path"
+  done
+  find "$pkg_dir" -type d -name "__pycache__" -prune -exec rm -rf {} +
+  find "$pkg_dir" -type f -name "*.pyc" -delete
+}
+
+compile_package() {
+  local pkg_dir="$1"
+  # -b writes legacy module.pyc next to each source so it imports without the .py
+  "$PYTHON_BIN" -m compileall -q -b -f -o 2 "$pkg_dir"
+  find "$pkg_dir" -type f -name "*.py" -not -path "*.dist-info/*" -delete
+}
+
+# Median seconds-to-import of the handler in fresh interpreters, in milliseconds
+measure_import_ms() {
+  local pkg_dir="$1" handler="$2"
+  "$PYTHON_BIN" - "$pkg_dir" "$RUNTIME_SDK_DIR" "$handler" "$IMPORT_TIME_RUNS" <<'PY'
+import os, statistics, subprocess, sys
+
+pkg_dir, sdk_dir, handler, runs = sys.argv[1:]
+child = (
+    "import sys, time; sys.path[:0] = sys.argv[1:3]; started = time.perf_counter(); "
+    f"import {handler}; print((time.perf_counter() - started) * 1000)"
+)
+env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1", "AWS_DEFAULT_REGION": "us-east-1"}
+samples = [
+    float(subprocess.run(
+        [sys.executable, "-S", "-c", child, os.path.abspath(pkg_dir), os.path.abspath(sdk_dir)],
+        env=env, check=True, capture_output=True, text=True,
+    ).stdout.split()[-1])
+    for _ in range(int(runs))
+]
+print(f"{statistics.median(samples):.1f}")
+PY
+}
+
+write_manifest() {
+  local handler="$1" pkg_dir="$2" zip_name="$3" import_ms="$4"
+  "$PYTHON_BIN" - "$handler" "$pkg_dir" "$zip_name" "$import_ms" "$PRECOMPILE_BYTECODE" \
+    "$BUILD_PYTHON_VERSION" "$ZIP_SIZE_BUDGET_BYTES" "$IMPORT_TIME_BUDGET_MS" <<'PY'
+import json, os, sys
+
+handler, pkg_dir, zip_name, import_ms, bytecode, python, size_budget, import_budget = sys.argv[1:]
+files = [os.path.join(root, name) for root, _, names in os.walk(pkg_dir) for name in names]
+packages = sorted(
+    entry.name[: -len(".dist-info")]
+    for entry in os.scandir(pkg_dir)
+    if entry.name.endswith(".dist-info")
+)
+manifest = {
+    "handler": handler,
+    "artifact": zip_name,
+    "zip_bytes": os.path.getsize(zip_name),
+    "unpacked_bytes": sum(os.path.getsize(path) for path in files),
+    "file_count": len(files),
+    "import_ms": float(import_ms),
+    "bytecode": bytecode == "true",
+    "python": python,
+    "packages": packages,
+    "budget": {"zip_bytes": int(size_budget), "import_ms": float(import_budget)},
+}
+with open(f"{handler}.manifest.json", "w") as manifest_file:
+    json.dump(manifest, manifest_file, indent=2)
+print(json.dumps(manifest))
+PY
+}
+
 # Build each Lambda package
 for HANDLER in "${LAMBDA_HANDLERS[@]}"; do
   echo ""
@@ -83,33 +195,55 @@ for HANDLER in "${LAMBDA_HANDLERS[@]}"; do
   
   echo "Copying Lambda handler and shared utilities"
   cp "lambdas/${HANDLER}.py" "$PKG_DIR/"
-  cp "lambdas/apple_utils.py" "$PKG_DIR/"
+  for MODULE in "${SHARED_MODULES[@]}"; do
+    cp "lambdas/${MODULE}.py" "$PKG_DIR/"
+  done
   
   echo "Installing dependencies to $PKG_DIR"
   uv pip install --python "$PYTHON_BIN" --target "$PKG_DIR" -r "$LAMBDA_REQ_FILE"
   
-  echo "Removing __pycache__ and *.pyc to reduce package size"
-  find "$PKG_DIR" -type d -name "__pycache__" -prune -exec rm -rf {} + || true
-  find "$PKG_DIR" -type f -name "*.pyc" -delete || true
+  echo "Removing tests, docs, typing stubs, unused bs4 builders and caches"
+  prune_package "$PKG_DIR"
+
+  if [[ "$PRECOMPILE_BYTECODE" == "true" ]]; then
+    echo "Precompiling sourceless bytecode (optimization level 2)"
+    compile_package "$PKG_DIR"
+  fi
   
   echo "Creating deployment package: $ZIP_NAME"
   (
     cd "$PKG_DIR"
-    zip -r -q -X "../$ZIP_NAME" .
+    zip -r -q -9 -X "../$ZIP_NAME" .
   )
   
   echo "✓ Package created: $PWD/$ZIP_NAME"
+
+  echo "Measuring import time of $HANDLER ($IMPORT_TIME_RUNS fresh interpreters)"
+  IMPORT_MS="$(measure_import_ms "$PKG_DIR" "$HANDLER")"
+  write_manifest "$HANDLER" "$PKG_DIR" "$ZIP_NAME" "$IMPORT_MS"
+
+  ZIP_BYTES="$(wc -c < "$ZIP_NAME" | tr -d ' ')"
+  if (( ZIP_BYTES > ZIP_SIZE_BUDGET_BYTES )); then
+    echo "✗ $ZIP_NAME is $ZIP_BYTES bytes, over the $ZIP_SIZE_BUDGET_BYTES byte budget."
+    exit 1
+  fi
+  if ! "$PYTHON_BIN" -c 'import sys; raise SystemExit(float(sys.argv[1]) > float(sys.argv[2]))' "$IMPORT_MS" "$IMPORT_TIME_BUDGET_MS"; then
+    echo "✗ $HANDLER imports in $IMPORT_MS ms, over the $IMPORT_TIME_BUDGET_MS ms budget."
+    exit 1
+  fi
+  echo "✓ Within budget: $ZIP_BYTES bytes, $IMPORT_MS ms import"
   
   echo "Cleaning up temporary directory: $PKG_DIR"
   rm -rf "$PKG_DIR"
 done
 
 rm -f "$LAMBDA_REQ_FILE"
+rm -rf "$RUNTIME_SDK_DIR"
 
 echo ""
 echo "========================================="
 echo "Build complete! Created packages:"
 for HANDLER in "${LAMBDA_HANDLERS[@]}"; do
-  echo "  - ${HANDLER}.zip"
+  echo "  - ${HANDLER}.zip (manifest: ${HANDLER}.manifest.json)"
 done
 echo "========================================="
\ No newline at end of file
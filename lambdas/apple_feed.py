@@ -0,0 +1,188 @@
+"""Static release feed (latest.json and RSS) published to S3 when releases change."""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from xml.sax.saxutils import escape
+from botocore.exceptions import ClientError, BotoCoreError
+
+try:
+    from .apple_metrics import add_metric, timed_phase
+    from .apple_tracing import current_span, traced
+    from .apple_utils import get_s3_client, notify_error
+except ImportError:
+    from apple_metrics import add_metric, timed_phase
+    from apple_tracing import current_span, traced
+    from apple_utils import get_s3_client, notify_error
+
+# Constants
+FEED_BUCKET_ENV_VAR = "feed_bucket_name"
+FEED_KEY_PREFIX = "feed/"
+FEED_JSON_KEY = f"{FEED_KEY_PREFIX}latest.json"
+FEED_RSS_KEY = f"{FEED_KEY_PREFIX}releases.xml"
+FEED_MAX_ITEMS = 50
+FEED_COMPRESSION_LEVEL = 9
+FEED_LINK = "https://support.apple.com/en-us/100100"
+FEED_TITLE = "Apple OS releases"
+
+# Readers revalidate (the S3 ETag makes that a 304) rather than refetch; a
+# CDN in front may hold a copy for a few minutes
+FEED_CACHE_CONTROL = "public, max-age=300, stale-while-revalidate=60"
+
+# -------------------------------------------------------------------------
+# Logging Configuration
+# -------------------------------------------------------------------------
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+def read_feed_document(s3_client, bucket: str) -> dict:
+    """
+    Returns the published latest.json, whose ``recent_changes`` carry the
+    feed history forward, or an empty document when none is published yet.
+    Other errors (AccessDenied included: with ``s3:ListBucket`` granted, a
+    missing key is a NoSuchKey) propagate, because publishing over an
+    unread feed would drop its history.
+    """
+    try:
+        response = s3_client.get_object(Bucket=bucket, Key=FEED_JSON_KEY)
+    except ClientError as err:
+        if err.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+            return {}
+        raise
+    try:
+        return json.loads(gzip.decompress(response["Body"].read()))
+    except (OSError, ValueError) as err:
+        logger.warning(f"Ignoring unreadable {FEED_JSON_KEY}: {err}")
+        return {}
+
+
+def build_feed_document(latest_releases, changed_releases, previous, now) -> dict:
+    """
+    The latest.json document: every device's current release plus the most
+    recent changes (this run's first), capped at FEED_MAX_ITEMS.
+    """
+    detected_at = now.isoformat(timespec="seconds")
+    changes = [{**release, "detected_at": detected_at} for release in changed_releases]
+    return {
+        "updated_at": detected_at,
+        "releases": {
+            device: {
+                "version": version,
+                "statement": latest_releases["release_statements"].get(device, ""),
+            }
+            for device, version in latest_releases.items()
+            if device != "release_statements"
+        },
+        "recent_changes": (changes + previous.get("recent_changes", []))[
+            :FEED_MAX_ITEMS
+        ],
+    }
+
+
+def render_feed_json(document) -> bytes:
+    """latest.json rendering (sorted keys, so equal content renders identically)."""
+    return json.dumps(document, indent=2, sort_keys=True).encode("utf-8")
+
+
+def render_feed_rss(document) -> bytes:
+    """RSS 2.0 rendering of the document's recent changes."""
+    items = []
+    for change in document["recent_changes"]:
+        published = datetime.fromisoformat(change["detected_at"])
+        title = f"{change['device']} {change['release_version']}"
+        items.append(
+            "<item>"
+            f"<title>{escape(title)}</title>"
+            f"<link>{escape(FEED_LINK)}</link>"
+            f"<description>{escape(change.get('release_statement', ''))}</description>"
+            f'<guid isPermaLink="false">{escape(title.replace(" ", "-"))}</guid>'
+            f"<pubDate>{format_datetime(published)}</pubDate>"
+            "</item>"
+        )
+    updated = datetime.fromisoformat(document["updated_at"])
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<rss version="2.0"><channel>'
+        f"<title>{escape(FEED_TITLE)}</title>"
+        f"<link>{escape(FEED_LINK)}</link>"
+        "<description>Latest Apple operating system releases</description>"
+        f"<lastBuildDate>{format_datetime(updated)}</lastBuildDate>"
+        f"{''.join(items)}"
+        "</channel></rss>\n"
+    ).encode("utf-8")
+
+
+def put_feed_object(s3_client, bucket: str, key: str, body: bytes, content_type: str):
+    """Uploads one pre-gzipped feed file; returns its compressed size."""
+    compressed = gzip.compress(body, compresslevel=FEED_COMPRESSION_LEVEL, mtime=0)
+    s3_client.put_object(
+        Bucket=bucket,
+        Key=key,
+        Body=compressed,
+        ContentType=content_type,
+        ContentEncoding="gzip",
+        CacheControl=FEED_CACHE_CONTROL,
+        Metadata={"content-sha256": hashlib.sha256(body).hexdigest()},
+    )
+    return len(compressed)
+
+
+@timed_phase("Feed")
+@traced("publish_release_feed", {"aws.service": "s3"})
+def publish_release_feed(latest_releases, changed_releases, bucket=None, now=None):
+    """
+    Renders latest.json and the RSS feed once and uploads them gzipped to
+    the feed bucket (env var ``feed_bucket_name``). Only called for runs
+    with changes. Returns the uploaded keys, or None when publishing is off
+    or failed; failures are reported but never fail the scrape.
+    """
+    bucket = bucket or os.getenv(FEED_BUCKET_ENV_VAR)
+    if not bucket or not changed_releases:
+        return None
+
+    s3_client = get_s3_client()
+    span = current_span()
+    try:
+        document = build_feed_document(
+            latest_releases,
+            changed_releases,
+            read_feed_document(s3_client, bucket),
+            now or datetime.now(timezone.utc),
+        )
+        uploaded = put_feed_object(
+            s3_client,
+            bucket,
+            FEED_JSON_KEY,
+            render_feed_json(document),
+            "application/json; charset=utf-8",
+        )
+        uploaded += put_feed_object(
+            s3_client,
+            bucket,
+            FEED_RSS_KEY,
+            render_feed_rss(document),
+            "application/rss+xml; charset=utf-8",
+        )
+    except (ClientError, BotoCoreError) as err:
+        logger.error(f"Failed to publish release feed: {err}")
+        notify_error(
+            source="apple_feed",
+            error_message="Failed to publish release feed.",
+            details={"bucket": bucket, "exception": str(err)},
+        )
+        return None
+
+    add_metric("FeedBytes", uploaded, "Bytes")
+    span.set_attribute("item_count", len(document["recent_changes"]))
+    span.set_attribute("s3.object_size", uploaded)
+    logger.info(
+        f"Published release feed ({len(document['recent_changes'])} items, "
+        f"{uploaded} bytes gzipped)."
+    )
+    return [FEED_JSON_KEY, FEED_RSS_KEY]
@@ -0,0 +1,254 @@
+"""Backfill the release history table from Apple's security-release history."""
+
+import argparse
+import gzip
+import logging
+import os
+import re
+import time
+
+from datetime import datetime
+from html.parser import HTMLParser
+
+try:
+    from .apple_utils import (
+        create_dynamodb_resource,
+        merge_release_history_records,
+        release_history_sort_key,
+        HISTORY_WRITE_WORKERS,
+        DEVICE_LIST,
+        HISTORY_SORT_KEY,
+        HISTORY_TABLE_ENV_VAR,
+    )
+except ImportError:
+    from apple_utils import (
+        create_dynamodb_resource,
+        merge_release_history_records,
+        release_history_sort_key,
+        HISTORY_WRITE_WORKERS,
+        DEVICE_LIST,
+        HISTORY_SORT_KEY,
+        HISTORY_TABLE_ENV_VAR,
+    )
+
+# Constants
+PAGE_CHUNK_CHARS = 64 * 1024
+RELEASE_DATE_FORMATS = ("%d %b %Y", "%b %d, %Y", "%d %B %Y", "%B %d, %Y")
+
+# "iOS 26.0.1 and iPadOS 26.0.1", "macOS Tahoe 26.0.1", "iOS 16.5.1 (c) ..."
+HISTORY_NAME_RE = re.compile(
+    r"^(?P<device>" + "|".join(DEVICE_LIST) + r")"
+    r"(?:\s+[A-Z][a-z]+)*\s+(?P<version>\d+(?:\.\d+)*(?:\s*\([a-z]\))?)(?=\s|$)"
+)
+
+# -------------------------------------------------------------------------
+# Logging Configuration
+# -------------------------------------------------------------------------
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+class SecurityReleaseTableParser(HTMLParser):
+    """
+    Streaming parser for the security-release history table rows.
+
+    Feed it the page in chunks; every completed ``<tr>`` with at least three
+    ``<td>`` cells is appended to ``rows`` as ``(name, notes_url, date_text)``.
+    Callers drain ``rows`` between chunks so memory stays flat.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows = []
+        self._cells = None
+        self._text = None
+        self._link = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "tr":
+            self._cells, self._text, self._link = [], None, None
+        elif tag == "td" and self._cells is not None:
+            self._end_cell()
+            self._text = []
+        elif tag == "a" and self._text is not None and not self._cells:
+            self._link = self._link or dict(attrs).get("href")
+
+    def handle_endtag(self, tag):
+        if tag == "td":
+            self._end_cell()
+        elif tag == "tr" and self._cells is not None:
+            self._end_cell()
+            if len(self._cells) >= 3:
+                self.rows.append((self._cells[0], self._link, self._cells[2]))
+            self._cells = None
+
+    def handle_data(self, data):
+        if self._text is not None:
+            self._text.append(data)
+
+    def _end_cell(self):
+        if self._text is None:
+            return
+        self._cells.append(" ".join("".join(self._text).split()))
+        self._text = None
+
+
+def parse_release_date(date_text: str):
+    """Returns the release date as an ISO string, or None when it is not a date."""
+    for date_format in RELEASE_DATE_FORMATS:
+        try:
+            return datetime.strptime(date_text, date_format).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+def history_record(name: str, notes_url, date_text: str):
+    """
+    Converts one history table row into a compact record for a tracked
+    device, or returns None for rows about other products (Safari, Xcode,
+    iPadOS-only releases, ...).
+    """
+    match = HISTORY_NAME_RE.match(name)
+    if not match:
+        return None
+
+    version = " ".join(match.group("version").split())
+    record = {
+        "device": match.group("device"),
+        HISTORY_SORT_KEY: release_history_sort_key(version),
+        "ReleaseVersion": version,
+    }
+    release_date = parse_release_date(date_text)
+    if release_date:
+        record["ReleaseDate"] = release_date
+    if notes_url:
+        record["NotesUrl"] = notes_url
+    return record
+
+
+def iter_history_records(chunks):
+    """
+    Stream-parses page chunks and yields one record per tracked release.
+    A release listed twice is only yielded the first (most recent) time.
+    """
+    parser = SecurityReleaseTableParser()
+    seen = set()
+
+    def drain():
+        for row in parser.rows:
+            record = history_record(*row)
+            if not record:
+                continue
+            key = (record["device"], record[HISTORY_SORT_KEY])
+            if key not in seen:
+                seen.add(key)
+                yield record
+        parser.rows.clear()
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from drain()
+    parser.close()
+    yield from drain()
+
+
+def read_page_chunks(path: str, chunk_chars: int = PAGE_CHUNK_CHARS):
+    """Yields a saved page (plain or gzipped) in text chunks."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8", errors="replace") as page:
+        while chunk := page.read(chunk_chars):
+            yield chunk
+
+
+def backfill_release_history(table, chunks, workers: int = HISTORY_WRITE_WORKERS):
+    """
+    Parses the history table from page chunks and merges every record into
+    the history table. Keys are derived from the release itself and only
+    missing attributes are set, so re-running changes nothing and keeps
+    what the scraper recorded (statement, detection time).
+    Returns counts, elapsed seconds and throughput in records per second.
+    """
+    started = time.perf_counter()
+    records = list(iter_history_records(chunks))
+    parsed = time.perf_counter()
+    written = merge_release_history_records(table, records, workers=workers)
+    finished = time.perf_counter()
+
+    elapsed = finished - started
+    stats = {
+        "records": len(records),
+        "written": written,
+        "parse_seconds": round(parsed - started, 3),
+        "write_seconds": round(finished - parsed, 3),
+        "records_per_second": round(written / elapsed, 1) if elapsed else 0.0,
+    }
+    logger.info(f"Release history backfill complete: {stats}")
+    return stats
+
+
+def create_history_table(dynamodb, table_name: str):
+    """Creates the history table (for DynamoDB Local) shaped like terraform."""
+    table = dynamodb.create_table(
+        TableName=table_name,
+        KeySchema=[
+            {"AttributeName": "device", "KeyType": "HASH"},
+            {"AttributeName": HISTORY_SORT_KEY, "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "device", "AttributeType": "S"},
+            {"AttributeName": HISTORY_SORT_KEY, "AttributeType": "S"},
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    table.wait_until_exists()
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Backfill release history from a saved Apple security-release page."
+    )
+    parser.add_argument(
+        "--page", required=True, help="Saved page HTML (.html or .html.gz)"
+    )
+    parser.add_argument(
+        "--table",
+        default=os.getenv(HISTORY_TABLE_ENV_VAR),
+        help=f"History table name (default: ${HISTORY_TABLE_ENV_VAR})",
+    )
+    parser.add_argument(
+        "--endpoint-url", help="DynamoDB endpoint, e.g. http://localhost:8000"
+    )
+    parser.add_argument("--region", help="AWS region")
+    parser.add_argument("--workers", type=int, default=HISTORY_WRITE_WORKERS)
+    parser.add_argument(
+        "--create-table",
+        action="store_true",
+        help="Create the history table first (DynamoDB Local)",
+    )
+    args = parser.parse_args(argv)
+    if not args.table:
+        parser.error(f"--table or ${HISTORY_TABLE_ENV_VAR} is required")
+
+    logging.basicConfig(format="%(message)s")
+    dynamodb = create_dynamodb_resource(
+        region_name=args.region, endpoint_url=args.endpoint_url
+    )
+    if args.create_table:
+        table = create_history_table(dynamodb, args.table)
+    else:
+        table = dynamodb.Table(args.table)
+
+    stats = backfill_release_history(
+        table=table, chunks=read_page_chunks(args.page), workers=args.workers
+    )
+    print(
+        f"Wrote {stats['written']} release records to {args.table} "
+        f"({stats['records_per_second']} records/s)"
+    )
+    return stats
+
+
+if __name__ == "__main__":
+    main()
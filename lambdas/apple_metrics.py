@@ -0,0 +1,128 @@
+"""Phase timing metrics emitted as CloudWatch Embedded Metric Format (EMF)."""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+from contextlib import contextmanager
+
+# Constants
+METRICS_ENV_VAR = "emit_metrics"
+METRICS_NAMESPACE = "AppleUpdateNotification"
+
+# Recorder for the current invocation; None when metrics are off, so every
+# instrumentation point costs one global lookup
+_recorder = None
+_cold_start = True
+
+
+class MetricsRecorder:
+    """Accumulates metric values for one invocation (thread-safe)."""
+
+    def __init__(self):
+        self.values = {}
+        self.units = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, value, unit: str) -> None:
+        with self._lock:
+            self.values[name] = self.values.get(name, 0) + value
+            self.units[name] = unit
+
+
+def add_metric(name: str, value, unit: str = "Count") -> None:
+    """Adds ``value`` to a metric of the current invocation, if recording."""
+    recorder = _recorder
+    if recorder is not None:
+        recorder.add(name, value, unit)
+
+
+@contextmanager
+def phase(name: str):
+    """Times the block into the ``<name>Time`` metric (milliseconds)."""
+    recorder = _recorder
+    if recorder is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.add(
+            f"{name}Time", (time.perf_counter() - started) * 1000, "Milliseconds"
+        )
+
+
+def timed_phase(name: str):
+    """Decorator form of ``phase``; calls straight through when not recording."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _recorder is None:
+                return func(*args, **kwargs)
+            with phase(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def metrics_enabled() -> bool:
+    return os.getenv(METRICS_ENV_VAR, "true").lower() != "false"
+
+
+def emf_document(function_name: str, recorder: MetricsRecorder) -> dict:
+    """Builds the EMF document for one invocation's metrics."""
+    document = {
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [
+                {
+                    "Namespace": METRICS_NAMESPACE,
+                    "Dimensions": [["FunctionName"]],
+                    "Metrics": [
+                        {"Name": name, "Unit": recorder.units[name]}
+                        for name in recorder.values
+                    ],
+                }
+            ],
+        },
+        "FunctionName": function_name,
+    }
+    for name, value in recorder.values.items():
+        document[name] = round(value, 3) if isinstance(value, float) else value
+    return document
+
+
+@contextmanager
+def invocation_metrics(function_name: str):
+    """
+    Records metrics for one handler invocation and writes a single EMF line
+    to stdout when it ends, so CloudWatch extracts the metrics from the log
+    without any API call. Adds ``ColdStart`` and ``InvocationTime``.
+    Does nothing when env var ``emit_metrics`` is ``false``.
+    """
+    global _recorder, _cold_start
+    cold_start, _cold_start = _cold_start, False
+    if not metrics_enabled():
+        yield None
+        return
+
+    recorder = MetricsRecorder()
+    recorder.add("ColdStart", 1 if cold_start else 0, "Count")
+    _recorder = recorder
+    started = time.perf_counter()
+    try:
+        yield recorder
+    finally:
+        _recorder = None
+        recorder.add(
+            "InvocationTime", (time.perf_counter() - started) * 1000, "Milliseconds"
+        )
+        sys.stdout.write(json.dumps(emf_document(function_name, recorder)) + "\n")
+        sys.stdout.flush()
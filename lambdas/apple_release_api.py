@@ -0,0 +1,224 @@
+"""Read API for the current release versions (Lambda Function URL / API Gateway)."""
+
+import hashlib
+import json
+import logging
+import os
+import time
+
+try:
+    from .apple_metrics import invocation_metrics
+    from .apple_tracing import current_span, start_span
+    from .apple_utils import (
+        coalesce_errors,
+        create_dynamodb_resource,
+        env_int,
+        get_device_items,
+        notify_error,
+        DynamoDBItemNotFound,
+        DEVICE_LIST,
+        DYNAMODB_TABLE_ENV_VAR,
+    )
+except ImportError:
+    from apple_metrics import invocation_metrics
+    from apple_tracing import current_span, start_span
+    from apple_utils import (
+        coalesce_errors,
+        create_dynamodb_resource,
+        env_int,
+        get_device_items,
+        notify_error,
+        DynamoDBItemNotFound,
+        DEVICE_LIST,
+        DYNAMODB_TABLE_ENV_VAR,
+    )
+
+# Constants
+# Releases ship a few times a month, so a minute of staleness is invisible
+# while most requests are answered without touching DynamoDB
+RELEASE_API_CACHE_TTL_ENV_VAR = "release_api_cache_ttl_seconds"
+DEFAULT_RELEASE_API_CACHE_TTL_SECONDS = 60
+DEVICE_QUERY_PARAMETER = "device"
+ALLOWED_METHODS = ("GET", "HEAD")
+
+# -------------------------------------------------------------------------
+# Logging Configuration
+# -------------------------------------------------------------------------
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Current releases per table, kept across warm invocations:
+# table name -> (expires at, {device: version})
+_current_releases = {}
+
+
+def release_api_cache_ttl_seconds() -> int:
+    """Release map cache TTL, from the environment."""
+    return env_int(RELEASE_API_CACHE_TTL_ENV_VAR, DEFAULT_RELEASE_API_CACHE_TTL_SECONDS)
+
+
+def get_current_releases(table) -> dict:
+    """
+    Returns the stored device -> version map, refreshed with one
+    BatchGetItem at most once per TTL. When a refresh fails, the previous
+    map is served until DynamoDB answers again; with nothing cached the
+    DynamoDBItemNotFound propagates.
+    """
+    now = time.monotonic()
+    cached = _current_releases.get(table.name)
+    span = current_span()
+    span.set_attribute("cache_hit", bool(cached and cached[0] > now))
+    if cached and cached[0] > now:
+        return cached[1]
+
+    try:
+        items = get_device_items(table=table, devices=DEVICE_LIST)
+    except DynamoDBItemNotFound:
+        if cached is None:
+            raise
+        logger.warning("Release refresh failed; serving the previous release map.")
+        return cached[1]
+
+    releases = {
+        device: items[device]["ReleaseVersion"]
+        for device in DEVICE_LIST
+        if items.get(device, {}).get("ReleaseVersion")
+    }
+    _current_releases[table.name] = (now + release_api_cache_ttl_seconds(), releases)
+    return releases
+
+
+def release_etag(body: str) -> str:
+    """Strong ETag of a response body (quoted SHA-256 prefix)."""
+    return f'"{hashlib.sha256(body.encode("utf-8")).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match, etag: str) -> bool:
+    """
+    ``If-None-Match`` check: ``*`` or any listed tag matches. The comparison
+    is weak (RFC 9110), so a ``W/`` prefix added by a proxy still matches.
+    """
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in [tag.removeprefix("W/") for tag in tags]
+
+
+def request_method(event) -> str:
+    """HTTP method of a Function URL (payload 2.0) or API Gateway proxy event."""
+    return (
+        event.get("requestContext", {}).get("http", {}).get("method")
+        or event.get("httpMethod")
+        or "GET"
+    ).upper()
+
+
+def request_header(event, name: str):
+    """Case-insensitive header lookup (Function URLs lowercase header names)."""
+    for header, value in (event.get("headers") or {}).items():
+        if header.lower() == name:
+            return value
+    return None
+
+
+def requested_devices(event):
+    """
+    Devices named by ``?device=`` (repeated or comma-separated), or None for
+    every device. Raises ValueError for names not in DEVICE_LIST.
+    """
+    values = (event.get("multiValueQueryStringParameters") or {}).get(
+        DEVICE_QUERY_PARAMETER
+    ) or [(event.get("queryStringParameters") or {}).get(DEVICE_QUERY_PARAMETER)]
+    names = [name.strip() for value in values if value for name in value.split(",")]
+    names = [name for name in names if name]
+    if not names:
+        return None
+
+    by_lowercase = {device.lower(): device for device in DEVICE_LIST}
+    unknown = [name for name in names if name.lower() not in by_lowercase]
+    if unknown:
+        raise ValueError(f"Unknown device(s): {', '.join(unknown)}")
+    return list(dict.fromkeys(by_lowercase[name.lower()] for name in names))
+
+
+def json_response(status_code: int, payload=None, headers=None, body=None) -> dict:
+    """Proxy-integration response with a JSON body."""
+    if body is None and payload is not None:
+        body = json.dumps(payload, separators=(",", ":"))
+    return {
+        "statusCode": status_code,
+        "headers": {"Content-Type": "application/json", **(headers or {})},
+        "body": body or "",
+        "isBase64Encoded": False,
+    }
+
+
+def handle_release_request(event, table) -> dict:
+    """
+    Answers one read request with the current device -> version map.
+
+    The body is canonical JSON (sorted keys), so the ETag only changes with
+    the content. A matching ``If-None-Match`` gets an empty 304.
+    """
+    method = request_method(event)
+    if method not in ALLOWED_METHODS:
+        return json_response(
+            405,
+            {"error": f"Method {method} not allowed"},
+            {"Allow": ", ".join(ALLOWED_METHODS)},
+        )
+
+    try:
+        devices = requested_devices(event)
+    except ValueError as err:
+        return json_response(400, {"error": str(err), "devices": DEVICE_LIST})
+
+    try:
+        releases = get_current_releases(table)
+    except DynamoDBItemNotFound as err:
+        notify_error(
+            source="apple_release_api",
+            error_message="Failed to read current releases.",
+            details={"exception": str(err)},
+        )
+        return json_response(503, {"error": "Release data unavailable"})
+
+    if devices is not None:
+        releases = {
+            device: releases[device] for device in devices if device in releases
+        }
+    body = json.dumps(releases, sort_keys=True, separators=(",", ":"))
+    etag = release_etag(body)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={release_api_cache_ttl_seconds()}",
+    }
+
+    if etag_matches(request_header(event, "if-none-match"), etag):
+        return json_response(304, headers=headers)
+    return json_response(200, headers=headers, body="" if method == "HEAD" else body)
+
+
+def lambda_handler(event, context):
+    """
+    AWS Lambda entry-point function for the release read API. Error alerts
+    raised while answering are sent as one message.
+    """
+    dynamodb_table_name = os.getenv(DYNAMODB_TABLE_ENV_VAR)
+    if not dynamodb_table_name:
+        logger.error(f"Environment variable '{DYNAMODB_TABLE_ENV_VAR}' is not set.")
+        notify_error(
+            source="apple_release_api",
+            error_message="Missing required Lambda environment variable.",
+            details={"variable": DYNAMODB_TABLE_ENV_VAR},
+        )
+        return json_response(503, {"error": "Release data unavailable"})
+
+    table = create_dynamodb_resource().Table(dynamodb_table_name)
+    function_name = getattr(context, "function_name", "apple_release_api")
+    with invocation_metrics(function_name):
+        with start_span("apple_release_api", {"faas.name": function_name}) as span:
+            with coalesce_errors(source="apple_release_api", table=table):
+                response = handle_release_request(event, table)
+            span.set_attribute("http.status_code", response["statusCode"])
+            return response
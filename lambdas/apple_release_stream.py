@@ -0,0 +1,148 @@
+"""DynamoDB Streams consumer that turns release changes into notifications."""
+
+import logging
+import os
+
+from boto3.dynamodb.types import TypeDeserializer
+
+try:
+    from .apple_metrics import invocation_metrics
+    from .apple_tracing import start_span
+    from .apple_utils import (
+        coalesce_errors,
+        create_dynamodb_resource,
+        notify_error,
+        DEVICE_LIST,
+        DYNAMODB_TABLE_ENV_VAR,
+    )
+    from .apple_web_scrape import publish_release_changes
+except ImportError:
+    from apple_metrics import invocation_metrics
+    from apple_tracing import start_span
+    from apple_utils import (
+        coalesce_errors,
+        create_dynamodb_resource,
+        notify_error,
+        DEVICE_LIST,
+        DYNAMODB_TABLE_ENV_VAR,
+    )
+    from apple_web_scrape import publish_release_changes
+
+# Constants
+RELEASE_EVENT_NAMES = ("INSERT", "MODIFY")
+
+# -------------------------------------------------------------------------
+# Logging Configuration
+# -------------------------------------------------------------------------
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+deserializer = TypeDeserializer()
+
+
+def release_from_record(record):
+    """
+    Returns the release described by a stream record as a ``changed_releases``
+    entry, or None for records that are not device release writes (page state
+    items, deletes, images without a version).
+    """
+    if record.get("eventName") not in RELEASE_EVENT_NAMES:
+        return None
+    image = record.get("dynamodb", {}).get("NewImage")
+    if not image:
+        return None
+
+    item = {name: deserializer.deserialize(value) for name, value in image.items()}
+    if item.get("device") not in DEVICE_LIST or not item.get("ReleaseVersion"):
+        return None
+    return {
+        "device": item["device"],
+        "release_version": item["ReleaseVersion"],
+        "release_statement": item.get("ReleaseStatement", ""),
+    }
+
+
+def coalesce_release_records(records):
+    """
+    Collapses a batch of stream records into one release per device.
+    Returns ``(changed_releases, sequence_numbers)``; a device written several
+    times in the batch keeps its newest image. Malformed records are reported
+    and skipped so they cannot block the shard.
+    """
+    releases = {}
+    sequence_numbers = []
+
+    for record in records:
+        sequence_number = record.get("dynamodb", {}).get("SequenceNumber")
+        try:
+            release = release_from_record(record)
+        except (TypeError, ValueError) as err:
+            logger.error(f"Skipping malformed stream record {sequence_number}: {err}")
+            notify_error(
+                source="apple_release_stream",
+                error_message="Skipped malformed DynamoDB stream record.",
+                details={"sequence_number": sequence_number, "exception": str(err)},
+            )
+            continue
+        if release is None:
+            continue
+        releases[release["device"]] = release
+        sequence_numbers.append(sequence_number)
+
+    return list(releases.values()), sequence_numbers
+
+
+def lambda_handler(event, context):
+    """
+    AWS Lambda entry-point function for the release table stream. Error
+    alerts raised while handling the batch are sent as one message.
+    """
+    dynamodb_table_name = os.getenv(DYNAMODB_TABLE_ENV_VAR)
+    alert_table = (
+        create_dynamodb_resource().Table(dynamodb_table_name)
+        if dynamodb_table_name
+        else None
+    )
+    function_name = getattr(context, "function_name", "apple_release_stream")
+    with invocation_metrics(function_name):
+        with start_span("apple_release_stream", {"faas.name": function_name}) as span:
+            span.set_attribute("record_count", len(event.get("Records", [])))
+            with coalesce_errors(source="apple_release_stream", table=alert_table):
+                return handle_stream_batch(event)
+
+
+def handle_stream_batch(event):
+    """
+    Turns one batch of stream records into a release notification.
+
+    Publishes the batch's changes once, in the configured notification format.
+    When publishing fails, every record that contributed to it is returned in
+    ``batchItemFailures`` so Lambda retries the batch from the first of them.
+    """
+    records = event.get("Records", [])
+    changed_releases, sequence_numbers = coalesce_release_records(records)
+    logger.info(
+        f"Stream batch: {len(records)} record(s), {len(changed_releases)} release change(s)."
+    )
+
+    if not changed_releases:
+        return {"batchItemFailures": []}
+
+    try:
+        publish_release_changes(changed_releases)
+        logger.info("Sent release notification for %d updates.", len(changed_releases))
+    except Exception as err:
+        logger.error("Failed to publish release notification: %s", err, exc_info=True)
+        notify_error(
+            source="apple_release_stream",
+            error_message="Failed to publish release notification.",
+            details={"exception": str(err), "changed_releases": changed_releases},
+        )
+        return {
+            "batchItemFailures": [
+                {"itemIdentifier": sequence_number}
+                for sequence_number in sequence_numbers
+            ]
+        }
+
+    return {"batchItemFailures": []}
@@ -0,0 +1,229 @@
+"""Replay archived release-page snapshots through the release parser."""
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from .apple_web_scrape import (
+        DEVICE_LIST,
+        extract_release_versions,
+        parse_release_statements,
+        release_page_language,
+    )
+except ImportError:
+    from apple_web_scrape import (
+        DEVICE_LIST,
+        extract_release_versions,
+        parse_release_statements,
+        release_page_language,
+    )
+
+# Constants
+SNAPSHOT_SUFFIXES = (".html", ".htm", ".html.gz", ".htm.gz")
+REPLAY_CHUNKSIZE = 8
+
+# -------------------------------------------------------------------------
+# Logging Configuration
+# -------------------------------------------------------------------------
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+def list_snapshots(directory: str, order: str = "name") -> list:
+    """
+    Returns the snapshot files under ``directory`` (recursively) in replay
+    order: by path, so timestamp-prefixed names sort chronologically, or by
+    modification time with ``order="mtime"``.
+    """
+    paths = [
+        os.path.join(root, name)
+        for root, _, names in os.walk(directory)
+        for name in names
+        if name.endswith(SNAPSHOT_SUFFIXES)
+    ]
+    if order == "mtime":
+        return sorted(paths, key=lambda path: (os.path.getmtime(path), path))
+    return sorted(paths)
+
+
+def read_snapshot(path: str) -> str:
+    """Reads a saved page, plain or gzipped."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8", errors="replace") as snapshot:
+        return snapshot.read()
+
+
+def replay_snapshot(path: str, language=None) -> dict:
+    """
+    Runs one snapshot through ``parse_release_statements`` and
+    ``extract_release_versions``. The page language comes from a locale
+    directory in the path (``.../de-de/...``) unless ``language`` is given.
+    Returns the versions found, the devices missing and the time taken.
+    """
+    started = time.perf_counter()
+    result = {"snapshot": path, "versions": {}, "missing": list(DEVICE_LIST)}
+    try:
+        page_content = read_snapshot(path)
+        result["bytes"] = len(page_content.encode("utf-8"))
+        statements = parse_release_statements(
+            page_content, language or release_page_language(path)
+        )
+        versions = extract_release_versions(statements) if statements else None
+    except (OSError, EOFError, ValueError) as err:
+        result["error"] = str(err)
+        versions = None
+
+    if versions:
+        result["versions"] = versions
+        result["missing"] = [device for device in DEVICE_LIST if device not in versions]
+    result["seconds"] = time.perf_counter() - started
+    return result
+
+
+def version_deltas(results) -> list:
+    """
+    Compares each snapshot with the one before it. Returns one entry per
+    device whose version changed, appeared or disappeared; a version that
+    disappears is usually a parser regression rather than a release.
+    """
+    deltas = []
+    for previous, current in zip(results, results[1:]):
+        for device in DEVICE_LIST:
+            before = previous["versions"].get(device)
+            after = current["versions"].get(device)
+            if before != after:
+                deltas.append(
+                    {
+                        "snapshot": current["snapshot"],
+                        "device": device,
+                        "previous": before,
+                        "current": after,
+                    }
+                )
+    return deltas
+
+
+def _quiet_worker_logging():
+    # Per-snapshot parser warnings are summarized in the report instead
+    logging.getLogger().setLevel(logging.ERROR)
+
+
+def replay_snapshots(paths, workers=None, language=None) -> dict:
+    """
+    Replays snapshots in parallel on a process pool (parsing is CPU-bound).
+    Returns per-snapshot results in input order, version deltas between
+    consecutive snapshots, and throughput.
+    """
+    paths = list(paths)
+    started = time.perf_counter()
+    if workers == 1 or len(paths) <= 1:
+        results = [replay_snapshot(path, language) for path in paths]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_quiet_worker_logging
+        ) as pool:
+            results = list(
+                pool.map(
+                    replay_snapshot,
+                    paths,
+                    [language] * len(paths),
+                    chunksize=REPLAY_CHUNKSIZE,
+                )
+            )
+    elapsed = time.perf_counter() - started
+
+    total_bytes = sum(result.get("bytes", 0) for result in results)
+    return {
+        "results": results,
+        "deltas": version_deltas(results),
+        "stats": {
+            "snapshots": len(results),
+            "incomplete": sum(1 for result in results if result["missing"]),
+            "bytes": total_bytes,
+            "seconds": round(elapsed, 3),
+            "snapshots_per_second": (
+                round(len(results) / elapsed, 1) if elapsed else 0.0
+            ),
+            "megabytes_per_second": (
+                round(total_bytes / elapsed / 1_000_000, 1) if elapsed else 0.0
+            ),
+        },
+    }
+
+
+def format_report(replay) -> str:
+    """Human-readable coverage, delta and throughput report."""
+    lines = []
+    for result in replay["results"]:
+        coverage = f"{len(DEVICE_LIST) - len(result['missing'])}/{len(DEVICE_LIST)}"
+        line = f"{coverage}  {result['snapshot']}"
+        if result["missing"]:
+            line += f"  missing: {', '.join(result['missing'])}"
+        if result.get("error"):
+            line += f"  error: {result['error']}"
+        lines.append(line)
+
+    if replay["deltas"]:
+        lines.append("")
+        lines.append("Version changes:")
+        for delta in replay["deltas"]:
+            lines.append(
+                f"  {delta['device']}: {delta['previous']} -> {delta['current']}"
+                f"  ({delta['snapshot']})"
+            )
+
+    stats = replay["stats"]
+    lines.append("")
+    lines.append(
+        f"Replayed {stats['snapshots']} snapshots ({stats['incomplete']} incomplete) "
+        f"in {stats['seconds']}s: {stats['snapshots_per_second']} snapshots/s, "
+        f"{stats['megabytes_per_second']} MB/s"
+    )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Replay archived Apple release-page snapshots through the parser."
+    )
+    parser.add_argument(
+        "--snapshots",
+        required=True,
+        help="Directory of saved pages (.html, .html.gz); searched recursively",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--language",
+        help="Page language for every snapshot (default: from a locale directory, else en)",
+    )
+    parser.add_argument("--order", choices=("name", "mtime"), default="name")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument(
+        "--fail-on-missing",
+        action="store_true",
+        help="Exit with status 1 when any snapshot is missing a device",
+    )
+    args = parser.parse_args(argv)
+
+    paths = list_snapshots(args.snapshots, order=args.order)
+    if not paths:
+        parser.error(f"no snapshots found in {args.snapshots}")
+
+    replay = replay_snapshots(paths, workers=args.workers, language=args.language)
+    print(json.dumps(replay, indent=2) if args.json else format_report(replay))
+
+    if args.fail_on_missing and replay["stats"]["incomplete"]:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
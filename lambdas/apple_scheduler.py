@@ -0,0 +1,328 @@
+"""Release-window-aware polling: learn when Apple ships, poll often only then."""
+
+import argparse
+import json
+import logging
+import os
+import time
+
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+try:
+    from .apple_utils import (
+        create_dynamodb_resource,
+        get_release_history,
+        get_session,
+        DynamoDBItemNotFound,
+        DEVICE_LIST,
+        HISTORY_TABLE_ENV_VAR,
+    )
+except ImportError:
+    from apple_utils import (
+        create_dynamodb_resource,
+        get_release_history,
+        get_session,
+        DynamoDBItemNotFound,
+        DEVICE_LIST,
+        HISTORY_TABLE_ENV_VAR,
+    )
+
+# Constants
+# Apple ships on weekday mornings in Cupertino, usually around 10:00
+RELEASE_TIMEZONE = "America/Los_Angeles"
+DEFAULT_RELEASE_WINDOW = {
+    "timezone": RELEASE_TIMEZONE,
+    "weekdays": [0, 1, 2, 3, 4],
+    "hours": [9, 10, 11, 12],
+}
+HOT_POLL_MINUTES = 5
+COLD_POLL_MINUTES = 60
+
+# Learning: enough history to trust, weekdays with at least this share of
+# releases, and the busiest hours covering this share of detections
+MIN_HISTORY_SAMPLES = 20
+MIN_WEEKDAY_SHARE = 0.05
+HOUR_COVERAGE = 0.9
+HISTORY_ITEMS_PER_DEVICE = 200
+
+WEEKDAY_NAMES = ["MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN"]
+
+# -------------------------------------------------------------------------
+# Logging Configuration
+# -------------------------------------------------------------------------
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+def learn_release_window(history_items, default=None) -> dict:
+    """
+    Derives the hot release window from release history items.
+
+    Weekdays come from ``ReleaseDate`` (the backfill dates most releases);
+    hours come from ``DetectedAt``, which only scraper-recorded releases
+    carry. Each is learned separately and falls back to ``default`` until
+    there are MIN_HISTORY_SAMPLES of it. Detection trails the release by up
+    to a poll interval, so the hour before each learned hour is hot too.
+    """
+    default = default or DEFAULT_RELEASE_WINDOW
+    zone = ZoneInfo(default["timezone"])
+    window = {**default, "source": {"weekdays": "default", "hours": "default"}}
+
+    weekdays = Counter()
+    hours = Counter()
+    for item in history_items:
+        try:
+            if item.get("ReleaseDate"):
+                weekdays[date.fromisoformat(item["ReleaseDate"]).weekday()] += 1
+            if item.get("DetectedAt"):
+                detected = datetime.fromisoformat(item["DetectedAt"])
+                hours[detected.astimezone(zone).hour] += 1
+        except (TypeError, ValueError):
+            continue
+
+    total = sum(weekdays.values())
+    if total >= MIN_HISTORY_SAMPLES:
+        window["weekdays"] = sorted(
+            day for day, count in weekdays.items() if count / total >= MIN_WEEKDAY_SHARE
+        )
+        window["source"]["weekdays"] = f"history ({total} releases)"
+
+    total = sum(hours.values())
+    if total >= MIN_HISTORY_SAMPLES:
+        covered, busiest = 0, set()
+        for hour, count in hours.most_common():
+            if covered / total >= HOUR_COVERAGE:
+                break
+            busiest.add(hour)
+            covered += count
+        window["hours"] = sorted(busiest | {(hour - 1) % 24 for hour in busiest})
+        window["source"]["hours"] = f"history ({total} detections)"
+    return window
+
+
+def load_release_history(table, devices=None) -> list:
+    """Recent history items for every device (one Query each, never a scan)."""
+    items = []
+    for device in devices or DEVICE_LIST:
+        items.extend(get_release_history(table, device, limit=HISTORY_ITEMS_PER_DEVICE))
+    return items
+
+
+def in_release_window(now: datetime, window) -> bool:
+    """True when ``now`` (timezone-aware) falls in a hot weekday and hour."""
+    local = now.astimezone(ZoneInfo(window["timezone"]))
+    return local.weekday() in window["weekdays"] and local.hour in window["hours"]
+
+
+def next_window_start(now: datetime, window):
+    """Start of the next hot hour after ``now``, or None for an empty window."""
+    local = now.astimezone(ZoneInfo(window["timezone"])).replace(
+        minute=0, second=0, microsecond=0
+    )
+    for hours_ahead in range(1, 8 * 24 + 1):
+        # Aware arithmetic in one zone is wall-clock, so windows stay on
+        # local hours across DST changes
+        candidate = local + timedelta(hours=hours_ahead)
+        if in_release_window(candidate, window):
+            return candidate
+    return None
+
+
+def poll_decision(
+    now: datetime,
+    window,
+    hot_minutes: int = HOT_POLL_MINUTES,
+    cold_minutes: int = COLD_POLL_MINUTES,
+) -> dict:
+    """
+    When to poll next. Inside the window the interval is ``hot_minutes``;
+    outside it backs off to ``cold_minutes`` but never sleeps past the
+    start of the next window. ``now`` is injected, so this is pure.
+    """
+    if in_release_window(now, window):
+        return {"hot": True, "delay_seconds": hot_minutes * 60}
+
+    delay = cold_minutes * 60
+    start = next_window_start(now, window)
+    if start is not None:
+        delay = min(delay, max(int((start - now).total_seconds()), 1))
+    return {"hot": False, "delay_seconds": delay}
+
+
+def run_poller(
+    poll,
+    window,
+    clock=None,
+    sleep=time.sleep,
+    max_polls=None,
+    hot_minutes: int = HOT_POLL_MINUTES,
+    cold_minutes: int = COLD_POLL_MINUTES,
+) -> int:
+    """
+    Local poller loop: calls ``poll()`` now, then sleeps for whatever
+    ``poll_decision`` says, until ``max_polls`` (forever when None). A
+    failing poll is logged and the loop carries on. Returns the poll count.
+    """
+    clock = clock or (lambda: datetime.now(timezone.utc))
+    polls = 0
+    while max_polls is None or polls < max_polls:
+        try:
+            poll()
+        except Exception as err:
+            logger.error(f"Poll failed: {err}", exc_info=True)
+        polls += 1
+        if max_polls is not None and polls >= max_polls:
+            break
+
+        decision = poll_decision(clock(), window, hot_minutes, cold_minutes)
+        logger.info(
+            f"Next poll in {decision['delay_seconds']}s "
+            f"({'inside' if decision['hot'] else 'outside'} the release window)."
+        )
+        sleep(decision["delay_seconds"])
+    return polls
+
+
+def _hour_list(hours) -> str:
+    """Cron hour field: contiguous runs collapse to ranges ("9-12,15")."""
+    runs = []
+    for hour in sorted(hours):
+        if runs and hour == runs[-1][1] + 1:
+            runs[-1][1] = hour
+        else:
+            runs.append([hour, hour])
+    return ",".join(str(a) if a == b else f"{a}-{b}" for a, b in runs)
+
+
+def _rate_expression(minutes: int) -> str:
+    if minutes % 60 == 0:
+        value, unit = minutes // 60, "hour"
+    else:
+        value, unit = minutes, "minute"
+    return f"rate({value} {unit}{'' if value == 1 else 's'})"
+
+
+def schedule_expressions(
+    window,
+    hot_minutes: int = HOT_POLL_MINUTES,
+    cold_minutes: int = COLD_POLL_MINUTES,
+) -> dict:
+    """
+    EventBridge rule expressions for the window. Rules run in UTC, so each
+    local hot hour is converted at both standard and daylight time and the
+    union is used; weekdays with the same UTC hours share one cron.
+    """
+    zone = ZoneInfo(window["timezone"])
+    utc_hours = {}
+    for reference in (date(2025, 1, 6), date(2025, 7, 7)):  # both Mondays
+        for weekday in window["weekdays"]:
+            for hour in window["hours"]:
+                local = datetime.combine(
+                    reference + timedelta(days=weekday),
+                    datetime.min.time().replace(hour=hour),
+                    tzinfo=zone,
+                )
+                utc = local.astimezone(timezone.utc)
+                utc_hours.setdefault(utc.weekday(), set()).add(utc.hour)
+
+    by_hours = {}
+    for weekday in sorted(utc_hours):
+        by_hours.setdefault(_hour_list(utc_hours[weekday]), []).append(weekday)
+    hot = [
+        f"cron(0/{hot_minutes} {hours} ? * "
+        f"{','.join(WEEKDAY_NAMES[day] for day in weekdays)} *)"
+        for hours, weekdays in by_hours.items()
+    ]
+    return {"hot": hot, "background": _rate_expression(cold_minutes)}
+
+
+def invoke_function(function_name: str):
+    """A poll that invokes the deployed scraper asynchronously."""
+    client = get_session().client("lambda")
+
+    def poll():
+        client.invoke(FunctionName=function_name, InvocationType="Event")
+        logger.info(f"Invoked {function_name}.")
+
+    return poll
+
+
+def scrape_locally():
+    """A poll that runs the scraper handler in this process."""
+    try:
+        from .apple_web_scrape import lambda_handler
+    except ImportError:
+        from apple_web_scrape import lambda_handler
+
+    return lambda: lambda_handler({}, None)
+
+
+def release_window_from_history(history_table_name=None) -> dict:
+    """The learned window, or the default when no history table is usable."""
+    history_table_name = history_table_name or os.getenv(HISTORY_TABLE_ENV_VAR)
+    if not history_table_name:
+        return learn_release_window([])
+    table = create_dynamodb_resource().Table(history_table_name)
+    try:
+        return learn_release_window(load_release_history(table))
+    except DynamoDBItemNotFound as err:
+        logger.warning(f"Could not read release history ({err}); using the default.")
+        return learn_release_window([])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Poll for Apple releases often inside release windows only."
+    )
+    parser.add_argument(
+        "--history-table",
+        help=f"Release history table to learn from (default: env {HISTORY_TABLE_ENV_VAR})",
+    )
+    parser.add_argument("--hot-minutes", type=int, default=HOT_POLL_MINUTES)
+    parser.add_argument("--cold-minutes", type=int, default=COLD_POLL_MINUTES)
+    parser.add_argument(
+        "--function-name",
+        help="Invoke this deployed Lambda instead of scraping in-process",
+    )
+    parser.add_argument("--max-polls", type=int, help="Stop after this many polls")
+    parser.add_argument(
+        "--print-schedule",
+        action="store_true",
+        help="Print the window and EventBridge expressions as JSON and exit",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(format="%(asctime)s %(message)s")
+    window = release_window_from_history(args.history_table)
+    if args.print_schedule:
+        print(
+            json.dumps(
+                {
+                    "window": window,
+                    "schedules": schedule_expressions(
+                        window, args.hot_minutes, args.cold_minutes
+                    ),
+                },
+                indent=2,
+            )
+        )
+        return 0
+
+    logger.info(f"Release window: {window}")
+    poll = (
+        invoke_function(args.function_name) if args.function_name else scrape_locally()
+    )
+    run_poller(
+        poll,
+        window,
+        max_polls=args.max_polls,
+        hot_minutes=args.hot_minutes,
+        cold_minutes=args.cold_minutes,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
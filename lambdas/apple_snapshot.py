@@ -0,0 +1,154 @@
+"""Content-addressed archive of raw release pages in S3."""
+
+import gzip
+import hashlib
+import logging
+import os
+
+from datetime import datetime, timezone
+from io import BytesIO
+from botocore.exceptions import ClientError, BotoCoreError
+
+try:
+    from .apple_metrics import add_metric, timed_phase
+    from .apple_tracing import current_span, traced
+    from .apple_utils import get_s3_client, notify_error
+except ImportError:
+    from apple_metrics import add_metric, timed_phase
+    from apple_tracing import current_span, traced
+    from apple_utils import get_s3_client, notify_error
+
+# Constants
+SNAPSHOT_BUCKET_ENV_VAR = "snapshot_bucket_name"
+SNAPSHOT_KEY_PREFIX = "snapshots/"
+# Keys start with the UTC capture time so they sort chronologically
+SNAPSHOT_TIME_FORMAT = "%Y%m%dT%H%M%SZ"
+SNAPSHOT_COMPRESSION_LEVEL = 6
+
+# Pages are ~1 MB (~200 KB gzipped), so multipart only kicks in for outliers;
+# S3 parts must be at least 5 MiB
+SNAPSHOT_MULTIPART_THRESHOLD_BYTES = 8 * 1024 * 1024
+SNAPSHOT_MULTIPART_CHUNK_BYTES = 8 * 1024 * 1024
+SNAPSHOT_UPLOAD_CONCURRENCY = 4
+
+# -------------------------------------------------------------------------
+# Logging Configuration
+# -------------------------------------------------------------------------
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+def snapshot_key(page_bytes: bytes, captured_at: datetime) -> str:
+    """
+    Object key of a page captured at ``captured_at``:
+    ``snapshots/<UTC capture time>-<sha256>.html.gz``. The timestamp prefix
+    makes keys sort in capture order; the hash identifies the content.
+    """
+    captured_at = captured_at.astimezone(timezone.utc)
+    return (
+        f"{SNAPSHOT_KEY_PREFIX}{captured_at:{SNAPSHOT_TIME_FORMAT}}"
+        f"-{hashlib.sha256(page_bytes).hexdigest()}.html.gz"
+    )
+
+
+def compress_snapshot(page_bytes: bytes) -> bytes:
+    """Gzips a page deterministically (no embedded timestamp)."""
+    return gzip.compress(page_bytes, compresslevel=SNAPSHOT_COMPRESSION_LEVEL, mtime=0)
+
+
+def find_archived_snapshot(s3_client, bucket: str, page_bytes: bytes, captured_at):
+    """
+    Returns the key of the same page archived earlier on the UTC day of
+    ``captured_at`` (a retried or repeated run), or None. Lists only that
+    day's keys, a handful at most.
+    """
+    captured_at = captured_at.astimezone(timezone.utc)
+    content_suffix = f"-{hashlib.sha256(page_bytes).hexdigest()}.html.gz"
+    listing = {
+        "Bucket": bucket,
+        "Prefix": f"{SNAPSHOT_KEY_PREFIX}{captured_at:%Y%m%d}T",
+    }
+    while True:
+        response = s3_client.list_objects_v2(**listing)
+        for item in response.get("Contents", []):
+            if item["Key"].endswith(content_suffix):
+                return item["Key"]
+        if not response.get("IsTruncated"):
+            return None
+        listing["ContinuationToken"] = response["NextContinuationToken"]
+
+
+def snapshot_transfer_config():
+    """Multipart settings for snapshot uploads."""
+    from boto3.s3.transfer import TransferConfig
+
+    return TransferConfig(
+        multipart_threshold=SNAPSHOT_MULTIPART_THRESHOLD_BYTES,
+        multipart_chunksize=SNAPSHOT_MULTIPART_CHUNK_BYTES,
+        max_concurrency=SNAPSHOT_UPLOAD_CONCURRENCY,
+    )
+
+
+@timed_phase("Snapshot")
+@traced("s3.PutObject", {"aws.service": "s3"})
+def archive_page_snapshot(
+    url: str, page_content: str, fingerprint=None, bucket=None, now=None
+):
+    """
+    Stores the raw page gzipped under its capture time and content hash in
+    the snapshot bucket (env var ``snapshot_bucket_name``). A page already
+    archived the same UTC day is not uploaded again. Returns the object
+    key, or None when archiving is off or failed; failures are reported but
+    never fail the scrape.
+    """
+    bucket = bucket or os.getenv(SNAPSHOT_BUCKET_ENV_VAR)
+    if not bucket:
+        return None
+
+    from boto3.exceptions import S3UploadFailedError
+
+    page_bytes = page_content.encode("utf-8")
+    captured_at = now or datetime.now(timezone.utc)
+    key = snapshot_key(page_bytes, captured_at)
+    span = current_span()
+    span.set_attribute("s3.key", key)
+    s3_client = get_s3_client()
+    try:
+        archived = find_archived_snapshot(s3_client, bucket, page_bytes, captured_at)
+        if archived:
+            logger.info(f"Snapshot {archived} already archived.")
+            span.set_attribute("uploaded", False)
+            return archived
+
+        body = compress_snapshot(page_bytes)
+        s3_client.upload_fileobj(
+            BytesIO(body),
+            bucket,
+            key,
+            ExtraArgs={
+                "ContentType": "text/html; charset=utf-8",
+                "ContentEncoding": "gzip",
+                "Metadata": {
+                    "source-url": url,
+                    "release-fingerprint": fingerprint or "",
+                    "captured-at": captured_at.isoformat(timespec="seconds"),
+                },
+            },
+            Config=snapshot_transfer_config(),
+        )
+    except (ClientError, BotoCoreError, S3UploadFailedError) as err:
+        logger.error(f"Failed to archive page snapshot {key}: {err}")
+        notify_error(
+            source="apple_snapshot",
+            error_message="Failed to archive release page snapshot.",
+            details={"url": url, "key": key, "exception": str(err)},
+        )
+        return None
+
+    add_metric("SnapshotBytes", len(body), "Bytes")
+    span.set_attribute("uploaded", True)
+    span.set_attribute("s3.object_size", len(body))
+    logger.info(
+        f"Archived snapshot {key} ({len(page_bytes)} bytes, {len(body)} gzipped)."
+    )
+    return key
@@ -0,0 +1,302 @@
+"""Subscriber registry and release matching for per-team notifications."""
+
+import logging
+import time
+
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import ClientError, BotoCoreError
+
+try:
+    from .apple_tracing import propagate
+    from .apple_utils import (
+        notify_error,
+        publish_device_notifications,
+        release_history_sort_key,
+        ReleaseNotificationError,
+    )
+except ImportError:
+    from apple_tracing import propagate
+    from apple_utils import (
+        notify_error,
+        publish_device_notifications,
+        release_history_sort_key,
+        ReleaseNotificationError,
+    )
+
+# Constants
+SUBSCRIPTION_TABLE_ENV_VAR = "subscription_table_name"
+SUBSCRIPTION_INDEX_TTL_SECONDS = 300
+MAX_DELIVERY_WORKERS = 4
+
+# -------------------------------------------------------------------------
+# Logging Configuration
+# -------------------------------------------------------------------------
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Matching index built from the registry, kept across warm invocations:
+# table name -> (expires at, SubscriptionIndex)
+_subscription_indexes = {}
+
+
+class VersionRangeIndex:
+    """
+    Segment tree over ``[low, high)`` version-key ranges.
+
+    Every distinct range boundary splits the version line into sorted
+    elementary intervals, the leaves of the tree. Each rule is stored once
+    on each of the (at most 2 log n) nodes that exactly cover its range, so
+    memory grows as rules x log(boundaries) rather than rules x boundaries.
+    A lookup is one binary search plus a leaf-to-root walk that collects
+    the rules on the way. Channel sets are computed once per looked-up
+    interval, so delivery grouping is bounded by channels rather than
+    subscriptions.
+    """
+
+    def __init__(self, rules):
+        rules = list(rules)
+        self.boundaries = sorted(
+            {low for low, _, _ in rules if low} | {high for _, high, _ in rules if high}
+        )
+        self._leaves = 1
+        while self._leaves <= len(self.boundaries):
+            self._leaves *= 2
+        # node -> rules stored there; node 1 is the root, leaf i is node
+        # _leaves + i, and only nodes holding rules have an entry
+        self._nodes = {}
+
+        for low, high, subscription in rules:
+            start = bisect_right(self.boundaries, low) if low else 0
+            # Open-ended ranges run to the padded end, which decomposes into
+            # fewer nodes; the padding leaves are never looked up
+            end = bisect_right(self.boundaries, high) if high else self._leaves
+            self._insert(start, end, subscription)
+        self._interval_channels = {}
+
+    def _insert(self, start: int, end: int, subscription):
+        """Stores a rule on the nodes covering leaves ``[start, end)``."""
+        start += self._leaves
+        end += self._leaves
+        while start < end:
+            if start & 1:
+                self._nodes.setdefault(start, []).append(subscription)
+                start += 1
+            if end & 1:
+                end -= 1
+                self._nodes.setdefault(end, []).append(subscription)
+            start //= 2
+            end //= 2
+
+    def match(self, version_key: str) -> list:
+        """Returns the subscriptions whose range contains the version key."""
+        node = bisect_right(self.boundaries, version_key) + self._leaves
+        matches = []
+        while node:
+            matches.extend(self._nodes.get(node, ()))
+            node //= 2
+        return matches
+
+    def match_channels(self, version_key: str) -> frozenset:
+        """Returns the channels of the subscriptions containing the version key."""
+        position = bisect_right(self.boundaries, version_key)
+        if position not in self._interval_channels:
+            self._interval_channels[position] = frozenset(
+                subscription["Channel"] for subscription in self.match(version_key)
+            )
+        return self._interval_channels[position]
+
+
+class SubscriptionIndex:
+    """
+    Matching index over registry subscriptions, keyed by device.
+
+    Each device has one ``VersionRangeIndex`` for rules that want every
+    release and one for rules that only want major (``X.0``) releases.
+    """
+
+    def __init__(self, subscriptions):
+        rules = {}
+        self.size = 0
+
+        for subscription in subscriptions:
+            rule = subscription_rule(subscription)
+            if rule is None:
+                continue
+            all_rules, major_rules = rules.setdefault(subscription["Device"], ([], []))
+            (major_rules if subscription.get("MajorOnly") else all_rules).append(rule)
+            self.size += 1
+
+        self._indexes = {
+            device: (VersionRangeIndex(all_rules), VersionRangeIndex(major_rules))
+            for device, (all_rules, major_rules) in rules.items()
+        }
+
+    def match(self, device: str, release_version: str) -> list:
+        """Returns the subscriptions that want this device release."""
+        indexes = self._indexes.get(device)
+        if not indexes:
+            return []
+        version_key = release_history_sort_key(release_version)
+        all_index, major_index = indexes
+        matches = all_index.match(version_key)
+        if is_major_release(release_version):
+            matches = matches + major_index.match(version_key)
+        return matches
+
+    def deliveries(self, changed_releases) -> dict:
+        """
+        Groups the changed releases by delivery channel. Returns a dict
+        mapping each channel to the releases at least one of its
+        subscriptions matched, in ``changed_releases`` order. A release
+        whose version cannot be parsed is reported and skipped.
+        """
+        deliveries = {}
+        for release in changed_releases:
+            try:
+                channels = self.match_channels(
+                    release["device"], release["release_version"]
+                )
+            except ValueError as err:
+                logger.error(f"Cannot match subscriptions for {release}: {err}")
+                notify_error(
+                    source="apple_subscription",
+                    error_message="Failed to match release against subscriptions.",
+                    details={
+                        "device": release["device"],
+                        "release_version": release["release_version"],
+                        "exception": str(err),
+                    },
+                )
+                continue
+            for channel in channels:
+                deliveries.setdefault(channel, []).append(release)
+        return deliveries
+
+    def match_channels(self, device: str, release_version: str) -> frozenset:
+        """Returns the channels with a subscription that wants this release."""
+        indexes = self._indexes.get(device)
+        if not indexes:
+            return frozenset()
+        version_key = release_history_sort_key(release_version)
+        all_index, major_index = indexes
+        channels = all_index.match_channels(version_key)
+        if is_major_release(release_version):
+            channels = channels | major_index.match_channels(version_key)
+        return channels
+
+
+def is_major_release(release_version: str) -> bool:
+    """True for X.0 releases ("26", "26.0", "26.0.0")."""
+    return release_history_sort_key(release_version).endswith(".0000.0000")
+
+
+def subscription_rule(subscription):
+    """
+    Converts a registry item into a ``(low, high, subscription)`` range rule.
+    ``MinVersion`` is inclusive and ``MaxVersion`` exclusive; either may be
+    omitted. Returns None (and logs) for items that cannot be matched.
+    """
+    if not subscription.get("Device") or not subscription.get("Channel"):
+        logger.warning(f"Skipping incomplete subscription: {subscription}")
+        return None
+    try:
+        low = (
+            release_history_sort_key(str(subscription["MinVersion"]))
+            if subscription.get("MinVersion")
+            else None
+        )
+        high = (
+            release_history_sort_key(str(subscription["MaxVersion"]))
+            if subscription.get("MaxVersion")
+            else None
+        )
+    except ValueError as err:
+        logger.warning(f"Skipping subscription with invalid version range: {err}")
+        return None
+    return low, high, subscription
+
+
+def load_subscriptions(table) -> list:
+    """Reads every subscription in the registry, following scan pages."""
+    subscriptions = []
+    scan = {}
+    while True:
+        response = table.scan(**scan)
+        subscriptions.extend(response.get("Items", []))
+        if "LastEvaluatedKey" not in response:
+            return subscriptions
+        scan["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def get_subscription_index(table) -> SubscriptionIndex:
+    """
+    Returns the matching index for the registry table, building it on the
+    first call and again once SUBSCRIPTION_INDEX_TTL_SECONDS have passed.
+    """
+    now = time.monotonic()
+    cached = _subscription_indexes.get(table.name)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    started = time.perf_counter()
+    index = SubscriptionIndex(load_subscriptions(table))
+    logger.info(
+        f"Loaded {index.size} subscriptions in {time.perf_counter() - started:.3f}s."
+    )
+    _subscription_indexes[table.name] = (now + SUBSCRIPTION_INDEX_TTL_SECONDS, index)
+    return index
+
+
+def deliver_to_channel(channel: str, releases) -> bool:
+    """Publishes a channel's releases in PublishBatch chunks; False on failure."""
+    try:
+        publish_device_notifications(releases, topic_arn=channel)
+    except (ClientError, BotoCoreError, ReleaseNotificationError) as err:
+        logger.error(f"Failed to deliver releases to {channel}: {err}")
+        notify_error(
+            source="apple_subscription",
+            error_message="Failed to deliver subscriber notifications.",
+            details={
+                "channel": channel,
+                "releases": [release["device"] for release in releases],
+                "exception": str(err),
+            },
+        )
+        return False
+    return True
+
+
+def notify_subscribers(table, changed_releases) -> dict:
+    """
+    Delivers changed releases to every registry channel with a matching
+    subscription. Channels are published in parallel; a failing channel is
+    reported without affecting the others.
+    Returns a dict mapping each channel to whether delivery succeeded.
+    """
+    try:
+        index = get_subscription_index(table)
+    except (ClientError, BotoCoreError) as err:
+        logger.error(f"Error loading subscription registry: {err}")
+        notify_error(
+            source="apple_subscription",
+            error_message="Failed to load subscription registry.",
+            details={"exception": str(err)},
+        )
+        return {}
+
+    deliveries = index.deliveries(changed_releases)
+    if not deliveries:
+        logger.info("No subscriptions matched the release changes.")
+        return {}
+
+    with ThreadPoolExecutor(
+        max_workers=min(MAX_DELIVERY_WORKERS, len(deliveries))
+    ) as pool:
+        futures = {
+            channel: pool.submit(propagate(deliver_to_channel), channel, releases)
+            for channel, releases in deliveries.items()
+        }
+        outcome = {channel: future.result() for channel, future in futures.items()}
+    logger.info(f"Subscriber deliveries: {outcome}")
+    return outcome
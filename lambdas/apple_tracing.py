@@ -0,0 +1,177 @@
+"""Lightweight tracing spans with a no-op default and a local JSON exporter."""
+
+import contextvars
+import functools
+import json
+import os
+import random
+import threading
+import time
+
+# Constants
+TRACE_EXPORT_PATH_ENV_VAR = "trace_export_path"
+
+_current_span = contextvars.ContextVar("apple_current_span", default=None)
+
+
+class Span:
+    """
+    One timed operation, shaped like an OpenTelemetry span: trace and span
+    ids, parent span id, attributes, status and start/end times.
+    """
+
+    def __init__(self, name: str, parent=None, attributes=None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else f"{random.getrandbits(128):032x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_span_id = parent.span_id if parent else None
+        self.attributes = dict(attributes or {})
+        self.status = {"code": "OK"}
+        self.start_time_unix_nano = time.time_ns()
+        self.end_time_unix_nano = None
+        self._started = time.perf_counter()
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def set_status(self, code: str, description: str | None = None) -> None:
+        self.status = {"code": code}
+        if description:
+            self.status["description"] = description
+
+    def record_exception(self, err: BaseException) -> None:
+        self.set_status("ERROR", f"{type(err).__name__}: {err}")
+
+    def end(self) -> None:
+        self.end_time_unix_nano = time.time_ns()
+        self.duration_ms = (time.perf_counter() - self._started) * 1000
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "start_time_unix_nano": self.start_time_unix_nano,
+            "end_time_unix_nano": self.end_time_unix_nano,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "status": self.status,
+        }
+
+
+class _NoopSpan:
+    """Shared span returned while tracing is off; every method does nothing."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set_attribute(self, key, value):
+        pass
+
+    def set_status(self, code, description=None):
+        pass
+
+    def record_exception(self, err):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class JsonFileExporter:
+    """Appends each finished span to a file as one JSON line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as trace_file:
+                trace_file.write(line)
+
+
+def exporter_from_environment():
+    """JSON file exporter when env var ``trace_export_path`` is set, else None (no-op)."""
+    path = os.getenv(TRACE_EXPORT_PATH_ENV_VAR)
+    return JsonFileExporter(path) if path else None
+
+
+# None keeps tracing off: spans are the shared NOOP_SPAN and nothing is recorded
+_exporter = exporter_from_environment()
+
+
+def set_exporter(exporter):
+    """Installs a span exporter (None turns tracing off); returns the previous one."""
+    global _exporter
+    previous, _exporter = _exporter, exporter
+    return previous
+
+
+class _ActiveSpan:
+    """Context manager that makes a span current and exports it when it ends."""
+
+    def __init__(self, span: Span, exporter):
+        self.span = span
+        self.exporter = exporter
+        self._token = None
+
+    def __enter__(self):
+        self._token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is not None:
+            self.span.record_exception(exc)
+        self.span.end()
+        _current_span.reset(self._token)
+        self.exporter.export(self.span)
+        return False
+
+
+def start_span(name: str, attributes=None):
+    """
+    Starts a child of the current span (or a new trace) for use in a ``with``
+    block. Returns the shared no-op span when tracing is off.
+    """
+    exporter = _exporter
+    if exporter is None:
+        return NOOP_SPAN
+    return _ActiveSpan(Span(name, _current_span.get(), attributes), exporter)
+
+
+def current_span():
+    """The span of the enclosing ``start_span``/``traced`` block, or the no-op span."""
+    return _current_span.get() or NOOP_SPAN
+
+
+def traced(name: str, attributes=None):
+    """Decorator that runs the function inside a span; calls straight through when off."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _exporter is None:
+                return func(*args, **kwargs)
+            with start_span(name, attributes):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def propagate(func):
+    """
+    Binds the caller's current span to ``func`` so spans it starts on a
+    worker thread become children of it. Call once per submitted task.
+    """
+    if _exporter is None:
+        return func
+    context = contextvars.copy_context()
+    return functools.partial(context.run, func)
@@ -1,12 +1,23 @@
 """AWS SDK utilities for DynamoDB and SNS notifications."""
 
+import hashlib
 import json
 import os
 import logging
-import boto3
-from botocore.config import Config
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from botocore.exceptions import ClientError, BotoCoreError
 
+try:
+    from .apple_tracing import current_span, propagate, start_span, traced
+except ImportError:
+    from apple_tracing import current_span, propagate, start_span, traced
+
 # -------------------------------------------------------------------------
 # Logging Configuration
 # -------------------------------------------------------------------------
@@ -16,18 +27,78 @@ logger.setLevel(logging.INFO)
 # -------------------------------------------------------------------------
 # Constants
 # -------------------------------------------------------------------------
+# Tracked devices and the release table, shared by every handler; kept here
+# so handlers that only read releases need not import the scraper
+DEVICE_LIST = ["iOS", "macOS", "watchOS", "tvOS", "visionOS"]
+DYNAMODB_TABLE_ENV_VAR = "dynamodb_table_name"
+
 ERROR_ALERT_TOPIC_ENV_VAR = "error_alert_topic_arn"
 RELEASE_NOTIFICATION_TOPIC_ENV_VAR = "release_notification_topic_arn"
 
+# Repeated error alerts are suppressed per fingerprint for this window, tracked
+# by TTL items keyed alert#<fingerprint> in the release table
+ERROR_ALERT_WINDOW_ENV_VAR = "error_alert_window_seconds"
+DEFAULT_ERROR_ALERT_WINDOW_SECONDS = 3600
+ALERT_KEY_PREFIX = "alert#"
+
+# Fetch state for scraped pages lives in the release table next to the device
+# items, keyed by the page URL so it can never collide with a device name.
+PAGE_STATE_KEY_PREFIX = "page#"
+PAGE_STATE_ATTRIBUTES = ("ETag", "LastModified", "ReleaseFingerprint")
+
+# BatchGetItem accepts at most 100 keys per request
+BATCH_GET_MAX_KEYS = 100
+BATCH_MAX_ATTEMPTS = 5
+BATCH_BACKOFF_BASE_SECONDS = 0.05
+
+# Parallel UpdateItem writers for the history backfill
+HISTORY_WRITE_WORKERS = 4
+
+# SNS PublishBatch accepts at most 10 entries per request
+SNS_PUBLISH_BATCH_MAX_ENTRIES = 10
+RELEASE_VERSION_PARTS_RE = re.compile(r"^(\d+)((?:\.\d+)*)")
+
+# Release history items: device partition key plus a sortable version key
+HISTORY_TABLE_ENV_VAR = "history_table_name"
+HISTORY_SORT_KEY = "VersionKey"
+# Attributes the history backfill owns and overwrites; the rest are the scraper's
+HISTORY_BACKFILL_ATTRIBUTES = ("ReleaseVersion", "ReleaseDate", "NotesUrl")
+HISTORY_VERSION_RE = re.compile(r"^(\d+(?:\.\d+)*)(?:\s*\(([a-z])\))?$")
+HISTORY_DEFAULT_LIMIT = 50
+HISTORY_QUERY_PAGE_SIZE = 100
+HISTORY_CACHE_TTL_SECONDS = 300
+
+# Last-known release table items (device releases and page state), kept across
+# warm invocations. Conditional writes stay the source of truth; a rejected
+# write drops the entry. A TTL of 0 turns the cache off.
+RELEASE_STATE_CACHE_TTL_ENV_VAR = "release_state_cache_ttl_seconds"
+DEFAULT_RELEASE_STATE_CACHE_TTL_SECONDS = 6 * 3600
+RELEASE_STATE_CACHE_MAX_ENTRIES = 256
+
 # -------------------------------------------------------------------------
-# Global AWS Session / Config (improves Lambda cold-start performance)
+# Global AWS Session / Config (built on first use, reused across invocations)
 # -------------------------------------------------------------------------
-boto_cfg = Config(retries={"max_attempts": 5, "mode": "standard"})
-session = boto3.session.Session()
+# boto3 and botocore.config take ~0.3s to import and the session/resource
+# another ~0.15s, so none of it happens at import time
+BOTO_RETRY_CONFIG = {"max_attempts": 5, "mode": "standard"}
+
+_aws_lock = threading.RLock()
+_aws = {}
+
+# Errors buffered by coalesce_errors during an invocation (None when inactive);
+# a lock rather than a context variable because worker threads report too
+_error_buffer = None
+_error_buffer_lock = threading.Lock()
+
+# Recent history query results, kept across warm invocations:
+# (table, device, since key, limit) -> (expires at, items)
+_release_history_cache = {}
 
-# Global clients reused across invocations
-dynamodb_resource = session.resource("dynamodb", config=boto_cfg)
-sns_client = session.client("sns", config=boto_cfg)
+# (table, key) -> (expires at, item), least recently used first; keys the
+# table does not hold are cached with item None
+_release_state_cache = OrderedDict()
+_release_state_lock = threading.Lock()
+_release_state_stats = {"hits": 0, "misses": 0}
 
 
 class DynamoDBItemNotFound(Exception):
@@ -36,24 +107,123 @@ class DynamoDBItemNotFound(Exception):
     pass
 
 
+class DynamoDBWriteError(Exception):
+    """Raised when a batch of items could not be written to DynamoDB."""
+
+    pass
+
+
+class ReleaseNotificationError(Exception):
+    """Raised when SNS rejected some release notification messages."""
+
+    pass
+
+
+# -------------------------------------------------------------------------
+# Configuration
+# -------------------------------------------------------------------------
+def env_int(name: str, default: int) -> int:
+    """Integer setting from env var ``name``; ``default`` if unset or not a number."""
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        logger.warning(f"Ignoring non-integer {name}; using {default}.")
+        return default
+
+
 # -------------------------------------------------------------------------
 # AWS Clients Creation
 # -------------------------------------------------------------------------
-def create_dynamodb_resource(region_name=None):
-    """Creates and returns a DynamoDB resource (region-aware)."""
-    if not region_name:
-        return dynamodb_resource
-    return boto3.resource("dynamodb", region_name=region_name, config=boto_cfg)
+def _memoized_aws(name, factory):
+    """Builds a shared AWS object once (thread-safe) and returns it afterwards."""
+    value = _aws.get(name)
+    if value is None:
+        with _aws_lock:
+            value = _aws.get(name)
+            if value is None:
+                value = _aws[name] = factory()
+    return value
+
+
+def get_boto_config():
+    """Returns the shared botocore retry config."""
+
+    def build():
+        from botocore.config import Config
+
+        return Config(retries=BOTO_RETRY_CONFIG)
+
+    return _memoized_aws("boto_cfg", build)
+
+
+def get_session():
+    """Returns the shared boto3 session, importing boto3 on first use."""
+
+    def build():
+        import boto3
+
+        return boto3.session.Session()
+
+    return _memoized_aws("session", build)
+
+
+def get_dynamodb_resource():
+    """Returns the shared DynamoDB resource for the default region."""
+    return _memoized_aws(
+        "dynamodb_resource",
+        lambda: get_session().resource("dynamodb", config=get_boto_config()),
+    )
+
+
+def get_sns_client():
+    """Returns the shared SNS client for the default region."""
+    return _memoized_aws(
+        "sns_client", lambda: get_session().client("sns", config=get_boto_config())
+    )
+
+
+def get_s3_client():
+    """Returns the shared S3 client; its connection pool serves every upload."""
+    return _memoized_aws(
+        "s3_client", lambda: get_session().client("s3", config=get_boto_config())
+    )
+
+
+def __getattr__(name):
+    # Module attributes kept for callers of the former import-time globals
+    accessors = {
+        "boto_cfg": get_boto_config,
+        "session": get_session,
+        "dynamodb_resource": get_dynamodb_resource,
+        "sns_client": get_sns_client,
+    }
+    if name in accessors:
+        return accessors[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def create_dynamodb_resource(region_name=None, endpoint_url=None):
+    """Creates and returns a DynamoDB resource (region- and endpoint-aware)."""
+    if not region_name and not endpoint_url:
+        return get_dynamodb_resource()
+    return get_session().resource(
+        "dynamodb",
+        region_name=region_name,
+        endpoint_url=endpoint_url,
+        config=get_boto_config(),
+    )
 
 
 # -------------------------------------------------------------------------
 # DynamoDB Interaction
 # -------------------------------------------------------------------------
+@traced("dynamodb.GetItem", {"db.system": "dynamodb"})
 def get_device_item(table, device: str):
     """
     Retrieves the release data for a single device from DynamoDB.
     Returns the item dict or None if not found.
     """
+    current_span().set_attribute("device", device)
     try:
         response = table.get_item(Key={"device": device})
         return response.get("Item")
@@ -66,6 +236,399 @@ def get_device_item(table, device: str):
         ) from err
 
 
+@traced("dynamodb.BatchGetItem", {"db.system": "dynamodb"})
+def get_device_items(table, devices) -> dict:
+    """
+    Retrieves the release data for several devices with BatchGetItem.
+    Returns a dict mapping each found device to its item; devices without an
+    item are left out. Unprocessed keys are retried with jittered backoff.
+    """
+    client = table.meta.client
+    devices = list(dict.fromkeys(devices))
+    items = {}
+    span = current_span()
+    span.set_attribute("key_count", len(devices))
+
+    for start in range(0, len(devices), BATCH_GET_MAX_KEYS):
+        request_items = {
+            table.name: {
+                "Keys": [
+                    {"device": device}
+                    for device in devices[start : start + BATCH_GET_MAX_KEYS]
+                ]
+            }
+        }
+        attempt = 0
+
+        while request_items:
+            try:
+                response = client.batch_get_item(RequestItems=request_items)
+            except ClientError as err:
+                logger.error(f"Error batch retrieving devices {devices}: {err}")
+                raise DynamoDBItemNotFound(
+                    f"Failed to retrieve items for devices {devices}"
+                ) from err
+
+            for item in response.get("Responses", {}).get(table.name, []):
+                items[item["device"]] = item
+
+            request_items = response.get("UnprocessedKeys") or {}
+            if not request_items:
+                break
+
+            attempt += 1
+            span.set_attribute("retry_count", attempt)
+            if attempt >= BATCH_MAX_ATTEMPTS:
+                raise DynamoDBItemNotFound(
+                    f"Unprocessed keys remained after {attempt} attempts: {request_items}"
+                )
+            delay = BATCH_BACKOFF_BASE_SECONDS * (2**attempt)
+            time.sleep(random.uniform(0, delay))
+
+    return items
+
+
+def get_page_state(table, url: str) -> dict:
+    """
+    Retrieves the stored fetch state (HTTP validators and release section
+    fingerprint) for a scraped page.
+    Returns an empty dict when nothing has been stored yet.
+    """
+    item = get_device_item(table=table, device=f"{PAGE_STATE_KEY_PREFIX}{url}")
+    if not item:
+        return {}
+    return {name: item[name] for name in PAGE_STATE_ATTRIBUTES if item.get(name)}
+
+
+def get_page_states(table, urls) -> dict:
+    """
+    Retrieves the stored fetch state for several scraped pages, from the
+    release state cache where possible and one BatchGetItem for the rest.
+    Returns a dict mapping every URL to its state (empty when nothing has
+    been stored yet).
+    """
+    items = get_cached_device_items(
+        table=table, devices=[f"{PAGE_STATE_KEY_PREFIX}{url}" for url in urls]
+    )
+    states = {}
+    for url in urls:
+        item = items.get(f"{PAGE_STATE_KEY_PREFIX}{url}") or {}
+        states[url] = {
+            name: item[name] for name in PAGE_STATE_ATTRIBUTES if item.get(name)
+        }
+    return states
+
+
+@traced("dynamodb.UpdateItem", {"db.system": "dynamodb"})
+def update_page_state(table, url: str, page_state: dict) -> bool:
+    """
+    Persists the fetch state for a scraped page. Attributes present in
+    ``page_state`` but empty (a 200 without an ETag or Last-Modified) are
+    removed, so a stale validator is not sent on the next fetch.
+    Returns True on success, False when the write failed.
+    """
+    attributes = {
+        name: page_state[name] for name in PAGE_STATE_ATTRIBUTES if page_state.get(name)
+    }
+    removed = [
+        name
+        for name in PAGE_STATE_ATTRIBUTES
+        if name in page_state and not page_state[name]
+    ]
+    if not attributes and not removed:
+        return True
+
+    current_span().set_attribute("url", url)
+    clauses = []
+    if attributes:
+        clauses.append("SET " + ", ".join(f"{name}=:{name}" for name in attributes))
+    if removed:
+        clauses.append("REMOVE " + ", ".join(removed))
+    update = {"UpdateExpression": " ".join(clauses)}
+    if attributes:
+        update["ExpressionAttributeValues"] = {
+            f":{name}": value for name, value in attributes.items()
+        }
+    try:
+        table.update_item(Key={"device": f"{PAGE_STATE_KEY_PREFIX}{url}"}, **update)
+    except ClientError as err:
+        logger.error(f"Error storing page state for '{url}': {err}", exc_info=True)
+        invalidate_release_state(table, f"{PAGE_STATE_KEY_PREFIX}{url}")
+        return False
+    cache_release_state(
+        table, f"{PAGE_STATE_KEY_PREFIX}{url}", attributes, removed=removed
+    )
+    return True
+
+
+# -------------------------------------------------------------------------
+# Release State Cache
+# -------------------------------------------------------------------------
+def release_state_cache_ttl_seconds() -> int:
+    """Release state cache TTL, from the environment (0 disables the cache)."""
+    return env_int(
+        RELEASE_STATE_CACHE_TTL_ENV_VAR, DEFAULT_RELEASE_STATE_CACHE_TTL_SECONDS
+    )
+
+
+@traced("release_state_cache.lookup")
+def get_cached_device_items(table, devices) -> dict:
+    """
+    Same contract as ``get_device_items``, but serves keys this container
+    read or wrote within the TTL from memory. Only the misses are read, in
+    one BatchGetItem, so a warm run whose keys are all cached makes no
+    DynamoDB read at all.
+    """
+    devices = list(dict.fromkeys(devices))
+    ttl = release_state_cache_ttl_seconds()
+    now = time.monotonic()
+    items = {}
+    missing = []
+    with _release_state_lock:
+        for device in devices:
+            entry = _release_state_cache.get((table.name, device))
+            if ttl > 0 and entry and entry[0] > now:
+                _release_state_cache.move_to_end((table.name, device))
+                if entry[1] is not None:
+                    items[device] = dict(entry[1])
+            else:
+                missing.append(device)
+        _release_state_stats["hits"] += len(devices) - len(missing)
+        _release_state_stats["misses"] += len(missing)
+
+    span = current_span()
+    span.set_attribute("cache_hits", len(devices) - len(missing))
+    span.set_attribute("cache_misses", len(missing))
+    if not missing:
+        return items
+
+    fetched = get_device_items(table=table, devices=missing)
+    for device in missing:
+        item = fetched.get(device)
+        if item is not None:
+            items[device] = item
+        if ttl > 0:
+            _store_release_state(table, device, item and dict(item), ttl)
+    return items
+
+
+def cache_release_state(table, device: str, attributes: dict, removed=()) -> None:
+    """
+    Write-through after a successful write: merges the written attributes
+    into the cached item for ``device`` (creating it when absent) and drops
+    the ``removed`` ones.
+    """
+    ttl = release_state_cache_ttl_seconds()
+    if ttl <= 0:
+        return
+    with _release_state_lock:
+        entry = _release_state_cache.get((table.name, device))
+        item = dict((entry and entry[1]) or {"device": device})
+    item.update(attributes)
+    for name in removed:
+        item.pop(name, None)
+    _store_release_state(table, device, item, ttl)
+
+
+def _store_release_state(table, device: str, item, ttl: int) -> None:
+    with _release_state_lock:
+        _release_state_cache[(table.name, device)] = (time.monotonic() + ttl, item)
+        _release_state_cache.move_to_end((table.name, device))
+        while len(_release_state_cache) > RELEASE_STATE_CACHE_MAX_ENTRIES:
+            _release_state_cache.popitem(last=False)
+
+
+def invalidate_release_state(table, device: str) -> None:
+    """Drops the cached item, e.g. after another writer won a conditional write."""
+    with _release_state_lock:
+        _release_state_cache.pop((table.name, device), None)
+
+
+def release_state_cache_stats() -> dict:
+    """Cumulative hit and miss counts for this container, plus the entry count."""
+    with _release_state_lock:
+        return {**_release_state_stats, "size": len(_release_state_cache)}
+
+
+def clear_release_state_cache() -> None:
+    """Empties the release state cache and resets its counters."""
+    with _release_state_lock:
+        _release_state_cache.clear()
+        _release_state_stats.update(hits=0, misses=0)
+
+
+def release_history_sort_key(version: str) -> str:
+    """
+    Returns the history sort key for a version string: three zero-padded
+    components so keys sort in release order ("26" and "26.0" map to
+    "0026.0000.0000"), plus any Rapid Security Response letter ("-c").
+    Raises ValueError for strings that are not versions.
+    """
+    match = HISTORY_VERSION_RE.match(version.strip())
+    if not match:
+        raise ValueError(f"Not a release version: {version!r}")
+    parts = [int(part) for part in match.group(1).split(".")]
+    parts += [0] * (3 - len(parts))
+    key = ".".join(f"{part:04d}" for part in parts)
+    if match.group(2):
+        key += f"-{match.group(2)}"
+    return key
+
+
+@traced("dynamodb.Query", {"db.system": "dynamodb"})
+def get_release_history(
+    table, device: str, since: str | None = None, limit: int = HISTORY_DEFAULT_LIMIT
+) -> list:
+    """
+    Retrieves a device's release history, newest first, with Query (never a
+    scan). ``since`` is an inclusive lower-bound version. Pages through
+    results until ``limit`` items are collected; results are cached in memory
+    for HISTORY_CACHE_TTL_SECONDS.
+    """
+    since_key = release_history_sort_key(since) if since else None
+    cache_key = (table.name, device, since_key, limit)
+    now = time.monotonic()
+    for key in [
+        k for k, (expires, _) in _release_history_cache.items() if expires <= now
+    ]:
+        del _release_history_cache[key]
+    span = current_span()
+    span.set_attribute("device", device)
+    span.set_attribute("cache_hit", cache_key in _release_history_cache)
+    if cache_key in _release_history_cache:
+        return list(_release_history_cache[cache_key][1])
+
+    from boto3.dynamodb.conditions import Key
+
+    condition = Key("device").eq(device)
+    if since_key:
+        condition &= Key(HISTORY_SORT_KEY).gte(since_key)
+    query = {"KeyConditionExpression": condition, "ScanIndexForward": False}
+    items = []
+
+    while len(items) < limit:
+        query["Limit"] = min(HISTORY_QUERY_PAGE_SIZE, limit - len(items))
+        try:
+            response = table.query(**query)
+        except ClientError as err:
+            logger.error(f"Error querying release history for '{device}': {err}")
+            raise DynamoDBItemNotFound(
+                f"Failed to retrieve release history for device '{device}'"
+            ) from err
+
+        items.extend(response.get("Items", []))
+        if "LastEvaluatedKey" not in response:
+            break
+        query["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    _release_history_cache[cache_key] = (now + HISTORY_CACHE_TTL_SECONDS, items)
+    return list(items)
+
+
+@traced("dynamodb.UpdateItem", {"db.system": "dynamodb"})
+def append_release_history(
+    table,
+    device: str,
+    release_version: str,
+    release_statement: str,
+    release_date: str,
+    detected_at=None,
+) -> bool:
+    """
+    Records a release in the history table. Attributes written by the
+    backfill (notes URL, Apple's release date) are kept if already present.
+    ``detected_at`` (ISO timestamp) records when the scraper first saw the
+    release. Returns True on success, False when the write failed.
+    """
+    span = current_span()
+    span.set_attribute("device", device)
+    span.set_attribute("release_version", release_version)
+    update = (
+        "SET ReleaseVersion=:version, ReleaseStatement=:statement, "
+        "ReleaseDate=if_not_exists(ReleaseDate, :date)"
+    )
+    values = {
+        ":version": release_version,
+        ":statement": release_statement,
+        ":date": release_date,
+    }
+    if detected_at:
+        update += ", DetectedAt=if_not_exists(DetectedAt, :detected)"
+        values[":detected"] = detected_at
+    try:
+        table.update_item(
+            Key={
+                "device": device,
+                HISTORY_SORT_KEY: release_history_sort_key(release_version),
+            },
+            UpdateExpression=update,
+            ExpressionAttributeValues=values,
+        )
+    except (ClientError, ValueError) as err:
+        logger.error(
+            f"Error appending {device} {release_version} to release history: {err}"
+        )
+        return False
+
+    for key in [k for k in _release_history_cache if k[:2] == (table.name, device)]:
+        del _release_history_cache[key]
+    return True
+
+
+@traced("dynamodb.UpdateItem", {"db.system": "dynamodb"})
+def merge_release_history(table, record: dict) -> None:
+    """
+    Writes one backfilled history record without replacing the item. The
+    attributes the backfill owns (version, Apple's release date, notes URL)
+    are overwritten, since Apple's date beats the scraper's detection date;
+    the scraper's ReleaseStatement and DetectedAt are left alone. Raises
+    DynamoDBWriteError on failure.
+    """
+    owned = [name for name in HISTORY_BACKFILL_ATTRIBUTES if record.get(name)]
+    span = current_span()
+    span.set_attribute("device", record["device"])
+    try:
+        table.update_item(
+            Key={
+                "device": record["device"],
+                HISTORY_SORT_KEY: record[HISTORY_SORT_KEY],
+            },
+            UpdateExpression="SET " + ", ".join(f"{name}=:{name}" for name in owned),
+            ExpressionAttributeValues={f":{name}": record[name] for name in owned},
+        )
+    except ClientError as err:
+        logger.error(f"Error merging {record['device']} history record: {err}")
+        raise DynamoDBWriteError(
+            f"Failed to write history record to '{table.name}'"
+        ) from err
+
+
+def merge_release_history_records(
+    table, records, workers: int = HISTORY_WRITE_WORKERS
+) -> int:
+    """
+    Merges backfilled records with ``merge_release_history`` over a pool of
+    parallel writers. Returns the number of records written; raises
+    DynamoDBWriteError when a record cannot be written.
+    """
+    records = list(records)
+    if not records:
+        return 0
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(records)))) as pool:
+        futures = [
+            pool.submit(propagate(merge_release_history), table, record)
+            for record in records
+        ]
+        for future in futures:
+            future.result()
+
+    stale = {(table.name, record["device"]) for record in records}
+    for key in [k for k in _release_history_cache if k[:2] in stale]:
+        del _release_history_cache[key]
+    return len(records)
+
+
+@traced("sns.Publish", {"messaging.system": "sns"})
 def publish_release_notification(subject: str, message: str) -> None:
     """Publish a release notification to SNS when a release topic is configured."""
     topic_arn = os.getenv(RELEASE_NOTIFICATION_TOPIC_ENV_VAR)
@@ -76,7 +639,7 @@ def publish_release_notification(subject: str, message: str) -> None:
         return
 
     try:
-        sns_client.publish(
+        get_sns_client().publish(
             TopicArn=topic_arn,
             Subject=subject,
             Message=message,
@@ -86,35 +649,278 @@ def publish_release_notification(subject: str, message: str) -> None:
         raise
 
 
-def notify_error(source: str, error_message: str, details: dict | None = None) -> None:
-    """Publish an error notification to SNS when an alert topic is configured."""
-    topic_arn = os.getenv(ERROR_ALERT_TOPIC_ENV_VAR)
+def release_message_attributes(device: str, release_version: str) -> dict:
+    """
+    SNS message attributes for one device release, for subscription filter
+    policies: device, numeric major version and whether it is an X.0 release.
+    """
+    match = RELEASE_VERSION_PARTS_RE.match(release_version)
+    if not match:
+        return {"device": {"DataType": "String", "StringValue": device}}
+    minor_parts = [int(part) for part in match.group(2).split(".") if part]
+    return {
+        "device": {"DataType": "String", "StringValue": device},
+        "major_version": {"DataType": "Number", "StringValue": match.group(1)},
+        "is_major_release": {
+            "DataType": "String",
+            "StringValue": "true" if not any(minor_parts) else "false",
+        },
+    }
+
+
+@traced("sns.PublishBatch", {"messaging.system": "sns"})
+def publish_device_notifications(changed_releases, topic_arn: str | None = None) -> int:
+    """
+    Publish one structured message per changed device with PublishBatch, in
+    chunks of 10, so subscribers can filter on the message attributes.
+    Publishes to ``topic_arn``, defaulting to the release notification topic.
+    Returns the number of messages published.
+    """
+    topic_arn = topic_arn or os.getenv(RELEASE_NOTIFICATION_TOPIC_ENV_VAR)
     if not topic_arn:
-        return
+        logger.info(
+            "Release notification topic is not configured; skipping notification publish."
+        )
+        return 0
+
+    entries = [
+        {
+            "Id": f"release-{index}",
+            "Subject": f"Apple release update: {release['device']} {release['release_version']}",
+            "Message": json.dumps(release, default=str),
+            "MessageAttributes": release_message_attributes(
+                release["device"], release["release_version"]
+            ),
+        }
+        for index, release in enumerate(changed_releases)
+    ]
+    current_span().set_attribute("message_count", len(entries))
+
+    for start in range(0, len(entries), SNS_PUBLISH_BATCH_MAX_ENTRIES):
+        try:
+            response = get_sns_client().publish_batch(
+                TopicArn=topic_arn,
+                PublishBatchRequestEntries=entries[
+                    start : start + SNS_PUBLISH_BATCH_MAX_ENTRIES
+                ],
+            )
+        except (ClientError, BotoCoreError):
+            logger.error("Failed to publish SNS device notifications.", exc_info=True)
+            raise
+
+        failed = response.get("Failed") or []
+        if failed:
+            logger.error(f"SNS rejected device notifications: {failed}")
+            raise ReleaseNotificationError(
+                f"{len(failed)} device notification(s) were not published: {failed}"
+            )
 
+    return len(entries)
+
+
+def notify_error(source: str, error_message: str, details: dict | None = None) -> None:
+    """
+    Publish an error notification to SNS when an alert topic is configured.
+    Inside ``coalesce_errors`` the error is buffered and sent with the others
+    when the block exits.
+    """
     payload = {
         "source": source,
         "error_message": error_message,
         "details": details or {},
     }
+    with _error_buffer_lock:
+        if _error_buffer is not None:
+            _error_buffer.append(payload)
+            return
+
+    topic_arn = os.getenv(ERROR_ALERT_TOPIC_ENV_VAR)
+    if not topic_arn:
+        return
+
+    try:
+        with start_span("sns.Publish", {"messaging.system": "sns"}):
+            get_sns_client().publish(
+                TopicArn=topic_arn,
+                Subject=f"Lambda error: {source}",
+                Message=json.dumps(payload, default=str),
+            )
+    except (ClientError, BotoCoreError):
+        logger.error("Failed to publish SNS error notification.", exc_info=True)
+
+
+def error_fingerprint(source: str, error_message: str, details: dict | None) -> str:
+    """Stable fingerprint of an error: source, message and a hash of the details."""
+    details_hash = hashlib.sha256(
+        json.dumps(details or {}, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    return hashlib.sha256(
+        f"{source}\n{error_message}\n{details_hash}".encode("utf-8")
+    ).hexdigest()[:32]
+
+
+def error_alert_window_seconds() -> int:
+    """Suppression window for repeated alerts, from the environment."""
+    return env_int(ERROR_ALERT_WINDOW_ENV_VAR, DEFAULT_ERROR_ALERT_WINDOW_SECONDS)
 
+
+@traced("dynamodb.UpdateItem", {"db.system": "dynamodb"})
+def claim_error_alert(table, fingerprint: str, occurrences: int = 1):
+    """
+    Decides whether an error alert may fire, using a TTL item per fingerprint.
+
+    The first alert in a window claims the item and returns the number of
+    repeats suppressed since the previous alert (0 if none). Within the
+    window the repeat is added to ``SuppressedCount`` and None is returned.
+    DynamoDB failures fail open (the alert fires).
+    """
+    now = int(time.time())
+    window = error_alert_window_seconds()
+    key = {"device": f"{ALERT_KEY_PREFIX}{fingerprint}"}
+    current_span().set_attribute("fingerprint", fingerprint)
     try:
-        sns_client.publish(
+        response = table.update_item(
+            Key=key,
+            UpdateExpression=(
+                "SET SuppressUntil=:until, ExpiresAt=:expires, SuppressedCount=:zero"
+            ),
+            ConditionExpression=(
+                "attribute_not_exists(SuppressUntil) OR SuppressUntil <= :now"
+            ),
+            ExpressionAttributeValues={
+                ":now": now,
+                ":until": now + window,
+                ":expires": now + 2 * window,
+                ":zero": 0,
+            },
+            ReturnValues="ALL_OLD",
+        )
+    except ClientError as err:
+        if (
+            err.response.get("Error", {}).get("Code")
+            != "ConditionalCheckFailedException"
+        ):
+            logger.warning(
+                f"Could not check alert suppression for {fingerprint}: {err}"
+            )
+            return 0
+        try:
+            table.update_item(
+                Key=key,
+                UpdateExpression="ADD SuppressedCount :count",
+                ExpressionAttributeValues={":count": occurrences},
+            )
+        except ClientError as count_err:
+            logger.warning(
+                f"Could not count suppressed alert {fingerprint}: {count_err}"
+            )
+        return None
+    return int(response.get("Attributes", {}).get("SuppressedCount", 0))
+
+
+@traced("sns.Publish", {"messaging.system": "sns"})
+def flush_errors(source: str, errors, table=None) -> bool:
+    """
+    Publishes buffered errors as one SNS message. Identical errors are
+    grouped with an ``occurrences`` count; when ``table`` is given, errors
+    still inside their suppression window are dropped and re-fired errors
+    carry ``suppressed_count``. Returns True when a message was published.
+    """
+    topic_arn = os.getenv(ERROR_ALERT_TOPIC_ENV_VAR)
+    if not topic_arn or not errors:
+        return False
+
+    grouped = {}
+    for error in errors:
+        fingerprint = error_fingerprint(
+            error["source"], error["error_message"], error["details"]
+        )
+        entry = grouped.setdefault(fingerprint, dict(error, occurrences=0))
+        entry["occurrences"] += 1
+
+    alerts = []
+    for fingerprint, error in grouped.items():
+        suppressed = (
+            claim_error_alert(table, fingerprint, error["occurrences"])
+            if table is not None
+            else 0
+        )
+        if suppressed is None:
+            continue
+        if suppressed:
+            error["suppressed_count"] = suppressed
+        alerts.append(error)
+
+    current_span().set_attribute("error_count", len(alerts))
+    if not alerts:
+        logger.info(f"Suppressed {len(grouped)} repeated error alert(s).")
+        return False
+
+    try:
+        get_sns_client().publish(
             TopicArn=topic_arn,
-            Subject=f"Lambda error: {source}",
-            Message=json.dumps(payload, default=str),
+            Subject=f"Lambda error: {source}"[:100],
+            Message=json.dumps({"source": source, "errors": alerts}, default=str),
         )
     except (ClientError, BotoCoreError):
         logger.error("Failed to publish SNS error notification.", exc_info=True)
+        return False
+    return True
+
+
+@contextmanager
+def coalesce_errors(source: str, table=None):
+    """
+    Buffers every ``notify_error`` call made inside the block and flushes
+    them as one message when it exits, with repeat suppression when a
+    ``table`` is given.
+    """
+    global _error_buffer
+    with _error_buffer_lock:
+        _error_buffer = []
+    try:
+        yield
+    finally:
+        with _error_buffer_lock:
+            errors, _error_buffer = _error_buffer, None
+        flush_errors(source, errors, table)
 
 
 # -------------------------------------------------------------------------
 # Module Exports
 # -------------------------------------------------------------------------
 __all__ = [
+    "env_int",
+    "get_boto_config",
+    "get_session",
+    "get_dynamodb_resource",
+    "get_sns_client",
+    "get_s3_client",
     "create_dynamodb_resource",
     "get_device_item",
+    "get_device_items",
+    "get_cached_device_items",
+    "cache_release_state",
+    "invalidate_release_state",
+    "release_state_cache_stats",
+    "clear_release_state_cache",
+    "get_page_state",
+    "get_page_states",
+    "update_page_state",
+    "release_history_sort_key",
+    "get_release_history",
+    "append_release_history",
+    "merge_release_history",
+    "merge_release_history_records",
     "publish_release_notification",
+    "release_message_attributes",
+    "publish_device_notifications",
     "notify_error",
+    "coalesce_errors",
+    "flush_errors",
+    "claim_error_alert",
+    "error_fingerprint",
     "DynamoDBItemNotFound",
+    "DynamoDBWriteError",
+    "ReleaseNotificationError",
 ]
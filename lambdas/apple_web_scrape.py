@@ -1,41 +1,302 @@
 import os
+import codecs
+import hashlib
 import logging
+import time
 import urllib3
+from datetime import datetime, timezone
 import re
 
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
 from botocore.exceptions import ClientError
 
 try:
     from .apple_utils import (
-        get_device_item,
+        append_release_history,
+        cache_release_state,
+        get_page_states,
+        invalidate_release_state,
+        release_state_cache_stats,
+        update_page_state,
         create_dynamodb_resource,
         notify_error,
+        coalesce_errors,
         publish_release_notification,
+        publish_device_notifications,
+        DynamoDBItemNotFound,
+        DEVICE_LIST,
+        DYNAMODB_TABLE_ENV_VAR,
+        HISTORY_TABLE_ENV_VAR,
     )
+    from .apple_feed import publish_release_feed
+    from .apple_snapshot import archive_page_snapshot
+    from .apple_subscription import notify_subscribers, SUBSCRIPTION_TABLE_ENV_VAR
+    from .apple_metrics import add_metric, invocation_metrics, phase, timed_phase
+    from .apple_tracing import current_span, propagate, start_span, traced
 except ImportError:
     from apple_utils import (
-        get_device_item,
+        append_release_history,
+        cache_release_state,
+        get_page_states,
+        invalidate_release_state,
+        release_state_cache_stats,
+        update_page_state,
         create_dynamodb_resource,
         notify_error,
+        coalesce_errors,
         publish_release_notification,
+        publish_device_notifications,
+        DynamoDBItemNotFound,
+        DEVICE_LIST,
+        DYNAMODB_TABLE_ENV_VAR,
+        HISTORY_TABLE_ENV_VAR,
     )
+    from apple_feed import publish_release_feed
+    from apple_snapshot import archive_page_snapshot
+    from apple_subscription import notify_subscribers, SUBSCRIPTION_TABLE_ENV_VAR
+    from apple_metrics import add_metric, invocation_metrics, phase, timed_phase
+    from apple_tracing import current_span, propagate, start_span, traced
 
 # Constants
 APPLE_RELEASE_URL = "https://support.apple.com/en-us/100100"
-DEVICE_LIST = ["iOS", "macOS", "watchOS", "tvOS", "visionOS"]
-DYNAMODB_TABLE_ENV_VAR = "dynamodb_table_name"
+RELEASE_URLS_ENV_VAR = "apple_release_urls"
+MAX_LOCALE_WORKERS = 4
+STREAM_FETCH_ENV_VAR = "stream_release_page"
+# "inline" publishes from the scrape; "stream" leaves it to apple_release_stream
+RELEASE_NOTIFICATION_MODE_ENV_VAR = "release_notification_mode"
+# "combined" sends one email for all changes; "per_device" one message per device
+RELEASE_NOTIFICATION_FORMAT_ENV_VAR = "release_notification_format"
+# "sequential" writes the devices one after another; "concurrent" issues the
+# conditional writes in parallel
+PIPELINE_MODE_ENV_VAR = "pipeline_mode"
+MAX_DEVICE_WRITE_WORKERS = 5
+STREAM_CHUNK_BYTES = 16 * 1024
+
+# Returned instead of page content when Apple answers a conditional GET with 304
+# or when the release section fingerprint matches the stored one
+PAGE_NOT_MODIFIED = object()
+
+# "Latest version" phrasing per page language: (lowercase marker, statement pattern)
+LOCALE_RELEASE_PHRASES = {
+    "en": (
+        "the latest version",
+        re.compile(r"The latest version[^.]+?\d+(?:\.\d+)+"),
+    ),
+    "de": (
+        "neueste version",
+        re.compile(r"Die neueste Version[^.]+?\d+(?:\.\d+)+"),
+    ),
+    "fr": (
+        "dernière version",
+        re.compile(r"La dernière version[^.]+?\d+(?:\.\d+)+"),
+    ),
+    "es": (
+        "versión más reciente",
+        re.compile(r"La versión más reciente[^.]+?\d+(?:\.\d+)+"),
+    ),
+    "ja": (
+        "最新バージョン",
+        re.compile(r"[^。]*?最新バージョン[^。]*?\d+(?:\.\d+)+"),
+    ),
+}
+LOCALE_PATH_RE = re.compile(r"/([a-z]{2})-[a-z]{2}/", re.IGNORECASE)
+
+# Opening/closing tags of the <ul class="gb-list"> release region
+RELEASE_LIST_OPEN_RE = re.compile(
+    r"""<ul\b[^>]*\bclass\s*=\s*["'][^"']*(?<![\w-])gb-list(?![\w-])[^>]*>""",
+    re.IGNORECASE,
+)
+UL_TAG_RE = re.compile(r"<(/?)ul\b", re.IGNORECASE)
+
+# HTTP client policy
+HTTP_CONNECT_TIMEOUT_SECONDS = 5
+HTTP_READ_TIMEOUT_SECONDS = 10
+HTTP_POOL_MAXSIZE = 4
+HTTP_RETRY_TOTAL = 3
+HTTP_RETRY_CONNECT = 2
+HTTP_RETRY_READ = 2
+HTTP_RETRY_BACKOFF_FACTOR = 0.5
+HTTP_RETRY_BACKOFF_JITTER = 0.25
+HTTP_RETRY_BACKOFF_MAX_SECONDS = 4
+HTTP_RETRY_STATUS_FORCELIST = (429, 500, 502, 503, 504)
+# Time left for DynamoDB writes and notifications after the fetch gives up
+DEADLINE_SAFETY_MARGIN_SECONDS = 5
 
 # Setup logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 
-def fetch_apple_release_page(url=APPLE_RELEASE_URL):
-    """Fetch the latest Apple releases page."""
-    http = urllib3.PoolManager(timeout=urllib3.Timeout(connect=5, read=10))
+class DeadlineRetry(urllib3.Retry):
+    """urllib3 Retry policy that also stops retrying at a wall-clock deadline."""
+
+    def __init__(self, *args, deadline=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.deadline = deadline
+
+    def new(self, **kwargs):
+        retry = super().new(**kwargs)
+        retry.deadline = self.deadline
+        return retry
+
+    def is_exhausted(self):
+        if super().is_exhausted():
+            return True
+        if self.deadline is None:
+            return False
+        return time.monotonic() + self.get_backoff_time() >= self.deadline
+
+
+def build_retry_policy(deadline=None):
+    """Exponential backoff with jitter and separate connect/read retry budgets."""
+    return DeadlineRetry(
+        total=HTTP_RETRY_TOTAL,
+        connect=HTTP_RETRY_CONNECT,
+        read=HTTP_RETRY_READ,
+        backoff_factor=HTTP_RETRY_BACKOFF_FACTOR,
+        backoff_jitter=HTTP_RETRY_BACKOFF_JITTER,
+        backoff_max=HTTP_RETRY_BACKOFF_MAX_SECONDS,
+        status_forcelist=HTTP_RETRY_STATUS_FORCELIST,
+        raise_on_status=False,
+        deadline=deadline,
+    )
+
+
+# Global HTTP client reused across warm invocations (keeps the TCP/TLS
+# connection alive between runs, like the boto3 clients in apple_utils)
+http_client = urllib3.PoolManager(
+    maxsize=HTTP_POOL_MAXSIZE,
+    retries=build_retry_policy(),
+    timeout=urllib3.Timeout(
+        connect=HTTP_CONNECT_TIMEOUT_SECONDS, read=HTTP_READ_TIMEOUT_SECONDS
+    ),
+)
+
+
+def remaining_time_budget(context):
+    """Seconds the fetch may use, derived from the Lambda context when present."""
+    get_remaining_time = getattr(context, "get_remaining_time_in_millis", None)
+    if get_remaining_time is None:
+        return None
+    return max(get_remaining_time() / 1000 - DEADLINE_SAFETY_MARGIN_SECONDS, 1)
+
+
+def request_options(time_budget=None):
+    """Per-request retry and timeout settings bounded by ``time_budget`` seconds."""
+    if time_budget is None:
+        return {}
+    return {
+        "retries": build_retry_policy(deadline=time.monotonic() + time_budget),
+        "timeout": urllib3.Timeout(
+            connect=min(HTTP_CONNECT_TIMEOUT_SECONDS, time_budget),
+            read=min(HTTP_READ_TIMEOUT_SECONDS, time_budget),
+            total=time_budget,
+        ),
+    }
+
+
+def conditional_request_headers(page_state):
+    """Build If-None-Match/If-Modified-Since headers from stored page validators."""
+    headers = {}
+    if not page_state:
+        return headers
+    if page_state.get("ETag"):
+        headers["If-None-Match"] = page_state["ETag"]
+    if page_state.get("LastModified"):
+        headers["If-Modified-Since"] = page_state["LastModified"]
+    return headers
+
+
+def read_release_prefix(response, language="en"):
+    """
+    Stream a response body through an incremental decoder and ReleaseListParser.
+
+    Returns the decoded text up to the end of the release list's closing tag
+    and closes the connection once it has been read, so the rest of the page
+    is never downloaded or held in memory. Cutting at the tag rather than the
+    chunk boundary keeps the prefix (and its fingerprint) independent of
+    where the list happens to fall in the byte stream.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    parser = ReleaseListParser(marker=LOCALE_RELEASE_PHRASES[language][0])
+    parts = []
+    bytes_read = 0
+
+    for chunk in response.stream(STREAM_CHUNK_BYTES):
+        bytes_read += len(chunk)
+        text = decoder.decode(chunk)
+        parts.append(text)
+        parser.feed(text)
+        if parser.done:
+            # Closing (rather than draining) drops the rest of the body
+            response.close()
+            break
+    else:
+        parts.append(decoder.decode(b"", final=True))
+
+    add_metric("BytesDownloaded", bytes_read, "Bytes")
+    logger.info(
+        f"Streamed {bytes_read} bytes of Apple release page; "
+        f"stopped early: {parser.done}"
+    )
+    text = "".join(parts)
+    if parser.end_position is None:
+        return text
+    return text[: text_offset_after_tag(text, parser.end_position)]
+
+
+def text_offset_after_tag(text, position):
+    """
+    Offset just past the tag starting at ``position``, an HTMLParser
+    ``getpos()`` pair (1-based line, 0-based column).
+    """
+    line, column = position
+    start = 0
+    for _ in range(line - 1):
+        start = text.index("\n", start) + 1
+    close = text.find(">", start + column)
+    return len(text) if close == -1 else close + 1
+
+
+@timed_phase("Fetch")
+@traced("fetch_apple_release_page", {"http.method": "GET"})
+def fetch_apple_release_page(
+    url=APPLE_RELEASE_URL, page_state=None, stream=False, time_budget=None
+):
+    """
+    Fetch the latest Apple releases page.
+
+    When ``page_state`` holds validators from a previous fetch the request is
+    made conditional and ``PAGE_NOT_MODIFIED`` is returned on a 304. On a 200
+    the response validators are written back into ``page_state`` so the caller
+    can persist them.
+
+    With ``stream=True`` only the page prefix up to the end of the release list
+    is downloaded and returned (see ``read_release_prefix``).
+
+    ``time_budget`` (seconds) caps the request timeouts and stops retries once
+    it has been used up.
+    """
+    response = None
+    span = current_span()
+    span.set_attribute("http.url", url)
     try:
-        response = http.request("GET", url, redirect=True)
+        response = http_client.request(
+            "GET",
+            url,
+            headers=conditional_request_headers(page_state),
+            redirect=True,
+            preload_content=not stream,
+            **request_options(time_budget),
+        )
+        span.set_attribute("http.status_code", response.status)
+        span.set_attribute(
+            "http.retry_count", len(response.retries.history) if response.retries else 0
+        )
+        if response.status == 304:
+            logger.info(f"Apple release page not modified since last fetch: {url}")
+            return PAGE_NOT_MODIFIED
         if response.status != 200:
             logger.error(f"Failed to fetch URL {url}. Status code: {response.status}")
             notify_error(
@@ -44,6 +305,12 @@ def fetch_apple_release_page(url=APPLE_RELEASE_URL):
                 details={"status_code": response.status, "url": url},
             )
             return None
+        if page_state is not None:
+            page_state["ETag"] = response.headers.get("ETag")
+            page_state["LastModified"] = response.headers.get("Last-Modified")
+        if stream:
+            return read_release_prefix(response, release_page_language(url))
+        add_metric("BytesDownloaded", len(response.data), "Bytes")
         return response.data.decode("utf-8", errors="ignore")
     except urllib3.exceptions.HTTPError as e:
         logger.error(f"HTTP error occurred while fetching Apple release page: {e}")
@@ -61,25 +328,140 @@ def fetch_apple_release_page(url=APPLE_RELEASE_URL):
             details={"exception": str(e), "url": url},
         )
         return None
-
-
-def parse_release_statements(page_content):
-    """Parse and return release statements mapped explicitly by device."""
-    soup = BeautifulSoup(page_content, "html.parser")
-
-    # Updated: new Apple markup uses <ul class="gb-list"><li><p class="gb-paragraph">...</p></li>
-    paragraphs = soup.select("ul.gb-list li.gb-list_item p.gb-paragraph")
+    finally:
+        if stream and response is not None:
+            response.release_conn()
+
+
+def compute_release_fingerprint(page_content):
+    """
+    Hash only the ``ul.gb-list`` release region(s) of the page.
+
+    The rest of the page carries rotating tokens, so hashing it would never
+    match. A region that never closes (a streamed prefix cut off mid-list)
+    is skipped, since how much of it arrived is arbitrary. Returns None when
+    no complete release list is present.
+    """
+    digest = hashlib.sha256()
+    found = False
+    position = 0
+
+    while True:
+        opening = RELEASE_LIST_OPEN_RE.search(page_content, position)
+        if not opening:
+            break
+
+        depth = 1
+        end = None
+        for tag in UL_TAG_RE.finditer(page_content, opening.end()):
+            depth += -1 if tag.group(1) else 1
+            if depth == 0:
+                end = tag.start()
+                break
+        if end is None:
+            break
+
+        digest.update(page_content[opening.start() : end].encode("utf-8"))
+        found = True
+        position = end
+
+    return digest.hexdigest() if found else None
+
+
+class _ReleaseListComplete(Exception):
+    """Raised inside ReleaseListParser to abandon the rest of the document."""
+
+
+class ReleaseListParser(HTMLParser):
+    """
+    Streaming parser for ``ul.gb-list li.gb-list_item p.gb-paragraph`` text.
+
+    Feed it the page (whole or in chunks); it sets ``done`` and ignores further
+    input once the list holding the "latest version" sentences has closed, so
+    the footer and the security-release table are never tokenized.
+    """
+
+    def __init__(self, marker=LOCALE_RELEASE_PHRASES["en"][0]):
+        super().__init__(convert_charrefs=True)
+        self.marker = marker
+        self.paragraphs = []
+        self.done = False
+        # (line, column) of the release list's closing tag, once seen
+        self.end_position = None
+        self._list_depth = 0
+        self._items = []
+        self._text = None
+
+    def feed(self, data):
+        if self.done:
+            return
+        try:
+            super().feed(data)
+        except _ReleaseListComplete:
+            self.done = True
+
+    def handle_starttag(self, tag, attrs):
+        if tag not in ("ul", "li", "p"):
+            return
+        self._end_paragraph()
+        classes = (dict(attrs).get("class") or "").split()
+
+        if tag == "ul":
+            if self._list_depth or "gb-list" in classes:
+                self._list_depth += 1
+        elif tag == "li" and self._list_depth:
+            self._items.append("gb-list_item" in classes)
+        elif tag == "p" and any(self._items) and "gb-paragraph" in classes:
+            self._text = []
+
+    def handle_endtag(self, tag):
+        if tag not in ("ul", "li", "p"):
+            return
+        self._end_paragraph()
+
+        if tag == "li" and self._items:
+            self._items.pop()
+        elif tag == "ul" and self._list_depth:
+            self._list_depth -= 1
+            if not self._list_depth:
+                self._items.clear()
+                if any(self.marker in p.lower() for p in self.paragraphs):
+                    self.end_position = self.getpos()
+                    raise _ReleaseListComplete()
+
+    def handle_data(self, data):
+        if self._text is not None:
+            self._text.append(data)
+
+    def _end_paragraph(self):
+        if self._text is None:
+            return
+        text = " ".join(part.strip() for part in self._text if part.strip())
+        self.paragraphs.append(text)
+        self._text = None
+
+
+def release_page_language(url):
+    """Return the language of a support page URL (``/de-de/`` -> ``de``)."""
+    match = LOCALE_PATH_RE.search(url or "")
+    language = match.group(1).lower() if match else "en"
+    return language if language in LOCALE_RELEASE_PHRASES else "en"
+
+
+def match_release_statements(paragraphs, language="en"):
+    """Map "latest version" paragraph texts to release statements by device."""
+    marker, statement_re = LOCALE_RELEASE_PHRASES[language]
     release_statements = {}
 
-    for p in paragraphs:
-        text = p.get_text(" ", strip=True).replace("\xa0", " ")
+    for text in paragraphs:
+        text = text.replace("\xa0", " ")
         lower = text.lower()
 
-        if "the latest version" not in lower:
+        if marker not in lower:
             continue
 
         # Extract the main sentence up to the version number
-        match = re.search(r"The latest version[^.]+?\d+(?:\.\d+)+", text)
+        match = statement_re.search(text)
         if not match:
             continue
 
@@ -97,6 +479,54 @@ def parse_release_statements(page_content):
         elif "visionos" in lower:
             release_statements["visionOS"] = statement_text
 
+    return release_statements
+
+
+def parse_release_paragraphs_fast(page_content, language="en"):
+    """Collect release list paragraphs with ReleaseListParser (no DOM build)."""
+    parser = ReleaseListParser(marker=LOCALE_RELEASE_PHRASES[language][0])
+    parser.feed(page_content)
+    return parser.paragraphs
+
+
+def parse_release_paragraphs_soup(page_content):
+    """Collect release list paragraphs from a full BeautifulSoup DOM."""
+    # bs4 (~50ms to import) is only loaded when the fast path misses devices
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(page_content, "html.parser")
+
+    # Updated: new Apple markup uses <ul class="gb-list"><li><p class="gb-paragraph">...</p></li>
+    paragraphs = soup.select("ul.gb-list li.gb-list_item p.gb-paragraph")
+    return [p.get_text(" ", strip=True) for p in paragraphs]
+
+
+@timed_phase("Parse")
+def parse_release_statements(page_content, language="en"):
+    """
+    Parse and return release statements mapped explicitly by device.
+
+    The streaming fast path runs first; the BeautifulSoup selector path is
+    only used when the fast path misses devices. ``language`` selects the
+    "latest version" phrasing of a localized page.
+    """
+    release_statements = match_release_statements(
+        parse_release_paragraphs_fast(page_content, language), language
+    )
+    parse_path = "fast"
+
+    if any(d not in release_statements for d in DEVICE_LIST):
+        soup_statements = match_release_statements(
+            parse_release_paragraphs_soup(page_content), language
+        )
+        if len(soup_statements) > len(release_statements):
+            release_statements = soup_statements
+            parse_path = "soup"
+        else:
+            parse_path = "fast+soup"
+
+    logger.info(f"Release parse path: {parse_path}")
+
     # Warn if some expected devices are missing
     missing = [d for d in DEVICE_LIST if d not in release_statements]
     if missing:
@@ -107,6 +537,7 @@ def parse_release_statements(page_content):
     return release_statements if release_statements else None
 
 
+@timed_phase("Extract")
 def extract_release_versions(release_statements):
     """Extract release versions explicitly by device."""
     releases = {}
@@ -124,13 +555,35 @@ def extract_release_versions(release_statements):
     return releases
 
 
-def get_latest_releases():
-    """Fetch and parse the latest Apple software releases explicitly by device."""
-    page_content = fetch_apple_release_page()
+def get_page_releases(url, page_state=None, stream=False, time_budget=None):
+    """
+    Fetch and parse the latest Apple software releases from one support page.
+    Returns ``PAGE_NOT_MODIFIED`` when the page, or just its release section,
+    has not changed since the fetch described by ``page_state``.
+    """
+    page_content = fetch_apple_release_page(
+        url, page_state=page_state, stream=stream, time_budget=time_budget
+    )
+    if page_content is PAGE_NOT_MODIFIED:
+        return PAGE_NOT_MODIFIED
     if not page_content:
         return None
 
-    release_statements = parse_release_statements(page_content)
+    fingerprint = compute_release_fingerprint(page_content)
+    if fingerprint and page_state is not None:
+        if fingerprint == page_state.get("ReleaseFingerprint"):
+            logger.info("Release fingerprint check: hit")
+            return PAGE_NOT_MODIFIED
+        logger.info("Release fingerprint check: miss")
+        page_state["ReleaseFingerprint"] = fingerprint
+
+    # Only pages fetched against stored state are archived: unchanged pages
+    # returned above, and full re-reads for a locale merge are not new
+    if page_state is not None:
+        archive_page_snapshot(url, page_content, fingerprint)
+
+    language = release_page_language(url)
+    release_statements = parse_release_statements(page_content, language)
     if not release_statements:
         return None
 
@@ -148,13 +601,106 @@ def get_latest_releases():
     return releases_dict
 
 
+def version_key(version):
+    """Sortable key for dotted version strings ("26.0.10" > "26.0.9")."""
+    return tuple(int(part) for part in version.split("."))
+
+
+def merge_locale_releases(locale_releases):
+    """
+    Merge per-locale release dicts, keeping the highest version per device.
+    Ties keep the earlier locale, so the primary page's statement wins.
+    """
+    merged = {"release_statements": {}}
+
+    for releases in locale_releases:
+        for device, version in releases.items():
+            if device == "release_statements":
+                continue
+            if device in merged and version_key(version) <= version_key(merged[device]):
+                continue
+            merged[device] = version
+            merged["release_statements"][device] = releases["release_statements"][
+                device
+            ]
+
+    return merged
+
+
+@traced("get_latest_releases")
+def get_latest_releases(urls=None, page_states=None, stream=False, time_budget=None):
+    """
+    Fetch and parse the latest Apple software releases explicitly by device.
+
+    Several localized support pages are fetched concurrently over the shared
+    HTTP pool and merged by highest version per device. ``page_states`` maps
+    each URL to its stored fetch state. Returns ``PAGE_NOT_MODIFIED`` only when
+    every page is unchanged, and None when any page fails, because merging a
+    partial set could move a device back to a lagging locale's version.
+    """
+    urls = urls or [APPLE_RELEASE_URL]
+    span = current_span()
+    span.set_attribute("url_count", len(urls))
+
+    def fetch_all(targets, use_state):
+        def fetch(url):
+            page_state = page_states.setdefault(url, {}) if use_state else None
+            return get_page_releases(
+                url, page_state=page_state, stream=stream, time_budget=time_budget
+            )
+
+        if len(targets) == 1:
+            return {targets[0]: fetch(targets[0])}
+        workers = min(len(targets), MAX_LOCALE_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(propagate(fetch), url) for url in targets]
+            return {url: future.result() for url, future in zip(targets, futures)}
+
+    results = fetch_all(urls, use_state=page_states is not None)
+
+    if all(result is PAGE_NOT_MODIFIED for result in results.values()):
+        span.set_attribute("result", "not_modified")
+        return PAGE_NOT_MODIFIED
+
+    # Another locale changed, so unchanged pages are re-read in full for the merge
+    unchanged = [url for url, result in results.items() if result is PAGE_NOT_MODIFIED]
+    if unchanged:
+        results.update(fetch_all(unchanged, use_state=False))
+
+    failed = [url for url, result in results.items() if not result]
+    if failed:
+        logger.error(f"Failed to retrieve releases from: {failed}")
+        span.set_attribute("result", "failed")
+        return None
+
+    span.set_attribute("result", "changed")
+    if len(urls) == 1:
+        return results[urls[0]]
+    return merge_locale_releases(results[url] for url in urls)
+
+
+@timed_phase("DynamoDB")
+@traced("dynamodb.UpdateItem", {"db.system": "dynamodb"})
 def update_dynamodb(table, device, release_version, release_statement):
-    """Update DynamoDB with new release information."""
+    """
+    Update DynamoDB with new release information.
+
+    The write is conditional on the stored version differing, so DynamoDB
+    itself decides whether this is a change. Returns True when the release was
+    written, None when DynamoDB already held this version (including when an
+    overlapping invocation recorded it first) and False on error.
+    """
     logger.info(f"Updating DynamoDB entry for {device}.")
+    span = current_span()
+    span.set_attribute("device", device)
+    span.set_attribute("release_version", release_version)
     try:
         table.update_item(
             Key={"device": device},
             UpdateExpression="SET ReleaseVersion=:version, ReleaseStatement=:statement",
+            ConditionExpression=(
+                "attribute_not_exists(ReleaseVersion) OR ReleaseVersion <> :version"
+            ),
             ExpressionAttributeValues={
                 ":version": release_version,
                 ":statement": release_statement,
@@ -162,6 +708,15 @@ def update_dynamodb(table, device, release_version, release_statement):
             ReturnValues="UPDATED_NEW",
         )
     except ClientError as err:
+        if (
+            err.response.get("Error", {}).get("Code")
+            == "ConditionalCheckFailedException"
+        ):
+            logger.info(f"No update needed for {device}; {release_version} is stored.")
+            span.set_attribute("changed", False)
+            # Another writer got there first, so the cached item may be stale
+            invalidate_release_state(table, device)
+            return None
         logger.error(
             f"Error updating {device} for version {release_version} in DynamoDB: {err}"
         )
@@ -174,14 +729,67 @@ def update_dynamodb(table, device, release_version, release_statement):
                 "exception": str(err),
             },
         )
+        invalidate_release_state(table, device)
         return False
     else:
         logger.info(
             f"Successfully updated {device} version {release_version} in DynamoDB."
         )
+        span.set_attribute("changed", True)
+        cache_release_state(
+            table,
+            device,
+            {"ReleaseVersion": release_version, "ReleaseStatement": release_statement},
+        )
         return True
 
 
+def write_device_releases(table, latest_releases, workers=1):
+    """
+    Issues the conditional release write for every device, on up to
+    ``workers`` threads. Returns ``{device: update_dynamodb result}``.
+    """
+    devices = [device for device in latest_releases if device != "release_statements"]
+
+    def write(device):
+        return update_dynamodb(
+            table=table,
+            device=device,
+            release_version=latest_releases[device],
+            release_statement=latest_releases["release_statements"][device],
+        )
+
+    if workers <= 1 or len(devices) <= 1:
+        return {device: write(device) for device in devices}
+    with ThreadPoolExecutor(max_workers=min(workers, len(devices))) as executor:
+        return dict(zip(devices, executor.map(propagate(write), devices)))
+
+
+@timed_phase("DynamoDB")
+def record_release_history(history_table, device, release_version, release_statement):
+    """
+    Appends a newly detected release to the history table, dated today (UTC)
+    and stamped with the detection time the adaptive scheduler learns from.
+    A failure is reported but does not fail the run; the backfill can fill gaps.
+    """
+    now = datetime.now(timezone.utc)
+    if append_release_history(
+        table=history_table,
+        device=device,
+        release_version=release_version,
+        release_statement=release_statement,
+        release_date=now.date().isoformat(),
+        detected_at=now.isoformat(timespec="seconds"),
+    ):
+        return True
+    notify_error(
+        source="apple_web_scrape",
+        error_message="Failed to append release history.",
+        details={"device": device, "release_version": release_version},
+    )
+    return False
+
+
 def format_combined_notification(changed_releases):
     """Build a single SNS email for all release updates found in one scrape."""
     subject = f"Apple release updates: {len(changed_releases)} change(s) detected"
@@ -201,8 +809,81 @@ def format_combined_notification(changed_releases):
     return subject, message
 
 
+@timed_phase("SNS")
+def publish_release_changes(changed_releases):
+    """
+    Publish release changes in the configured notification format, then
+    deliver them to matching registry subscribers when a registry is
+    configured. Subscriber delivery failures are reported, not raised.
+    """
+    notification_format = os.getenv(RELEASE_NOTIFICATION_FORMAT_ENV_VAR, "combined")
+    if notification_format.lower() == "per_device":
+        publish_device_notifications(changed_releases)
+    else:
+        subject, message = format_combined_notification(changed_releases)
+        publish_release_notification(subject, message)
+
+    subscription_table_name = os.getenv(SUBSCRIPTION_TABLE_ENV_VAR)
+    if subscription_table_name:
+        subscription_table = create_dynamodb_resource().Table(subscription_table_name)
+        notify_subscribers(subscription_table, changed_releases)
+
+
+def configured_release_urls():
+    """Release page URLs from the comma-separated env var, defaulting to en-us."""
+    urls = [
+        url.strip()
+        for url in os.getenv(RELEASE_URLS_ENV_VAR, "").split(",")
+        if url.strip()
+    ]
+    return urls or [APPLE_RELEASE_URL]
+
+
+@timed_phase("DynamoDB")
+def save_page_states(table, page_states, stored_page_states):
+    """Persist the fetch state of every page whose validators/fingerprint changed."""
+    for url, page_state in page_states.items():
+        # A validator Apple stopped sending reads as None; it only needs a
+        # write when one is stored
+        current = {name: value for name, value in page_state.items() if value}
+        stored = {
+            name: value
+            for name, value in stored_page_states.get(url, {}).items()
+            if value
+        }
+        if current != stored:
+            update_page_state(table=table, url=url, page_state=page_state)
+
+
 def lambda_handler(event, context):
-    """AWS Lambda entry-point function."""
+    """
+    AWS Lambda entry-point function. Error alerts raised during the run are
+    sent as one message at the end, with repeats suppressed via the table.
+    """
+    dynamodb_table_name = os.getenv(DYNAMODB_TABLE_ENV_VAR)
+    alert_table = (
+        create_dynamodb_resource().Table(dynamodb_table_name)
+        if dynamodb_table_name
+        else None
+    )
+    function_name = getattr(context, "function_name", "apple_web_scrape")
+    with invocation_metrics(function_name):
+        cache_stats = release_state_cache_stats()
+        with start_span("apple_web_scrape", {"faas.name": function_name}):
+            with coalesce_errors(source="apple_web_scrape", table=alert_table):
+                scrape_releases(context)
+        add_release_state_cache_metrics(cache_stats)
+
+
+def add_release_state_cache_metrics(before: dict) -> None:
+    """Release state cache hits and misses during this invocation."""
+    after = release_state_cache_stats()
+    add_metric("ReleaseStateCacheHits", after["hits"] - before["hits"])
+    add_metric("ReleaseStateCacheMisses", after["misses"] - before["misses"])
+
+
+def scrape_releases(context):
+    """Runs one scrape: fetch, detect changes, record them and notify."""
     dynamodb_table_name = os.getenv(DYNAMODB_TABLE_ENV_VAR)
     if not dynamodb_table_name:
         logger.error(f"Environment variable '{DYNAMODB_TABLE_ENV_VAR}' is not set.")
@@ -213,7 +894,37 @@ def lambda_handler(event, context):
         )
         return
 
-    latest_releases = get_latest_releases()
+    dynamodb = create_dynamodb_resource()
+    table = dynamodb.Table(dynamodb_table_name)
+    history_table_name = os.getenv(HISTORY_TABLE_ENV_VAR)
+    history_table = dynamodb.Table(history_table_name) if history_table_name else None
+    release_urls = configured_release_urls()
+
+    try:
+        with phase("DynamoDB"):
+            page_states = get_page_states(table=table, urls=release_urls)
+    except DynamoDBItemNotFound:
+        logger.warning(
+            "Could not load stored page validators; fetching unconditionally."
+        )
+        page_states = {}
+    stored_page_states = {url: dict(state) for url, state in page_states.items()}
+
+    def fetch():
+        return get_latest_releases(
+            urls=release_urls,
+            page_states=page_states,
+            stream=os.getenv(STREAM_FETCH_ENV_VAR, "").lower() == "true",
+            time_budget=remaining_time_budget(context),
+        )
+
+    latest_releases = fetch()
+
+    if latest_releases is PAGE_NOT_MODIFIED:
+        logger.info("Apple release page unchanged; skipping parse and DynamoDB reads.")
+        # A 200 with a matching fingerprint may still carry fresh validators
+        save_page_states(table, page_states, stored_page_states)
+        return
 
     if not latest_releases:
         logger.error("Failed to retrieve latest releases.")
@@ -225,32 +936,22 @@ def lambda_handler(event, context):
 
     logger.info(f"Latest releases fetched: {latest_releases}")
 
-    dynamodb = create_dynamodb_resource()
-    table = dynamodb.Table(dynamodb_table_name)
     changed_releases = []
-
-    for device, latest_version in latest_releases.items():
-        if device == "release_statements":
-            continue
-
-        existing_item = get_device_item(table=table, device=device)
-        existing_version = (
-            existing_item.get("ReleaseVersion") if existing_item else None
-        )
-
-        if existing_version == latest_version:
-            logger.info(f"No update needed for {device}.")
+    all_updates_succeeded = True
+
+    # Change detection happens inside DynamoDB via conditional writes, so
+    # overlapping runs cannot both claim a release. Every device is written;
+    # nothing cached decides whether a release is new.
+    concurrent = os.getenv(PIPELINE_MODE_ENV_VAR, "sequential").lower() == "concurrent"
+    results = write_device_releases(
+        table, latest_releases, workers=MAX_DEVICE_WRITE_WORKERS if concurrent else 1
+    )
+    for device, updated in results.items():
+        if updated is None:
             continue
-
-        release_statement = latest_releases["release_statements"][device]
-        updated = update_dynamodb(
-            table=table,
-            device=device,
-            release_version=latest_version,
-            release_statement=release_statement,
-        )
-
         if updated:
+            latest_version = latest_releases[device]
+            release_statement = latest_releases["release_statements"][device]
             changed_releases.append(
                 {
                     "device": device,
@@ -258,23 +959,38 @@ def lambda_handler(event, context):
                     "release_statement": release_statement,
                 }
             )
+            if history_table is not None:
+                record_release_history(
+                    history_table, device, latest_version, release_statement
+                )
+        else:
+            all_updates_succeeded = False
+
+    # Only remember the validators once the state they describe is stored,
+    # otherwise a 304 on the next run would hide a release we failed to record.
+    if all_updates_succeeded:
+        save_page_states(table, page_states, stored_page_states)
 
     if not changed_releases:
         logger.info("No release changes detected.")
         return
 
-    try:
-        subject, message = format_combined_notification(changed_releases)
-        publish_release_notification(subject, message)
+    publish_release_feed(latest_releases, changed_releases)
+
+    if os.getenv(RELEASE_NOTIFICATION_MODE_ENV_VAR, "inline").lower() == "stream":
         logger.info(
-            "Sent combined release notification for %d updates.", len(changed_releases)
+            "Release notifications for %d updates delegated to the table stream.",
+            len(changed_releases),
         )
+        return
+
+    try:
+        publish_release_changes(changed_releases)
+        logger.info("Sent release notification for %d updates.", len(changed_releases))
     except Exception as err:
-        logger.error(
-            "Failed to publish combined release notification: %s", err, exc_info=True
-        )
+        logger.error("Failed to publish release notification: %s", err, exc_info=True)
         notify_error(
             source="apple_web_scrape",
-            error_message="Failed to publish combined release notification.",
+            error_message="Failed to publish release notification.",
             details={"exception": str(err), "changed_releases": changed_releases},
         )
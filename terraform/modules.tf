@@ -18,9 +18,17 @@ module "lambda_service" {
   region                         = local.region
   python_version                 = local.python_version
   artifact_bucket_id             = module.storage.bucket_id
+  snapshot_bucket_id             = module.storage.snapshot_bucket_id
+  snapshot_bucket_arn            = module.storage.snapshot_bucket_arn
+  feed_bucket_id                 = module.storage.feed_bucket_id
+  feed_bucket_arn                = module.storage.feed_bucket_arn
   dynamodb_table_name            = module.data_store.table_name
   dynamodb_table_arn             = module.data_store.table_arn
   dynamodb_table_stream_arn      = module.data_store.table_stream_arn
+  history_table_name             = module.data_store.history_table_name
+  history_table_arn              = module.data_store.history_table_arn
+  subscription_table_name        = module.data_store.subscription_table_name
+  subscription_table_arn         = module.data_store.subscription_table_arn
   error_alert_topic_arn          = try(aws_sns_topic.lambda_error_alerts[0].arn, null)
   release_notification_topic_arn = try(aws_sns_topic.release_notifications[0].arn, null)
 }
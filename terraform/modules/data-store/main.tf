@@ -14,6 +14,42 @@ resource "aws_dynamodb_table" "apple_os_updates_table" {
     name = "device"
     type = "S"
   }
+
+  # Error alert suppression items (alert#<fingerprint>) expire on their own
+  ttl {
+    attribute_name = "ExpiresAt"
+    enabled        = true
+  }
+}
+
+resource "aws_dynamodb_table" "apple_os_release_history_table" {
+  name                        = "apple_os_release_history_${var.environment}"
+  billing_mode                = "PAY_PER_REQUEST"
+  hash_key                    = "device"
+  range_key                   = "VersionKey"
+  deletion_protection_enabled = var.environment == "production"
+
+  attribute {
+    name = "device"
+    type = "S"
+  }
+
+  attribute {
+    name = "VersionKey"
+    type = "S"
+  }
+}
+
+resource "aws_dynamodb_table" "apple_os_subscriptions_table" {
+  name                        = "apple_os_subscriptions_${var.environment}"
+  billing_mode                = "PAY_PER_REQUEST"
+  hash_key                    = "SubscriptionId"
+  deletion_protection_enabled = var.environment == "production"
+
+  attribute {
+    name = "SubscriptionId"
+    type = "S"
+  }
 }
 
 output "table_name" {
@@ -27,3 +63,19 @@ output "table_arn" {
 output "table_stream_arn" {
   value = aws_dynamodb_table.apple_os_updates_table.stream_arn
 }
+
+output "history_table_name" {
+  value = aws_dynamodb_table.apple_os_release_history_table.name
+}
+
+output "history_table_arn" {
+  value = aws_dynamodb_table.apple_os_release_history_table.arn
+}
+
+output "subscription_table_name" {
+  value = aws_dynamodb_table.apple_os_subscriptions_table.name
+}
+
+output "subscription_table_arn" {
+  value = aws_dynamodb_table.apple_os_subscriptions_table.arn
+}
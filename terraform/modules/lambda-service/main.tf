@@ -30,6 +30,38 @@ variable "dynamodb_table_stream_arn" {
   type = string
 }
 
+variable "history_table_name" {
+  type = string
+}
+
+variable "history_table_arn" {
+  type = string
+}
+
+variable "subscription_table_name" {
+  type = string
+}
+
+variable "subscription_table_arn" {
+  type = string
+}
+
+variable "snapshot_bucket_id" {
+  type = string
+}
+
+variable "snapshot_bucket_arn" {
+  type = string
+}
+
+variable "feed_bucket_id" {
+  type = string
+}
+
+variable "feed_bucket_arn" {
+  type = string
+}
+
 variable "error_alert_topic_arn" {
   type    = string
   default = null
@@ -43,6 +75,9 @@ variable "release_notification_topic_arn" {
 locals {
   name_prefix = "apple-${var.environment}"
 
+  # Subscriber channels are SNS topics named with this prefix
+  subscriber_topic_prefix = "apple-subscribers-"
+
   schedule_by_env = {
     development = null
     production  = "rate(1 hour)"
@@ -51,11 +86,58 @@ locals {
   lambda_definitions = {
     apple_web_scrape = {
       description                 = "Scrapes Apple site and updates DynamoDB"
-      dynamodb_actions            = ["dynamodb:GetItem", "dynamodb:UpdateItem"]
+      dynamodb_actions            = ["dynamodb:GetItem", "dynamodb:BatchGetItem", "dynamodb:UpdateItem"]
       release_notification_access = true
       stream_access               = false
+      history_access              = true
+      snapshot_access             = true
+      feed_access                 = true
+      alert_claim_access          = false
+      function_url                = false
+      notification_mode           = "stream"
       schedule                    = local.schedule_by_env[var.environment]
     }
+    apple_release_stream = {
+      description                 = "Publishes release notifications from the DynamoDB stream"
+      dynamodb_actions            = ["dynamodb:DescribeStream", "dynamodb:GetRecords", "dynamodb:GetShardIterator", "dynamodb:ListStreams"]
+      release_notification_access = true
+      stream_access               = true
+      history_access              = false
+      snapshot_access             = false
+      feed_access                 = false
+      alert_claim_access          = true
+      function_url                = false
+      notification_mode           = null
+      schedule                    = null
+    }
+    apple_release_api = {
+      description                 = "Serves the current release versions over a Function URL"
+      dynamodb_actions            = ["dynamodb:BatchGetItem"]
+      release_notification_access = false
+      stream_access               = false
+      history_access              = false
+      snapshot_access             = false
+      feed_access                 = false
+      alert_claim_access          = true
+      function_url                = true
+      notification_mode           = null
+      schedule                    = null
+    }
+  }
+
+  # Stream records are coalesced per batch; the window bounds the added latency
+  stream_batch_size              = 100
+  stream_batching_window_seconds = 30
+  stream_maximum_retry_attempts  = 5
+
+  stream_lambdas = {
+    for name, cfg in local.lambda_definitions : name => cfg
+    if cfg.stream_access
+  }
+
+  function_url_lambdas = {
+    for name, cfg in local.lambda_definitions : name => cfg
+    if cfg.function_url
   }
 
   scheduled_lambdas = {
@@ -102,10 +184,108 @@ data "aws_iam_policy_document" "lambda_policies" {
   statement {
     sid       = "DynamoDBAccess"
     actions   = each.value.dynamodb_actions
-    resources = concat([var.dynamodb_table_arn], each.value.stream_access ? [var.dynamodb_table_stream_arn] : [])
+    resources = concat(
+      [var.dynamodb_table_arn],
+      each.value.stream_access ? [var.dynamodb_table_stream_arn] : [],
+      each.value.history_access ? [var.history_table_arn] : []
+    )
     effect    = "Allow"
   }
 
+  dynamic "statement" {
+    for_each = each.value.alert_claim_access ? [1] : []
+
+    content {
+      sid = "ErrorAlertClaims"
+      # Error alert suppression only; release rows stay read-only
+      actions   = ["dynamodb:UpdateItem"]
+      resources = [var.dynamodb_table_arn]
+      effect    = "Allow"
+
+      condition {
+        test     = "ForAllValues:StringLike"
+        variable = "dynamodb:LeadingKeys"
+        values   = ["alert#*"]
+      }
+    }
+  }
+
+  dynamic "statement" {
+    for_each = each.value.snapshot_access ? [1] : []
+
+    content {
+      sid       = "PageSnapshotArchive"
+      actions   = ["s3:PutObject", "s3:AbortMultipartUpload"]
+      resources = ["${var.snapshot_bucket_arn}/snapshots/*"]
+      effect    = "Allow"
+    }
+  }
+
+  dynamic "statement" {
+    for_each = each.value.snapshot_access ? [1] : []
+
+    content {
+      sid = "PageSnapshotList"
+      # Dedupe lists the capture day's keys (snapshots/<YYYYmmdd>T...)
+      actions   = ["s3:ListBucket"]
+      resources = [var.snapshot_bucket_arn]
+      effect    = "Allow"
+
+      condition {
+        test     = "StringLike"
+        variable = "s3:prefix"
+        values   = ["snapshots/*"]
+      }
+    }
+  }
+
+  dynamic "statement" {
+    for_each = each.value.feed_access ? [1] : []
+
+    content {
+      sid       = "ReleaseFeedPublish"
+      actions   = ["s3:GetObject", "s3:PutObject"]
+      resources = ["${var.feed_bucket_arn}/feed/*"]
+      effect    = "Allow"
+    }
+  }
+
+  dynamic "statement" {
+    for_each = each.value.feed_access ? [1] : []
+
+    content {
+      sid = "ReleaseFeedList"
+      # Lets S3 answer a first-publish read of latest.json with NoSuchKey.
+      # No s3:prefix condition: GetObject requests carry no prefix, so the
+      # implicit ListBucket check would never match it
+      actions   = ["s3:ListBucket"]
+      resources = [var.feed_bucket_arn]
+      effect    = "Allow"
+    }
+  }
+
+  dynamic "statement" {
+    for_each = each.value.release_notification_access ? [1] : []
+
+    content {
+      sid       = "SubscriberRegistryRead"
+      actions   = ["dynamodb:Scan"]
+      resources = [var.subscription_table_arn]
+      effect    = "Allow"
+    }
+  }
+
+  dynamic "statement" {
+    for_each = each.value.release_notification_access ? [1] : []
+
+    content {
+      sid       = "SnsPublishSubscriberChannels"
+      actions   = ["sns:Publish"]
+      resources = ["arn:aws:sns:${var.region}:${var.account_id}:${local.subscriber_topic_prefix}*"]
+      effect    = "Allow"
+    }
+  }
+
   dynamic "statement" {
     for_each = var.error_alert_topic_arn != null && trimspace(var.error_alert_topic_arn) != "" ? [1] : []
 
@@ -161,6 +341,21 @@ resource "aws_lambda_function" "lambda_functions" {
         environment         = var.environment
         dynamodb_table_name = var.dynamodb_table_name
       },
+      each.value.history_access ? {
+        history_table_name = var.history_table_name
+      } : {},
+      each.value.release_notification_access ? {
+        subscription_table_name = var.subscription_table_name
+      } : {},
+      each.value.snapshot_access ? {
+        snapshot_bucket_name = var.snapshot_bucket_id
+      } : {},
+      each.value.feed_access ? {
+        feed_bucket_name = var.feed_bucket_id
+      } : {},
+      each.value.notification_mode != null ? {
+        release_notification_mode = each.value.notification_mode
+      } : {},
       var.error_alert_topic_arn != null && trimspace(var.error_alert_topic_arn) != "" ? {
         error_alert_topic_arn = var.error_alert_topic_arn
       } : {},
@@ -171,6 +366,35 @@ resource "aws_lambda_function" "lambda_functions" {
   }
 }
 
+resource "aws_lambda_event_source_mapping" "stream_consumers" {
+  for_each                           = local.stream_lambdas
+  event_source_arn                   = var.dynamodb_table_stream_arn
+  function_name                      = aws_lambda_function.lambda_functions[each.key].arn
+  starting_position                  = "LATEST"
+  batch_size                         = local.stream_batch_size
+  maximum_batching_window_in_seconds = local.stream_batching_window_seconds
+  maximum_retry_attempts             = local.stream_maximum_retry_attempts
+  bisect_batch_on_function_error     = true
+  function_response_types            = ["ReportBatchItemFailures"]
+
+  # Only device release writes; page state items never reach the function
+  filter_criteria {
+    filter {
+      pattern = jsonencode({
+        eventName = ["INSERT", "MODIFY"]
+        dynamodb  = { Keys = { device = { S = ["iOS", "macOS", "watchOS", "tvOS", "visionOS"] } } }
+      })
+    }
+  }
+}
+
+# Internal tools call the read API with SigV4-signed requests
+resource "aws_lambda_function_url" "function_urls" {
+  for_each           = local.function_url_lambdas
+  function_name      = aws_lambda_function.lambda_functions[each.key].function_name
+  authorization_type = "AWS_IAM"
+}
+
 output "lambda_function_arns" {
   value = { for name, fn in aws_lambda_function.lambda_functions : name => fn.arn }
 }
@@ -179,6 +403,10 @@ output "lambda_function_names" {
   value = { for name, fn in aws_lambda_function.lambda_functions : name => fn.function_name }
 }
 
+output "lambda_function_urls" {
+  value = { for name, url in aws_lambda_function_url.function_urls : name => url.function_url }
+}
+
 output "lambda_schedules" {
   value = { for name, cfg in local.scheduled_lambdas : name => cfg.schedule }
 }
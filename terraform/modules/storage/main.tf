@@ -84,6 +84,178 @@ resource "aws_s3_bucket_policy" "apple_update_notification_bucket_policy" {
   policy = data.aws_iam_policy_document.deny_insecure_transport.json
 }
 
+# Raw release pages archived by apple_web_scrape, content-addressed by hash
+resource "aws_s3_bucket" "apple_update_notification_snapshot_bucket" {
+  #checkov:skip=CKV_AWS_144:Cross-region replication is not required for page snapshots.
+  bucket = "apple-update-notification-snapshots-${var.account_id}"
+  tags = {
+    Name = "apple-update-notification-snapshots-${var.account_id}"
+  }
+}
+
+resource "aws_s3_bucket_public_access_block" "apple_update_notification_snapshot_bucket_access_block" {
+  bucket = aws_s3_bucket.apple_update_notification_snapshot_bucket.id
+
+  block_public_acls       = true
+  block_public_policy     = true
+  restrict_public_buckets = true
+  ignore_public_acls      = true
+}
+
+resource "aws_s3_bucket_versioning" "apple_update_notification_snapshot_bucket_versioning" {
+  bucket = aws_s3_bucket.apple_update_notification_snapshot_bucket.id
+
+  versioning_configuration {
+    status = "Enabled"
+  }
+}
+
+resource "aws_s3_bucket_server_side_encryption_configuration" "apple_update_notification_snapshot_bucket_sse" {
+  bucket = aws_s3_bucket.apple_update_notification_snapshot_bucket.id
+
+  rule {
+    apply_server_side_encryption_by_default {
+      sse_algorithm = "AES256"
+    }
+  }
+}
+
+resource "aws_s3_bucket_lifecycle_configuration" "apple_update_notification_snapshot_bucket_lifecycle_config" {
+  bucket = aws_s3_bucket.apple_update_notification_snapshot_bucket.id
+
+  # Snapshots are kept for regression replays and audits; objects are
+  # immutable (keyed by content hash), so only old copies need expiring
+  rule {
+    id = "ArchiveSnapshots"
+
+    transition {
+      days          = 30
+      storage_class = "STANDARD_IA"
+    }
+
+    noncurrent_version_expiration {
+      noncurrent_days = 30
+    }
+
+    abort_incomplete_multipart_upload {
+      days_after_initiation = 1
+    }
+
+    status = "Enabled"
+  }
+}
+
+data "aws_iam_policy_document" "snapshot_deny_insecure_transport" {
+  statement {
+    sid    = "DenyInsecureTransport"
+    effect = "Deny"
+
+    actions = ["s3:*"]
+    resources = [
+      aws_s3_bucket.apple_update_notification_snapshot_bucket.arn,
+      "${aws_s3_bucket.apple_update_notification_snapshot_bucket.arn}/*"
+    ]
+
+    principals {
+      type        = "*"
+      identifiers = ["*"]
+    }
+
+    condition {
+      test     = "Bool"
+      variable = "aws:SecureTransport"
+      values   = ["false"]
+    }
+  }
+}
+
+resource "aws_s3_bucket_policy" "apple_update_notification_snapshot_bucket_policy" {
+  bucket = aws_s3_bucket.apple_update_notification_snapshot_bucket.id
+  policy = data.aws_iam_policy_document.snapshot_deny_insecure_transport.json
+}
+
+# Static release feed (latest.json, releases.xml) published by apple_web_scrape
+# for readers and a CDN; objects are overwritten in place on each change
+resource "aws_s3_bucket" "apple_update_notification_feed_bucket" {
+  #checkov:skip=CKV_AWS_144:Cross-region replication is not required for the release feed.
+  bucket = "apple-update-notification-feed-${var.account_id}"
+  tags = {
+    Name = "apple-update-notification-feed-${var.account_id}"
+  }
+}
+
+resource "aws_s3_bucket_public_access_block" "apple_update_notification_feed_bucket_access_block" {
+  bucket = aws_s3_bucket.apple_update_notification_feed_bucket.id
+
+  block_public_acls       = true
+  block_public_policy     = true
+  restrict_public_buckets = true
+  ignore_public_acls      = true
+}
+
+resource "aws_s3_bucket_versioning" "apple_update_notification_feed_bucket_versioning" {
+  bucket = aws_s3_bucket.apple_update_notification_feed_bucket.id
+
+  versioning_configuration {
+    status = "Enabled"
+  }
+}
+
+resource "aws_s3_bucket_server_side_encryption_configuration" "apple_update_notification_feed_bucket_sse" {
+  bucket = aws_s3_bucket.apple_update_notification_feed_bucket.id
+
+  rule {
+    apply_server_side_encryption_by_default {
+      sse_algorithm = "AES256"
+    }
+  }
+}
+
+resource "aws_s3_bucket_lifecycle_configuration" "apple_update_notification_feed_bucket_lifecycle_config" {
+  bucket = aws_s3_bucket.apple_update_notification_feed_bucket.id
+
+  # Current feed files never expire; superseded versions are kept briefly
+  # so a bad publish can be rolled back
+  rule {
+    id = "ExpireOldFeedVersions"
+
+    noncurrent_version_expiration {
+      noncurrent_days = 7
+    }
+
+    status = "Enabled"
+  }
+}
+
+data "aws_iam_policy_document" "feed_deny_insecure_transport" {
+  statement {
+    sid    = "DenyInsecureTransport"
+    effect = "Deny"
+
+    actions = ["s3:*"]
+    resources = [
+      aws_s3_bucket.apple_update_notification_feed_bucket.arn,
+      "${aws_s3_bucket.apple_update_notification_feed_bucket.arn}/*"
+    ]
+
+    principals {
+      type        = "*"
+      identifiers = ["*"]
+    }
+
+    condition {
+      test     = "Bool"
+      variable = "aws:SecureTransport"
+      values   = ["false"]
+    }
+  }
+}
+
+resource "aws_s3_bucket_policy" "apple_update_notification_feed_bucket_policy" {
+  bucket = aws_s3_bucket.apple_update_notification_feed_bucket.id
+  policy = data.aws_iam_policy_document.feed_deny_insecure_transport.json
+}
+
 output "bucket_id" {
   value = aws_s3_bucket.apple_update_notification_bucket.id
 }
@@ -91,3 +263,19 @@ output "bucket_id" {
 output "bucket_arn" {
   value = aws_s3_bucket.apple_update_notification_bucket.arn
 }
+
+output "snapshot_bucket_id" {
+  value = aws_s3_bucket.apple_update_notification_snapshot_bucket.id
+}
+
+output "snapshot_bucket_arn" {
+  value = aws_s3_bucket.apple_update_notification_snapshot_bucket.arn
+}
+
+output "feed_bucket_id" {
+  value = aws_s3_bucket.apple_update_notification_feed_bucket.id
+}
+
+output "feed_bucket_arn" {
+  value = aws_s3_bucket.apple_update_notification_feed_bucket.arn
+}
@@ -3,12 +3,32 @@ output "dynamodb_table_name" {
   value       = module.data_store.table_name
 }
 
+output "release_history_table_name" {
+  description = "DynamoDB table name for Apple OS release history"
+  value       = module.data_store.history_table_name
+}
+
 output "lambda_function_arns" {
   description = "Lambda function ARNs keyed by logical function name"
   value       = module.lambda_service.lambda_function_arns
 }
 
+output "lambda_function_urls" {
+  description = "Function URLs keyed by logical function name (IAM auth)"
+  value       = module.lambda_service.lambda_function_urls
+}
+
 output "artifact_bucket_name" {
   description = "S3 bucket used for Lambda deployment artifacts"
   value       = module.storage.bucket_id
 }
+
+output "snapshot_bucket_name" {
+  description = "S3 bucket holding archived release page snapshots"
+  value       = module.storage.snapshot_bucket_id
+}
+
+output "feed_bucket_name" {
+  description = "S3 bucket holding the static release feed (feed/latest.json, feed/releases.xml)"
+  value       = module.storage.feed_bucket_id
+}
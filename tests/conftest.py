@@ -0,0 +1,203 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+# -------------------------------------------------------------------------
+# Local HTTP server
+# -------------------------------------------------------------------------
+class LocalHTTPServer:
+    """Serves canned responses on localhost and records the requests it saw.
+
+    Set ``responder`` to a callable taking the request handler and returning a
+    ``(status, headers, body)`` tuple.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.bytes_sent = 0
+        self.connections = 0
+        self.responder = lambda handler: (200, {}, b"")
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            daemon=True,
+        )
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/en-us/100100"
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                server.connections += 1
+
+            def do_GET(self):
+                server.requests.append(dict(self.headers))
+                status, headers, body = server.responder(self)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                try:
+                    for start in range(0, len(body), 64 * 1024):
+                        chunk = body[start : start + 64 * 1024]
+                        self.wfile.write(chunk)
+                        server.bytes_sent += len(chunk)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client hung up early (streaming fetches do this)
+                    self.close_connection = True
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def local_http_server():
+    """Start a throwaway HTTP server for tests that exercise real fetches."""
+    server = LocalHTTPServer().start()
+    yield server
+    server.stop()
+
+
+# -------------------------------------------------------------------------
+# Local AWS stand-ins (moto)
+# -------------------------------------------------------------------------
+@pytest.fixture
+def aws_credentials(monkeypatch):
+    """Point boto3 at fake credentials so nothing can reach a real account."""
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_SESSION_TOKEN", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-2")
+
+
+@pytest.fixture
+def release_table(aws_credentials):
+    """Create the release table in moto, shaped like terraform/modules/data-store."""
+    import boto3
+    from moto import mock_aws
+
+    from lambdas.apple_utils import clear_release_state_cache
+
+    # Every test gets a fresh table under the same name
+    clear_release_state_cache()
+    with mock_aws():
+        dynamodb = boto3.resource("dynamodb", region_name="us-east-2")
+        table = dynamodb.create_table(
+            TableName="apple_os_updates_test",
+            KeySchema=[{"AttributeName": "device", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "device", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        yield table
+
+
+@pytest.fixture
+def history_table(aws_credentials):
+    """Create the release history table in moto, shaped like terraform/modules/data-store."""
+    import boto3
+    from moto import mock_aws
+
+    with mock_aws():
+        dynamodb = boto3.resource("dynamodb", region_name="us-east-2")
+        table = dynamodb.create_table(
+            TableName="apple_os_release_history_test",
+            KeySchema=[
+                {"AttributeName": "device", "KeyType": "HASH"},
+                {"AttributeName": "VersionKey", "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "device", "AttributeType": "S"},
+                {"AttributeName": "VersionKey", "AttributeType": "S"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        yield table
+
+
+@pytest.fixture
+def subscription_table(aws_credentials):
+    """Create the subscriber registry table in moto, shaped like terraform/modules/data-store."""
+    import boto3
+    from moto import mock_aws
+
+    with mock_aws():
+        dynamodb = boto3.resource("dynamodb", region_name="us-east-2")
+        table = dynamodb.create_table(
+            TableName="apple_os_subscriptions_test",
+            KeySchema=[{"AttributeName": "SubscriptionId", "KeyType": "HASH"}],
+            AttributeDefinitions=[
+                {"AttributeName": "SubscriptionId", "AttributeType": "S"}
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        yield table
+
+
+@pytest.fixture
+def snapshot_bucket(aws_credentials, monkeypatch):
+    """Create the page snapshot bucket in moto and reset the shared S3 client."""
+    import boto3
+    from moto import mock_aws
+
+    from lambdas import apple_utils
+
+    monkeypatch.delitem(apple_utils._aws, "s3_client", raising=False)
+    with mock_aws():
+        s3 = boto3.client("s3", region_name="us-east-2")
+        s3.create_bucket(
+            Bucket="apple-update-notification-snapshots-test",
+            CreateBucketConfiguration={"LocationConstraint": "us-east-2"},
+        )
+        yield "apple-update-notification-snapshots-test"
+
+
+@pytest.fixture
+def feed_bucket(aws_credentials, monkeypatch):
+    """Create the release feed bucket in moto and reset the shared S3 client."""
+    import boto3
+    from moto import mock_aws
+
+    from lambdas import apple_utils
+
+    monkeypatch.delitem(apple_utils._aws, "s3_client", raising=False)
+    with mock_aws():
+        s3 = boto3.client("s3", region_name="us-east-2")
+        s3.create_bucket(
+            Bucket="apple-update-notification-feed-test",
+            CreateBucketConfiguration={"LocationConstraint": "us-east-2"},
+        )
+        yield "apple-update-notification-feed-test"
+
+
+def count_api_calls(client):
+    """Return a dict counting every API call the client sends, keyed by operation."""
+    calls = {}
+
+    def record(model, **kwargs):
+        calls[model.name] = calls.get(model.name, 0) + 1
+
+    client.meta.events.register("before-call.*.*", record)
+    return calls
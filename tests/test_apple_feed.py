@@ -0,0 +1,126 @@
+import gzip
+import json
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from botocore.exceptions import ClientError
+
+from lambdas import apple_feed
+from lambdas import apple_web_scrape as aws
+from lambdas.apple_feed import FEED_JSON_KEY, FEED_RSS_KEY, publish_release_feed
+from lambdas.apple_utils import get_s3_client
+from tests.conftest import count_api_calls
+
+LATEST = {
+    "iOS": "26.0.1",
+    "macOS": "26.0.1",
+    "release_statements": {
+        "iOS": "The latest version of iOS and iPadOS is 26.0.1",
+        "macOS": "The latest version of macOS is 26.0.1",
+    },
+}
+IOS_CHANGE = {
+    "device": "iOS",
+    "release_version": "26.0.1",
+    "release_statement": "The latest version of iOS and iPadOS is 26.0.1",
+}
+
+
+def _read(bucket, key):
+    stored = get_s3_client().get_object(Bucket=bucket, Key=key)
+    return stored, gzip.decompress(stored["Body"].read())
+
+
+def test_publish_release_feed_uploads_gzipped_json_and_rss(feed_bucket):
+    now = datetime(2025, 10, 13, 8, 0, tzinfo=timezone.utc)
+
+    keys = publish_release_feed(LATEST, [IOS_CHANGE], bucket=feed_bucket, now=now)
+
+    assert keys == [FEED_JSON_KEY, FEED_RSS_KEY]
+    stored, body = _read(feed_bucket, FEED_JSON_KEY)
+    document = json.loads(body)
+    assert document["releases"]["macOS"]["version"] == "26.0.1"
+    assert document["recent_changes"] == [
+        {**IOS_CHANGE, "detected_at": "2025-10-13T08:00:00+00:00"}
+    ]
+    assert stored["ContentEncoding"] == "gzip"
+    assert stored["ContentType"] == "application/json; charset=utf-8"
+    assert stored["CacheControl"] == apple_feed.FEED_CACHE_CONTROL
+    assert stored["ETag"]
+
+    stored, body = _read(feed_bucket, FEED_RSS_KEY)
+    assert stored["ContentType"] == "application/rss+xml; charset=utf-8"
+    (item,) = ET.fromstring(body).iter("item")
+    assert item.findtext("title") == "iOS 26.0.1"
+    assert item.findtext("pubDate") == "Mon, 13 Oct 2025 08:00:00 +0000"
+
+
+def test_publish_release_feed_carries_recent_changes_forward(feed_bucket, monkeypatch):
+    monkeypatch.setattr(apple_feed, "FEED_MAX_ITEMS", 2)
+    for version in ("26.0", "26.0.1", "26.1"):
+        change = {**IOS_CHANGE, "release_version": version}
+        publish_release_feed(LATEST, [change], bucket=feed_bucket)
+
+    _, body = _read(feed_bucket, FEED_RSS_KEY)
+    titles = [item.findtext("title") for item in ET.fromstring(body).iter("item")]
+    assert titles == ["iOS 26.1", "iOS 26.0.1"]
+
+
+def test_publish_release_feed_does_nothing_without_changes(feed_bucket):
+    calls = count_api_calls(get_s3_client())
+
+    assert publish_release_feed(LATEST, [], bucket=feed_bucket) is None
+    assert calls == {}
+
+
+def test_publish_release_feed_keeps_the_feed_when_the_read_is_denied(feed_bucket):
+    publish_release_feed(LATEST, [IOS_CHANGE], bucket=feed_bucket)
+    _, published = _read(feed_bucket, FEED_JSON_KEY)
+    denied = ClientError(
+        {"Error": {"Code": "AccessDenied", "Message": "Access Denied"}}, "GetObject"
+    )
+    change = {**IOS_CHANGE, "release_version": "26.1"}
+
+    with (
+        patch.object(get_s3_client(), "get_object", side_effect=denied),
+        patch("lambdas.apple_feed.notify_error") as mock_notify,
+    ):
+        assert publish_release_feed(LATEST, [change], bucket=feed_bucket) is None
+
+    mock_notify.assert_called_once()
+    assert _read(feed_bucket, FEED_JSON_KEY)[1] == published
+
+
+@patch("lambdas.apple_feed.notify_error")
+def test_publish_release_feed_reports_failures(mock_notify, feed_bucket):
+    assert publish_release_feed(LATEST, [IOS_CHANGE], bucket="missing") is None
+
+    mock_notify.assert_called_once()
+
+
+@patch("lambdas.apple_web_scrape.get_page_states", return_value={})
+@patch("lambdas.apple_web_scrape.get_latest_releases", return_value=LATEST)
+@patch("lambdas.apple_web_scrape.publish_release_notification")
+@patch("lambdas.apple_web_scrape.create_dynamodb_resource")
+def test_scrape_publishes_feed_only_when_releases_change(
+    mock_dynamo,
+    mock_publish,
+    mock_latest,
+    mock_get_page_states,
+    release_table,
+    feed_bucket,
+    monkeypatch,
+):
+    monkeypatch.setenv("dynamodb_table_name", release_table.name)
+    monkeypatch.setenv("feed_bucket_name", feed_bucket)
+    mock_dynamo.return_value.Table.return_value = release_table
+    calls = count_api_calls(get_s3_client())
+
+    aws.lambda_handler({}, {})
+    assert calls == {"GetObject": 1, "PutObject": 2}
+
+    with patch("lambdas.apple_feed.render_feed_json") as mock_render:
+        aws.lambda_handler({}, {})
+    mock_render.assert_not_called()
+    assert calls == {"GetObject": 1, "PutObject": 2}
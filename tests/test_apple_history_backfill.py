@@ -0,0 +1,126 @@
+import gzip
+
+from lambdas.apple_history_backfill import (
+    backfill_release_history,
+    iter_history_records,
+    main,
+)
+from lambdas.apple_utils import append_release_history
+
+HISTORY_PAGE = """
+<html><body><ul class="list gb-list"><li class="gb-list_item">
+<p class="gb-paragraph">The latest version of iOS and iPadOS is 26.0.1.</p></li></ul>
+<table>
+<tr><th>Name and information link</th><th>Available for</th><th>Release date</th></tr>
+<tr><td><a href="https://support.apple.com/en-us/125108">iOS 26.0.1 and iPadOS 26.0.1</a></td>
+<td>iPhone 11 and later</td><td>29 Sep 2025</td></tr>
+<tr><td><a href="https://support.apple.com/en-us/125110">macOS Tahoe 26.0.1</a></td>
+<td>Mac Studio (2022 and later)</td><td>29 Sep 2025</td></tr>
+<tr><td><a href="https://support.apple.com/en-us/125111">macOS Big Sur 11.7.10</a></td>
+<td>macOS Big Sur</td><td>11 Sep 2023</td></tr>
+<tr><td><a href="https://support.apple.com/en-us/125109">Safari 26.0.1</a></td>
+<td>macOS Sonoma</td><td>29 Sep 2025</td></tr>
+<tr><td>iPadOS 17.7.10</td><td>iPad 6th generation</td><td>29 Sep 2025</td></tr>
+<tr><td><a href="https://support.apple.com/en-us/118723">iOS 16.5.1 (c) and iPadOS 16.5.1 (c)</a></td>
+<td>iPhone 8 and later</td><td>12 Jul 2023</td></tr>
+<tr><td>watchOS 26</td><td>Apple Watch Series 6 and later</td><td>15 Sep 2025</td></tr>
+<tr><td><a href="https://support.apple.com/en-us/125108">iOS 26.0.1 and iPadOS 26.0.1</a></td>
+<td>iPhone 11 and later</td><td>29 Sep 2025</td></tr>
+</table></body></html>
+"""
+
+
+def _chunks(text, size=37):
+    return [text[start : start + size] for start in range(0, len(text), size)]
+
+
+def test_iter_history_records_streams_tracked_devices():
+    records = list(iter_history_records(_chunks(HISTORY_PAGE)))
+
+    assert records == [
+        {
+            "device": "iOS",
+            "VersionKey": "0026.0000.0001",
+            "ReleaseVersion": "26.0.1",
+            "ReleaseDate": "2025-09-29",
+            "NotesUrl": "https://support.apple.com/en-us/125108",
+        },
+        {
+            "device": "macOS",
+            "VersionKey": "0026.0000.0001",
+            "ReleaseVersion": "26.0.1",
+            "ReleaseDate": "2025-09-29",
+            "NotesUrl": "https://support.apple.com/en-us/125110",
+        },
+        {
+            "device": "macOS",
+            "VersionKey": "0011.0007.0010",
+            "ReleaseVersion": "11.7.10",
+            "ReleaseDate": "2023-09-11",
+            "NotesUrl": "https://support.apple.com/en-us/125111",
+        },
+        {
+            "device": "iOS",
+            "VersionKey": "0016.0005.0001-c",
+            "ReleaseVersion": "16.5.1 (c)",
+            "ReleaseDate": "2023-07-12",
+            "NotesUrl": "https://support.apple.com/en-us/118723",
+        },
+        {
+            "device": "watchOS",
+            "VersionKey": "0026.0000.0000",
+            "ReleaseVersion": "26",
+            "ReleaseDate": "2025-09-15",
+        },
+    ]
+
+
+def test_backfill_release_history_is_idempotent(history_table):
+    first = backfill_release_history(history_table, _chunks(HISTORY_PAGE))
+    second = backfill_release_history(history_table, _chunks(HISTORY_PAGE))
+
+    assert first["written"] == second["written"] == 5
+    assert first["records_per_second"] > 0
+    assert history_table.scan(Select="COUNT")["Count"] == 5
+    item = history_table.get_item(
+        Key={"device": "macOS", "VersionKey": "0011.0007.0010"}
+    )["Item"]
+    assert item["ReleaseDate"] == "2023-09-11"
+
+
+def test_backfill_overwrites_the_detection_date_with_apples(history_table):
+    key = {"device": "iOS", "VersionKey": "0026.0000.0001"}
+    # The scraper dates a release by the day it noticed it
+    append_release_history(
+        history_table,
+        "iOS",
+        "26.0.1",
+        "The latest version of iOS and iPadOS is 26.0.1.",
+        "2025-09-30",
+        detected_at="2025-09-30T01:04:00+00:00",
+    )
+
+    backfill_release_history(history_table, _chunks(HISTORY_PAGE))
+    backfilled = history_table.get_item(Key=key)["Item"]
+    backfill_release_history(history_table, _chunks(HISTORY_PAGE))
+
+    item = history_table.get_item(Key=key)["Item"]
+    assert item == backfilled
+    assert item["ReleaseDate"] == "2025-09-29"
+    assert item["NotesUrl"] == "https://support.apple.com/en-us/125108"
+    assert item["DetectedAt"] == "2025-09-30T01:04:00+00:00"
+    assert item["ReleaseStatement"].startswith("The latest version of iOS")
+
+
+def test_backfill_cli_reads_saved_gzipped_page(history_table, tmp_path, capsys):
+    page = tmp_path / "100100.html.gz"
+    with gzip.open(page, "wt", encoding="utf-8") as handle:
+        handle.write(HISTORY_PAGE)
+
+    stats = main(
+        ["--page", str(page), "--table", history_table.name, "--region", "us-east-2"]
+    )
+
+    assert stats["written"] == 5
+    assert "records/s" in capsys.readouterr().out
+    assert history_table.scan(Select="COUNT")["Count"] == 5
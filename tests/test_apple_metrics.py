@@ -0,0 +1,88 @@
+import json
+import threading
+
+import pytest
+
+from lambdas import apple_metrics as metrics
+
+
+@pytest.fixture(autouse=True)
+def reset_cold_start(monkeypatch):
+    monkeypatch.setattr(metrics, "_cold_start", True)
+    monkeypatch.delenv("emit_metrics", raising=False)
+
+
+def _emf_lines(capsys):
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_invocation_metrics_emits_one_emf_document(capsys):
+    @metrics.timed_phase("Fetch")
+    def fetch():
+        metrics.add_metric("BytesDownloaded", 2048, "Bytes")
+        return "page"
+
+    with metrics.invocation_metrics("apple-development-apple_web_scrape"):
+        assert fetch() == "page"
+        with metrics.phase("DynamoDB"):
+            pass
+        with metrics.phase("DynamoDB"):
+            pass
+
+    (document,) = _emf_lines(capsys)
+    (directive,) = document["_aws"]["CloudWatchMetrics"]
+    assert directive["Namespace"] == "AppleUpdateNotification"
+    assert directive["Dimensions"] == [["FunctionName"]]
+    assert {metric["Name"]: metric["Unit"] for metric in directive["Metrics"]} == {
+        "ColdStart": "Count",
+        "FetchTime": "Milliseconds",
+        "BytesDownloaded": "Bytes",
+        "DynamoDBTime": "Milliseconds",
+        "InvocationTime": "Milliseconds",
+    }
+    assert document["FunctionName"] == "apple-development-apple_web_scrape"
+    assert document["BytesDownloaded"] == 2048
+    assert document["ColdStart"] == 1
+    assert document["FetchTime"] <= document["InvocationTime"]
+    assert isinstance(document["_aws"]["Timestamp"], int)
+
+
+def test_cold_start_flag_is_only_set_on_first_invocation(capsys):
+    for _ in range(2):
+        with metrics.invocation_metrics("fn"):
+            pass
+
+    first, second = _emf_lines(capsys)
+    assert first["ColdStart"] == 1
+    assert second["ColdStart"] == 0
+
+
+def test_metrics_from_worker_threads_are_summed(capsys):
+    def download():
+        metrics.add_metric("BytesDownloaded", 100, "Bytes")
+
+    with metrics.invocation_metrics("fn"):
+        workers = [threading.Thread(target=download) for _ in range(8)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    (document,) = _emf_lines(capsys)
+    assert document["BytesDownloaded"] == 800
+
+
+def test_disabled_metrics_emit_nothing(capsys, monkeypatch):
+    monkeypatch.setenv("emit_metrics", "false")
+
+    @metrics.timed_phase("Parse")
+    def parse():
+        metrics.add_metric("BytesDownloaded", 1, "Bytes")
+        return 42
+
+    with metrics.invocation_metrics("fn") as recorder:
+        assert recorder is None
+        assert parse() == 42
+
+    assert capsys.readouterr().out == ""
+    assert metrics._recorder is None
@@ -0,0 +1,142 @@
+import json
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from lambdas import apple_release_api as api
+from tests.conftest import count_api_calls
+
+LAMBDA_DIR = os.path.join(os.path.dirname(__file__), "..", "lambdas")
+
+
+@pytest.fixture(autouse=True)
+def releases(release_table, monkeypatch):
+    """Stored releases for three devices plus a page state item."""
+    monkeypatch.setenv("dynamodb_table_name", release_table.name)
+    api._current_releases.clear()
+    for device, version in {"iOS": "26.0.1", "macOS": "26.0.1", "tvOS": "26.0"}.items():
+        release_table.put_item(Item={"device": device, "ReleaseVersion": version})
+    release_table.put_item(Item={"device": "page#https://a.example/", "ETag": '"v1"'})
+    with patch("lambdas.apple_release_api.create_dynamodb_resource") as mock_dynamo:
+        mock_dynamo.return_value.Table.return_value = release_table
+        yield release_table
+    api._current_releases.clear()
+
+
+def _url_event(query=None, headers=None, method="GET"):
+    """Lambda Function URL (payload 2.0) request."""
+    return {
+        "version": "2.0",
+        "rawPath": "/",
+        "headers": headers or {},
+        "queryStringParameters": query,
+        "requestContext": {"http": {"method": method, "path": "/"}},
+    }
+
+
+def test_returns_release_map_with_etag_and_304(releases):
+    calls = count_api_calls(releases.meta.client)
+
+    response = api.lambda_handler(_url_event(), None)
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == {
+        "iOS": "26.0.1",
+        "macOS": "26.0.1",
+        "tvOS": "26.0",
+    }
+    etag = response["headers"]["ETag"]
+
+    revalidated = api.lambda_handler(_url_event(headers={"if-none-match": etag}), None)
+    assert revalidated["statusCode"] == 304
+    assert revalidated["body"] == "" and revalidated["headers"]["ETag"] == etag
+
+    # Served from the in-process cache after the first BatchGetItem
+    assert calls == {"BatchGetItem": 1}
+
+
+def test_device_filter(releases):
+    response = api.lambda_handler(_url_event({"device": "ios,tvOS"}), None)
+    everything = api.lambda_handler(_url_event(), None)
+
+    assert json.loads(response["body"]) == {"iOS": "26.0.1", "tvOS": "26.0"}
+    assert response["headers"]["ETag"] != everything["headers"]["ETag"]
+
+    unknown = api.lambda_handler(_url_event({"device": "iOS,webOS"}), None)
+    assert unknown["statusCode"] == 400
+    assert "webOS" in json.loads(unknown["body"])["error"]
+
+
+def test_cache_refreshes_after_ttl(releases, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(api.time, "monotonic", lambda: clock[0])
+    etag = api.lambda_handler(_url_event(), None)["headers"]["ETag"]
+    releases.put_item(Item={"device": "iOS", "ReleaseVersion": "26.1"})
+    calls = count_api_calls(releases.meta.client)
+
+    assert api.lambda_handler(_url_event(), None)["headers"]["ETag"] == etag
+
+    clock[0] += api.DEFAULT_RELEASE_API_CACHE_TTL_SECONDS
+    response = api.lambda_handler(_url_event(headers={"if-none-match": etag}), None)
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["iOS"] == "26.1"
+    assert calls == {"BatchGetItem": 1}
+
+
+def test_api_gateway_proxy_event(releases):
+    event = {
+        "httpMethod": "GET",
+        "headers": {"If-None-Match": 'W/"stale", W/"other"'},
+        "multiValueQueryStringParameters": {"device": ["macOS", "iOS"]},
+        "queryStringParameters": {"device": "iOS"},
+    }
+
+    response = api.lambda_handler(event, None)
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == {"iOS": "26.0.1", "macOS": "26.0.1"}
+
+    event["headers"]["If-None-Match"] = f"W/{response['headers']['ETag']}"
+    assert api.lambda_handler(event, None)["statusCode"] == 304
+
+    assert api.lambda_handler({**event, "httpMethod": "POST"}, None)["statusCode"] == (
+        405
+    )
+
+
+@patch("lambdas.apple_release_api.notify_error")
+@patch("lambdas.apple_release_api.get_device_items")
+def test_serves_previous_map_when_refresh_fails(
+    mock_get_device_items, mock_notify, releases, monkeypatch
+):
+    mock_get_device_items.side_effect = api.DynamoDBItemNotFound("throttled")
+    assert api.lambda_handler(_url_event(), None)["statusCode"] == 503
+    mock_notify.assert_called_once()
+
+    mock_get_device_items.side_effect = None
+    mock_get_device_items.return_value = {"iOS": {"ReleaseVersion": "26.0.1"}}
+    monkeypatch.setenv("release_api_cache_ttl_seconds", "0")
+    assert api.lambda_handler(_url_event(), None)["statusCode"] == 200
+
+    mock_get_device_items.side_effect = api.DynamoDBItemNotFound("throttled")
+    response = api.lambda_handler(_url_event(), None)
+    assert json.loads(response["body"]) == {"iOS": "26.0.1"}
+
+
+def test_import_does_not_load_the_scraper():
+    # Flat imports, as in the Lambda runtime
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, apple_release_api;"
+            "print(sorted(m for m in ('apple_web_scrape', 'urllib3') if m in sys.modules))",
+        ],
+        cwd=LAMBDA_DIR,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.stdout.strip() == "[]"
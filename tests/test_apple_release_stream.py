@@ -0,0 +1,106 @@
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from lambdas import apple_release_stream as stream
+
+EVENTS_DIR = Path(__file__).parent / "events"
+
+
+@pytest.fixture
+def stream_event():
+    """Recorded stream batch: two iOS writes, macOS, visionOS, a page state item and a delete."""
+    return json.loads((EVENTS_DIR / "dynamodb_stream_release_batch.json").read_text())
+
+
+@patch("lambdas.apple_web_scrape.publish_release_notification")
+def test_lambda_handler_coalesces_batch_into_one_notification(
+    mock_publish, stream_event
+):
+    response = stream.lambda_handler(stream_event, None)
+
+    assert response == {"batchItemFailures": []}
+    mock_publish.assert_called_once()
+    subject, message = mock_publish.call_args.args
+    assert "3 change(s) detected" in subject
+    # The second iOS write in the batch wins
+    assert "Version: 26.0.1" in message
+    assert "Version: 26.0\n" not in message
+    assert "page#" not in message
+    assert "tvOS" not in message
+
+
+@patch("lambdas.apple_web_scrape.publish_release_notification")
+def test_lambda_handler_ignores_batches_without_release_changes(
+    mock_publish, stream_event
+):
+    records = [
+        record
+        for record in stream_event["Records"]
+        if record["eventName"] == "REMOVE"
+        or record["dynamodb"]["Keys"]["device"]["S"].startswith("page#")
+    ]
+
+    response = stream.lambda_handler({"Records": records}, None)
+
+    assert response == {"batchItemFailures": []}
+    mock_publish.assert_not_called()
+
+
+@patch("lambdas.apple_release_stream.notify_error")
+@patch("lambdas.apple_web_scrape.publish_release_notification")
+def test_lambda_handler_reports_batch_item_failures_when_publish_fails(
+    mock_publish, mock_notify, stream_event
+):
+    mock_publish.side_effect = RuntimeError("SNS unavailable")
+
+    response = stream.lambda_handler(stream_event, None)
+
+    assert response == {
+        "batchItemFailures": [
+            {"itemIdentifier": "4100000000000000000001"},
+            {"itemIdentifier": "4100000000000000000002"},
+            {"itemIdentifier": "4100000000000000000004"},
+            {"itemIdentifier": "4100000000000000000005"},
+        ]
+    }
+    mock_notify.assert_called_once()
+
+
+@patch("lambdas.apple_release_stream.notify_error")
+@patch("lambdas.apple_web_scrape.publish_release_notification")
+def test_lambda_handler_skips_malformed_records(
+    mock_publish, mock_notify, stream_event
+):
+    stream_event["Records"][1]["dynamodb"]["NewImage"]["ReleaseVersion"] = {
+        "X": "26.0.1"
+    }
+
+    response = stream.lambda_handler(stream_event, None)
+
+    assert response == {"batchItemFailures": []}
+    mock_notify.assert_called_once()
+    subject, message = mock_publish.call_args.args
+    assert "2 change(s) detected" in subject
+    assert "macOS" not in message
+
+
+@patch("lambdas.apple_web_scrape.publish_device_notifications")
+@patch("lambdas.apple_web_scrape.publish_release_notification")
+def test_lambda_handler_publishes_per_device_when_configured(
+    mock_publish, mock_publish_devices, stream_event, monkeypatch
+):
+    monkeypatch.setenv("release_notification_format", "per_device")
+
+    response = stream.lambda_handler(stream_event, None)
+
+    assert response == {"batchItemFailures": []}
+    mock_publish.assert_not_called()
+    (changed_releases,) = mock_publish_devices.call_args.args
+    assert [release["device"] for release in changed_releases] == [
+        "iOS",
+        "macOS",
+        "visionOS",
+    ]
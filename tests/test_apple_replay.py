@@ -0,0 +1,92 @@
+import gzip
+import json
+import os
+
+from lambdas.apple_replay import list_snapshots, main, replay_snapshots
+
+STATEMENTS = {
+    "iOS": "The latest version of iOS and iPadOS is {}.",
+    "macOS": "The latest version of macOS is {}.",
+    "watchOS": "The latest version of watchOS is {}.",
+    "tvOS": "The latest version of tvOS is {}.",
+    "visionOS": "The latest version of visionOS is {}.",
+}
+
+
+def _page(versions):
+    items = "".join(
+        f'<li class="gb-list_item"><p class="gb-paragraph">'
+        f"{STATEMENTS[device].format(version)}</p></li>"
+        for device, version in versions.items()
+    )
+    return f'<html><body><ul class="list gb-list">{items}</ul></body></html>'
+
+
+def _write(directory, name, versions):
+    path = os.path.join(directory, name)
+    if name.endswith(".gz"):
+        with gzip.open(path, "wt", encoding="utf-8") as snapshot:
+            snapshot.write(_page(versions))
+    else:
+        with open(path, "w", encoding="utf-8") as snapshot:
+            snapshot.write(_page(versions))
+    return path
+
+
+def _snapshots(tmp_path):
+    full = {device: "26.0" for device in STATEMENTS}
+    _write(tmp_path, "2025-09-15.html", full)
+    _write(tmp_path, "2025-09-29.html.gz", {**full, "iOS": "26.0.1"})
+    # A markup change that loses visionOS
+    regressed = {**full, "iOS": "26.0.1"}
+    del regressed["visionOS"]
+    _write(tmp_path, "2025-10-13.html.gz", regressed)
+    (tmp_path / "notes.txt").write_text("not a snapshot")
+    return list_snapshots(str(tmp_path))
+
+
+def test_list_snapshots_orders_by_name(tmp_path):
+    paths = _snapshots(tmp_path)
+
+    assert [os.path.basename(path) for path in paths] == [
+        "2025-09-15.html",
+        "2025-09-29.html.gz",
+        "2025-10-13.html.gz",
+    ]
+
+
+def test_replay_reports_coverage_and_deltas_across_processes(tmp_path):
+    replay = replay_snapshots(_snapshots(tmp_path), workers=2)
+
+    first, second, third = replay["results"]
+    assert first["versions"]["iOS"] == "26.0" and first["missing"] == []
+    assert second["versions"]["iOS"] == "26.0.1"
+    assert third["missing"] == ["visionOS"]
+    assert [
+        (delta["device"], delta["previous"], delta["current"])
+        for delta in replay["deltas"]
+    ] == [("iOS", "26.0", "26.0.1"), ("visionOS", "26.0", None)]
+    assert replay["stats"]["snapshots"] == 3
+    assert replay["stats"]["incomplete"] == 1
+    assert replay["stats"]["snapshots_per_second"] > 0
+
+
+def test_replay_records_unreadable_snapshots(tmp_path):
+    path = tmp_path / "broken.html.gz"
+    path.write_bytes(b"not gzip")
+
+    (result,) = replay_snapshots([str(path)])["results"]
+
+    assert result["error"]
+    assert result["missing"] == list(STATEMENTS)
+
+
+def test_main_fails_on_missing_devices(tmp_path, capsys):
+    _snapshots(tmp_path)
+
+    assert main(["--snapshots", str(tmp_path), "--workers", "1"]) == 0
+    assert "missing: visionOS" in capsys.readouterr().out
+
+    assert main(["--snapshots", str(tmp_path), "--fail-on-missing", "--json"]) == 1
+    report = json.loads(capsys.readouterr().out)
+    assert report["stats"]["incomplete"] == 1
@@ -0,0 +1,122 @@
+import json
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from lambdas import apple_scheduler as scheduler
+from lambdas.apple_utils import append_release_history, release_history_sort_key
+
+PACIFIC = ZoneInfo("America/Los_Angeles")
+WINDOW = scheduler.DEFAULT_RELEASE_WINDOW
+
+
+def _pacific(*args):
+    return datetime(*args, tzinfo=PACIFIC)
+
+
+def test_poll_decision_polls_often_inside_the_window():
+    # Tuesday 2025-10-14, 10:07 PDT
+    assert scheduler.poll_decision(_pacific(2025, 10, 14, 10, 7), WINDOW) == {
+        "hot": True,
+        "delay_seconds": 300,
+    }
+
+
+def test_poll_decision_backs_off_but_wakes_for_the_window():
+    # 08:30 on a weekday: back off, but not past 09:00
+    assert scheduler.poll_decision(_pacific(2025, 10, 14, 8, 30), WINDOW) == {
+        "hot": False,
+        "delay_seconds": 1800,
+    }
+    # Saturday noon and Friday afternoon: plain back-off
+    for now in (_pacific(2025, 10, 18, 12, 0), _pacific(2025, 10, 17, 13, 30)):
+        assert scheduler.poll_decision(now, WINDOW)["delay_seconds"] == 3600
+    # UTC clocks work too: 16:59 UTC is 09:59 PDT
+    utc = datetime(2025, 10, 14, 16, 59, tzinfo=timezone.utc)
+    assert scheduler.poll_decision(utc, WINDOW)["hot"] is True
+
+
+def test_learn_release_window_from_history():
+    tuesday = date(2025, 1, 7)
+    items = [
+        {
+            "ReleaseDate": (tuesday + timedelta(weeks=week)).isoformat(),
+            # 17:xx UTC in July is 10:xx PDT
+            "DetectedAt": f"2025-07-{1 + week % 28:02d}T17:{week % 60:02d}:00+00:00",
+        }
+        for week in range(30)
+    ]
+
+    window = scheduler.learn_release_window(items)
+
+    assert window["weekdays"] == [1]
+    assert window["hours"] == [9, 10]
+    assert window["source"]["hours"] == "history (30 detections)"
+
+    # Too little history: the default window
+    fallback = scheduler.learn_release_window(items[:5])
+    assert fallback["weekdays"] == WINDOW["weekdays"]
+    assert fallback["hours"] == WINDOW["hours"]
+
+
+def test_run_poller_uses_injected_clock_and_sleep():
+    clock = [_pacific(2025, 10, 14, 8, 30)]
+    sleeps = []
+    polls = []
+
+    def poll():
+        polls.append(clock[0])
+        if len(polls) == 2:
+            raise RuntimeError("scrape failed")
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        clock[0] += timedelta(seconds=seconds)
+
+    count = scheduler.run_poller(
+        poll, WINDOW, clock=lambda: clock[0], sleep=sleep, max_polls=4
+    )
+
+    assert count == 4
+    assert sleeps == [1800, 300, 300]
+    assert polls[-1] == _pacific(2025, 10, 14, 9, 10)
+
+
+def test_schedule_expressions_cover_standard_and_daylight_time():
+    assert scheduler.schedule_expressions(WINDOW) == {
+        "hot": ["cron(0/5 16-20 ? * MON,TUE,WED,THU,FRI *)"],
+        "background": "rate(1 hour)",
+    }
+
+    # A late-evening window crosses midnight UTC onto the next weekday
+    late = {**WINDOW, "weekdays": [4], "hours": [17]}
+    assert scheduler.schedule_expressions(late, 10, 120) == {
+        "hot": ["cron(0/10 0-1 ? * SAT *)"],
+        "background": "rate(2 hours)",
+    }
+
+
+def test_main_prints_schedule_learned_from_history_table(history_table, capsys):
+    for week in range(25):
+        released = date(2025, 1, 8) + timedelta(weeks=week)  # Wednesdays
+        append_release_history(
+            history_table,
+            "iOS",
+            f"18.{week}",
+            "release notice",
+            released.isoformat(),
+            detected_at=f"{released.isoformat()}T18:20:00+00:00",
+        )
+    item = history_table.get_item(
+        Key={"device": "iOS", "VersionKey": release_history_sort_key("18.0")}
+    )["Item"]
+    assert item["DetectedAt"] == "2025-01-08T18:20:00+00:00"
+
+    assert (
+        scheduler.main(["--history-table", history_table.name, "--print-schedule"]) == 0
+    )
+
+    # 18:20 UTC is 10:20 PST before the March DST change and 11:20 PDT after
+    report = json.loads(capsys.readouterr().out)
+    assert report["window"]["weekdays"] == [2]
+    assert report["window"]["hours"] == [9, 10, 11]
+    assert report["schedules"]["hot"] == ["cron(0/5 16-19 ? * WED *)"]
@@ -0,0 +1,127 @@
+import gzip
+import hashlib
+import os
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from lambdas import apple_snapshot
+from lambdas import apple_web_scrape as aws
+from lambdas.apple_snapshot import archive_page_snapshot, snapshot_key
+from lambdas.apple_utils import get_s3_client
+from tests.conftest import count_api_calls
+
+CAPTURED_AT = datetime(2025, 10, 13, 8, 0, tzinfo=timezone.utc)
+PAGE = (
+    '<html><body><ul class="list gb-list"><li class="gb-list_item">'
+    '<p class="gb-paragraph">The latest version of iOS and iPadOS is 26.0.1.</p>'
+    "</li></ul></body></html>"
+)
+
+
+def test_archive_page_snapshot_keys_by_capture_time_and_content(snapshot_bucket):
+    key = archive_page_snapshot(
+        "https://support.apple.com/en-us/100100",
+        PAGE,
+        "abc",
+        bucket=snapshot_bucket,
+        now=CAPTURED_AT,
+    )
+
+    assert key == snapshot_key(PAGE.encode(), CAPTURED_AT)
+    assert key.startswith("snapshots/20251013T080000Z-") and key.endswith(".html.gz")
+    stored = get_s3_client().get_object(Bucket=snapshot_bucket, Key=key)
+    assert gzip.decompress(stored["Body"].read()).decode() == PAGE
+    assert stored["ContentEncoding"] == "gzip"
+    assert stored["Metadata"]["source-url"] == "https://support.apple.com/en-us/100100"
+    assert stored["Metadata"]["release-fingerprint"] == "abc"
+    assert stored["Metadata"]["captured-at"] == "2025-10-13T08:00:00+00:00"
+
+
+def test_archive_page_snapshot_skips_pages_archived_the_same_day(snapshot_bucket):
+    first = archive_page_snapshot(
+        "https://a.example/", PAGE, bucket=snapshot_bucket, now=CAPTURED_AT
+    )
+    calls = count_api_calls(get_s3_client())
+
+    key = archive_page_snapshot(
+        "https://b.example/",
+        PAGE,
+        bucket=snapshot_bucket,
+        now=CAPTURED_AT + timedelta(hours=3),
+    )
+
+    assert key == first
+    assert calls == {"ListObjectsV2": 1}
+
+
+def test_archive_page_snapshot_keys_sort_in_capture_order(snapshot_bucket):
+    # Content hashes would sort these pages the other way round
+    pages = sorted(
+        [PAGE, PAGE.replace("26.0.1", "26.1")],
+        key=lambda page: hashlib.sha256(page.encode()).hexdigest(),
+        reverse=True,
+    )
+    keys = [
+        archive_page_snapshot(
+            "https://a.example/",
+            page,
+            bucket=snapshot_bucket,
+            now=CAPTURED_AT + timedelta(days=day),
+        )
+        for day, page in enumerate(pages)
+    ]
+
+    listed = get_s3_client().list_objects_v2(Bucket=snapshot_bucket)["Contents"]
+    assert [item["Key"] for item in listed] == keys
+
+
+def test_archive_page_snapshot_uses_multipart_for_large_pages(
+    snapshot_bucket, monkeypatch
+):
+    monkeypatch.setattr(apple_snapshot, "SNAPSHOT_MULTIPART_THRESHOLD_BYTES", 5 << 20)
+    monkeypatch.setattr(apple_snapshot, "SNAPSHOT_MULTIPART_CHUNK_BYTES", 5 << 20)
+    # Random hex keeps the gzipped body above one 5 MiB part
+    page = os.urandom(6 << 20).hex()
+    calls = count_api_calls(get_s3_client())
+
+    key = archive_page_snapshot("https://a.example/", page, bucket=snapshot_bucket)
+
+    assert calls["CreateMultipartUpload"] == 1
+    assert calls["UploadPart"] >= 2
+    stored = get_s3_client().get_object(Bucket=snapshot_bucket, Key=key)
+    assert gzip.decompress(stored["Body"].read()).decode() == page
+
+
+@patch("lambdas.apple_snapshot.notify_error")
+def test_archive_page_snapshot_reports_failures(mock_notify, snapshot_bucket):
+    assert archive_page_snapshot("https://a.example/", PAGE, bucket="missing") is None
+
+    mock_notify.assert_called_once()
+
+
+def test_archive_is_off_without_bucket(monkeypatch):
+    monkeypatch.delenv("snapshot_bucket_name", raising=False)
+
+    with patch("lambdas.apple_snapshot.get_s3_client") as mock_client:
+        assert archive_page_snapshot("https://a.example/", PAGE) is None
+
+    mock_client.assert_not_called()
+
+
+def test_scrape_archives_changed_pages_only(
+    snapshot_bucket, local_http_server, monkeypatch
+):
+    monkeypatch.setenv("snapshot_bucket_name", snapshot_bucket)
+    local_http_server.responder = lambda handler: (200, {}, PAGE.encode())
+    calls = count_api_calls(get_s3_client())
+    page_state = {}
+
+    aws.get_page_releases(local_http_server.url, page_state=page_state)
+    assert calls == {"ListObjectsV2": 1, "PutObject": 1}
+
+    # Same release region: the fingerprint hit returns before any S3 call
+    assert (
+        aws.get_page_releases(local_http_server.url, page_state=page_state)
+        is aws.PAGE_NOT_MODIFIED
+    )
+    assert calls == {"ListObjectsV2": 1, "PutObject": 1}
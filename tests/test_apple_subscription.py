@@ -0,0 +1,217 @@
+import random
+from unittest.mock import patch
+
+import pytest
+from botocore.exceptions import EndpointConnectionError
+
+from lambdas import apple_subscription as subs
+from tests.conftest import count_api_calls
+
+DEVICES = ["iOS", "macOS", "watchOS", "tvOS", "visionOS"]
+CHANNEL = "arn:aws:sns:us-east-2:123456789012:apple-subscribers-{}"
+
+
+@pytest.fixture(autouse=True)
+def clear_index_cache():
+    subs._subscription_indexes.clear()
+    yield
+    subs._subscription_indexes.clear()
+
+
+def _subscription(sid, device, channel, low=None, high=None, major_only=False):
+    item = {"SubscriptionId": sid, "Device": device, "Channel": channel}
+    if low:
+        item["MinVersion"] = low
+    if high:
+        item["MaxVersion"] = high
+    if major_only:
+        item["MajorOnly"] = True
+    return item
+
+
+def _linear_match(subscriptions, device, version):
+    """Reference matcher: checks every rule."""
+    key = subs.release_history_sort_key(version)
+    matches = []
+    for subscription in subscriptions:
+        rule = subs.subscription_rule(subscription)
+        if rule is None or subscription["Device"] != device:
+            continue
+        low, high, _ = rule
+        if subscription.get("MajorOnly") and not subs.is_major_release(version):
+            continue
+        if (low is None or low <= key) and (high is None or key < high):
+            matches.append(subscription["SubscriptionId"])
+    return sorted(matches)
+
+
+def test_index_matches_version_ranges_and_major_only():
+    index = subs.SubscriptionIndex(
+        [
+            _subscription("ios-18-up", "iOS", CHANNEL.format("mobile"), low="18"),
+            _subscription(
+                "ios-17", "iOS", CHANNEL.format("legacy"), low="17", high="18"
+            ),
+            _subscription(
+                "macos-major", "macOS", CHANNEL.format("desktop"), major_only=True
+            ),
+            _subscription("broken", "iOS", CHANNEL.format("x"), low="latest"),
+        ]
+    )
+
+    def ids(device, version):
+        return sorted(s["SubscriptionId"] for s in index.match(device, version))
+
+    assert index.size == 3
+    assert ids("iOS", "18.0") == ["ios-18-up"]
+    assert ids("iOS", "17.7.10") == ["ios-17"]
+    assert ids("iOS", "16.7.12") == []
+    assert ids("macOS", "26.0") == ["macos-major"]
+    assert ids("macOS", "26.0.1") == []
+    assert ids("tvOS", "26.0") == []
+
+
+def test_index_agrees_with_linear_scan():
+    rng = random.Random(13)
+    subscriptions = []
+    for number in range(2000):
+        low = rng.choice([None, f"{rng.randint(12, 26)}", f"{rng.randint(12, 26)}.2"])
+        high = rng.choice([None, None, f"{rng.randint(14, 27)}"])
+        subscriptions.append(
+            _subscription(
+                f"sub-{number}",
+                rng.choice(DEVICES),
+                CHANNEL.format(number % 50),
+                low=low,
+                high=high,
+                major_only=rng.random() < 0.2,
+            )
+        )
+    index = subs.SubscriptionIndex(subscriptions)
+
+    for device in DEVICES:
+        for version in ["12.0", "16.7.12", "18", "18.2", "18.2.1", "26.0", "27.1"]:
+            matched = sorted(s["SubscriptionId"] for s in index.match(device, version))
+            assert matched == _linear_match(subscriptions, device, version)
+
+
+def test_index_stores_each_rule_on_few_nodes_with_many_boundaries():
+    rng = random.Random(7)
+    subscriptions = [
+        _subscription(
+            f"sub-{number}",
+            "iOS",
+            CHANNEL.format(number % 50),
+            low=f"{rng.randint(12, 26)}.{rng.randint(0, 9)}.{rng.randint(0, 99)}",
+            high=rng.choice([None, None, f"{rng.randint(20, 27)}"]),
+        )
+        for number in range(3000)
+    ]
+    index = subs.SubscriptionIndex(subscriptions)
+    all_index, _ = index._indexes["iOS"]
+
+    assert len(all_index.boundaries) > 1000
+    stored = sum(len(rules) for rules in all_index._nodes.values())
+    assert stored <= 2 * len(subscriptions) * all_index._leaves.bit_length()
+    for version in ["12.0", "17.4.12", "18.9.99", "20.0.1", "26.9.50", "27.1"]:
+        matched = sorted(s["SubscriptionId"] for s in index.match("iOS", version))
+        assert matched == _linear_match(subscriptions, "iOS", version)
+
+
+def test_deliveries_group_releases_per_channel():
+    index = subs.SubscriptionIndex(
+        [
+            _subscription("a", "iOS", CHANNEL.format("mobile")),
+            _subscription("b", "iOS", CHANNEL.format("mobile"), low="26"),
+            _subscription("c", "macOS", CHANNEL.format("mobile")),
+            _subscription("d", "macOS", CHANNEL.format("desktop"), major_only=True),
+        ]
+    )
+    ios = {"device": "iOS", "release_version": "26.0.1", "release_statement": "i"}
+    macos = {"device": "macOS", "release_version": "26.0", "release_statement": "m"}
+
+    assert index.deliveries([ios, macos]) == {
+        CHANNEL.format("mobile"): [ios, macos],
+        CHANNEL.format("desktop"): [macos],
+    }
+
+
+def test_subscription_index_is_loaded_once_per_container(subscription_table):
+    with subscription_table.batch_writer() as batch:
+        for n in range(60):
+            batch.put_item(
+                Item=_subscription(f"sub-{n}", "iOS", CHANNEL.format(n % 3), low="18")
+            )
+    calls = count_api_calls(subscription_table.meta.client)
+
+    first = subs.get_subscription_index(subscription_table)
+    second = subs.get_subscription_index(subscription_table)
+
+    assert first is second
+    assert first.size == 60
+    assert calls == {"Scan": 1}
+
+
+@patch("lambdas.apple_subscription.notify_error")
+def test_deliveries_report_unparseable_versions(mock_notify):
+    index = subs.SubscriptionIndex(
+        [_subscription("a", "iOS", CHANNEL.format("mobile"), low="26")]
+    )
+    broken = {"device": "iOS", "release_version": "26 beta", "release_statement": "b"}
+    ios = {"device": "iOS", "release_version": "26.0.1", "release_statement": "i"}
+
+    assert index.deliveries([broken, ios]) == {CHANNEL.format("mobile"): [ios]}
+    mock_notify.assert_called_once()
+    assert mock_notify.call_args.kwargs["details"]["release_version"] == "26 beta"
+
+
+@patch("lambdas.apple_subscription.notify_error")
+@patch("lambdas.apple_utils.get_sns_client")
+def test_notify_subscribers_batches_per_channel(
+    mock_get_sns_client, mock_notify, subscription_table
+):
+    mock_sns = mock_get_sns_client.return_value
+    subscription_table.put_item(
+        Item=_subscription("mobile", "iOS", CHANNEL.format("mobile"))
+    )
+    subscription_table.put_item(
+        Item=_subscription("desktop", "macOS", CHANNEL.format("desktop"))
+    )
+    mock_sns.publish_batch.side_effect = lambda TopicArn, PublishBatchRequestEntries: {
+        "Failed": (
+            [{"Id": "release-0", "Code": "InternalError"}]
+            if TopicArn == CHANNEL.format("desktop")
+            else []
+        )
+    }
+    releases = [
+        {"device": device, "release_version": "26.0.1", "release_statement": "s"}
+        for device in DEVICES
+    ]
+
+    outcome = subs.notify_subscribers(subscription_table, releases)
+
+    assert outcome == {CHANNEL.format("mobile"): True, CHANNEL.format("desktop"): False}
+    entries = {
+        call.kwargs["TopicArn"]: call.kwargs["PublishBatchRequestEntries"]
+        for call in mock_sns.publish_batch.call_args_list
+    }
+    assert [
+        entry["MessageAttributes"]["device"]["StringValue"]
+        for entry in entries[CHANNEL.format("mobile")]
+    ] == ["iOS"]
+    mock_notify.assert_called_once()
+
+
+@patch("lambdas.apple_subscription.notify_error")
+@patch(
+    "lambdas.apple_subscription.load_subscriptions",
+    side_effect=EndpointConnectionError(endpoint_url="https://dynamodb.example"),
+)
+def test_notify_subscribers_reports_unreachable_registry(
+    mock_load, mock_notify, subscription_table
+):
+    releases = [{"device": "iOS", "release_version": "26.0.1"}]
+
+    assert subs.notify_subscribers(subscription_table, releases) == {}
+    mock_notify.assert_called_once()
@@ -0,0 +1,123 @@
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from lambdas import apple_tracing as tracing
+from lambdas import apple_web_scrape as aws
+from lambdas.apple_utils import get_device_items
+
+RELEASE_PAGE = (
+    b'<ul class="gb-list"><li class="gb-list_item"><p class="gb-paragraph">'
+    b"The latest version of iOS and iPadOS is 26.0.1.</p></li></ul>"
+)
+
+
+@pytest.fixture
+def trace_file(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    previous = tracing.set_exporter(tracing.JsonFileExporter(str(path)))
+    yield path
+    tracing.set_exporter(previous)
+
+
+def _spans(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_tracing_is_a_noop_by_default(tmp_path):
+    assert tracing._exporter is None
+
+    @tracing.traced("work")
+    def work():
+        tracing.current_span().set_attribute("ignored", True)
+        return 42
+
+    with tracing.start_span("root") as span:
+        assert span is tracing.NOOP_SPAN
+        assert work() == 42
+    assert tracing.current_span() is tracing.NOOP_SPAN
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_nested_spans_are_exported_with_parent_ids(trace_file):
+    @tracing.traced("child", {"db.system": "dynamodb"})
+    def child():
+        tracing.current_span().set_attribute("device", "iOS")
+
+    with tracing.start_span("root", {"faas.name": "fn"}):
+        child()
+
+    child_span, root_span = _spans(trace_file)
+    assert root_span["name"] == "root"
+    assert root_span["parent_span_id"] is None
+    assert root_span["attributes"] == {"faas.name": "fn"}
+    assert child_span["trace_id"] == root_span["trace_id"]
+    assert child_span["parent_span_id"] == root_span["span_id"]
+    assert child_span["attributes"] == {"db.system": "dynamodb", "device": "iOS"}
+    assert child_span["status"] == {"code": "OK"}
+    assert child_span["duration_ms"] <= root_span["duration_ms"]
+
+
+def test_exception_marks_span_as_error(trace_file):
+    @tracing.traced("failing")
+    def failing():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        failing()
+
+    (span,) = _spans(trace_file)
+    assert span["status"] == {"code": "ERROR", "description": "ValueError: boom"}
+
+
+def test_propagate_parents_spans_started_on_worker_threads(trace_file):
+    def work():
+        with tracing.start_span("worker"):
+            pass
+
+    with tracing.start_span("root"):
+        workers = [threading.Thread(target=tracing.propagate(work)) for _ in range(3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    *worker_spans, root_span = _spans(trace_file)
+    assert len(worker_spans) == 3
+    assert {span["parent_span_id"] for span in worker_spans} == {root_span["span_id"]}
+
+
+@patch("urllib3.util.retry.time.sleep")
+def test_fetch_span_records_status_and_retries(
+    mock_sleep, trace_file, local_http_server
+):
+    statuses = iter([503, 200])
+    local_http_server.responder = lambda handler: (
+        next(statuses),
+        {},
+        RELEASE_PAGE,
+    )
+
+    aws.get_latest_releases(urls=[local_http_server.url])
+
+    fetch_span, releases_span = _spans(trace_file)
+    assert releases_span["name"] == "get_latest_releases"
+    assert releases_span["attributes"]["result"] == "changed"
+    assert fetch_span["name"] == "fetch_apple_release_page"
+    assert fetch_span["parent_span_id"] == releases_span["span_id"]
+    assert fetch_span["attributes"]["http.url"] == local_http_server.url
+    assert fetch_span["attributes"]["http.status_code"] == 200
+    assert fetch_span["attributes"]["http.retry_count"] == 1
+
+
+def test_dynamodb_span_records_key_count(trace_file, release_table):
+    release_table.put_item(Item={"device": "iOS", "ReleaseVersion": "26.0.1"})
+
+    get_device_items(release_table, ["iOS", "macOS"])
+
+    (span,) = _spans(trace_file)
+    assert span["name"] == "dynamodb.BatchGetItem"
+    assert span["attributes"]["db.system"] == "dynamodb"
+    assert span["attributes"]["key_count"] == 2
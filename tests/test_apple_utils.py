@@ -1,9 +1,75 @@
-from unittest.mock import patch
+import json
+import os
+import subprocess
+import sys
+from unittest.mock import MagicMock, patch
 
+import pytest
+
+from lambdas import apple_utils
 from lambdas.apple_utils import (
+    DynamoDBItemNotFound,
+    DynamoDBWriteError,
+    ReleaseNotificationError,
+    append_release_history,
+    cache_release_state,
+    coalesce_errors,
+    create_dynamodb_resource,
+    env_int,
+    get_device_item,
+    get_cached_device_items,
+    get_device_items,
+    get_page_states,
+    get_release_history,
+    invalidate_release_state,
+    update_page_state,
     notify_error,
+    publish_device_notifications,
     publish_release_notification,
+    release_history_sort_key,
+    release_state_cache_stats,
 )
+from tests.conftest import count_api_calls
+
+DEVICES = ["iOS", "macOS", "watchOS", "tvOS", "visionOS"]
+LAMBDA_DIR = os.path.join(os.path.dirname(__file__), "..", "lambdas")
+
+
+def test_import_defers_boto3_and_bs4():
+    # Flat imports, as in the Lambda runtime
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, apple_web_scrape;"
+            "print(sorted(m for m in ('boto3.session', 'bs4') if m in sys.modules))",
+        ],
+        cwd=LAMBDA_DIR,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.stdout.strip() == "[]"
+
+
+def test_env_int_falls_back_on_missing_or_invalid_values(monkeypatch):
+    monkeypatch.setenv("example_seconds", "30")
+    assert env_int("example_seconds", 60) == 30
+    monkeypatch.setenv("example_seconds", "soon")
+    assert env_int("example_seconds", 60) == 60
+    monkeypatch.delenv("example_seconds")
+    assert env_int("example_seconds", 60) == 60
+
+
+def test_aws_clients_are_memoized(aws_credentials):
+    with patch.dict(apple_utils._aws, clear=True):
+        assert apple_utils.get_sns_client() is apple_utils.get_sns_client()
+        assert apple_utils.sns_client is apple_utils.get_sns_client()
+        assert create_dynamodb_resource() is apple_utils.get_dynamodb_resource()
+        assert create_dynamodb_resource(region_name="us-west-2") is not (
+            apple_utils.get_dynamodb_resource()
+        )
 
 
 @patch("lambdas.apple_utils.sns_client.publish")
@@ -53,6 +119,92 @@ def test_publish_release_notification_publishes_when_topic_configured(mock_publi
     )
 
 
+RELEASE_TOPIC = {
+    "release_notification_topic_arn": "arn:aws:sns:us-east-2:123456789012:releases"
+}
+
+
+def _changed_releases(count):
+    return [
+        {
+            "device": DEVICES[index % len(DEVICES)],
+            "release_version": (
+                f"{26 + index // len(DEVICES)}.0" if index % 2 else "26.0.1"
+            ),
+            "release_statement": "release notice",
+        }
+        for index in range(count)
+    ]
+
+
+@patch("lambdas.apple_utils.get_sns_client")
+def test_publish_device_notifications_chunks_by_10(mock_get_sns_client):
+    mock_sns = mock_get_sns_client.return_value
+    mock_sns.publish_batch.return_value = {"Successful": [], "Failed": []}
+
+    with patch.dict("os.environ", RELEASE_TOPIC):
+        published = publish_device_notifications(_changed_releases(23))
+
+    assert published == 23
+    batches = [
+        call.kwargs["PublishBatchRequestEntries"]
+        for call in mock_sns.publish_batch.call_args_list
+    ]
+    assert [len(batch) for batch in batches] == [10, 10, 3]
+    assert all(
+        call.kwargs["TopicArn"] == RELEASE_TOPIC["release_notification_topic_arn"]
+        for call in mock_sns.publish_batch.call_args_list
+    )
+    ids = [entry["Id"] for batch in batches for entry in batch]
+    assert len(set(ids)) == 23
+    mock_sns.publish.assert_not_called()
+
+
+@patch("lambdas.apple_utils.get_sns_client")
+def test_publish_device_notifications_sets_filter_attributes(mock_get_sns_client):
+    mock_sns = mock_get_sns_client.return_value
+    mock_sns.publish_batch.return_value = {"Successful": [], "Failed": []}
+    releases = [
+        {"device": "macOS", "release_version": "26.0", "release_statement": "a"},
+        {"device": "iOS", "release_version": "18.7.1", "release_statement": "b"},
+    ]
+
+    with patch.dict("os.environ", RELEASE_TOPIC):
+        publish_device_notifications(releases)
+
+    macos, ios = mock_sns.publish_batch.call_args.kwargs["PublishBatchRequestEntries"]
+    assert macos["MessageAttributes"] == {
+        "device": {"DataType": "String", "StringValue": "macOS"},
+        "major_version": {"DataType": "Number", "StringValue": "26"},
+        "is_major_release": {"DataType": "String", "StringValue": "true"},
+    }
+    assert ios["MessageAttributes"]["major_version"]["StringValue"] == "18"
+    assert ios["MessageAttributes"]["is_major_release"]["StringValue"] == "false"
+    assert "iOS 18.7.1" in ios["Subject"]
+
+
+@patch("lambdas.apple_utils.get_sns_client")
+def test_publish_device_notifications_raises_on_failed_entries(mock_get_sns_client):
+    mock_sns = mock_get_sns_client.return_value
+    mock_sns.publish_batch.return_value = {
+        "Successful": [],
+        "Failed": [{"Id": "release-0", "Code": "InternalError"}],
+    }
+
+    with patch.dict("os.environ", RELEASE_TOPIC):
+        with pytest.raises(ReleaseNotificationError):
+            publish_device_notifications(_changed_releases(1))
+
+
+@patch("lambdas.apple_utils.get_sns_client")
+def test_publish_device_notifications_noop_without_topic(mock_get_sns_client):
+    mock_sns = mock_get_sns_client.return_value
+    with patch.dict("os.environ", {}, clear=True):
+        assert publish_device_notifications(_changed_releases(3)) == 0
+
+    mock_sns.publish_batch.assert_not_called()
+
+
 @patch("lambdas.apple_utils.sns_client.publish")
 def test_publish_release_notification_noop_without_topic(mock_publish):
     with patch.dict("os.environ", {}, clear=True):
@@ -62,3 +214,316 @@ def test_publish_release_notification_noop_without_topic(mock_publish):
         )
 
     mock_publish.assert_not_called()
+
+
+def test_get_device_items_single_round_trip(release_table):
+    for device in DEVICES:
+        release_table.put_item(Item={"device": device, "ReleaseVersion": "26.0.1"})
+    calls = count_api_calls(release_table.meta.client)
+
+    items = get_device_items(release_table, DEVICES + ["missingOS"])
+
+    assert set(items) == set(DEVICES)
+    assert items["iOS"]["ReleaseVersion"] == "26.0.1"
+    assert calls == {"BatchGetItem": 1}
+
+
+def test_get_device_items_round_trips_compared_to_get_item(release_table):
+    for device in DEVICES:
+        release_table.put_item(Item={"device": device, "ReleaseVersion": "26.0.1"})
+    calls = count_api_calls(release_table.meta.client)
+
+    for device in DEVICES:
+        get_device_item(release_table, device)
+    get_device_items(release_table, DEVICES)
+
+    assert calls == {"GetItem": len(DEVICES), "BatchGetItem": 1}
+
+
+@patch("lambdas.apple_utils.time.sleep")
+def test_get_device_items_retries_unprocessed_keys(mock_sleep):
+    table = MagicMock()
+    table.name = "apple_os_updates_test"
+    table.meta.client.batch_get_item.side_effect = [
+        {
+            "Responses": {table.name: [{"device": "iOS", "ReleaseVersion": "26.0.1"}]},
+            "UnprocessedKeys": {table.name: {"Keys": [{"device": "macOS"}]}},
+        },
+        {
+            "Responses": {
+                table.name: [{"device": "macOS", "ReleaseVersion": "26.0.1"}]
+            },
+            "UnprocessedKeys": {},
+        },
+    ]
+
+    items = get_device_items(table, ["iOS", "macOS"])
+
+    assert set(items) == {"iOS", "macOS"}
+    assert table.meta.client.batch_get_item.call_count == 2
+    retry_request = table.meta.client.batch_get_item.call_args_list[1].kwargs
+    assert retry_request["RequestItems"] == {
+        table.name: {"Keys": [{"device": "macOS"}]}
+    }
+    mock_sleep.assert_called_once()
+
+
+@patch("lambdas.apple_utils.time.sleep")
+def test_get_device_items_gives_up_on_persistent_unprocessed_keys(mock_sleep):
+    table = MagicMock()
+    table.name = "apple_os_updates_test"
+    table.meta.client.batch_get_item.return_value = {
+        "Responses": {},
+        "UnprocessedKeys": {table.name: {"Keys": [{"device": "iOS"}]}},
+    }
+
+    with pytest.raises(DynamoDBItemNotFound):
+        get_device_items(table, ["iOS"])
+
+
+def test_page_states_round_trip(release_table):
+    en_url = "https://support.apple.com/en-us/100100"
+    de_url = "https://support.apple.com/de-de/100100"
+
+    assert update_page_state(
+        release_table, en_url, {"ETag": '"v1"', "LastModified": None}
+    )
+    states = get_page_states(release_table, [en_url, de_url])
+
+    assert states == {en_url: {"ETag": '"v1"'}, de_url: {}}
+
+
+def test_update_page_state_removes_validators_the_server_dropped(release_table):
+    url = "https://support.apple.com/en-us/100100"
+    update_page_state(
+        release_table,
+        url,
+        {"ETag": '"v1"', "LastModified": "Mon, 13 Oct 2025 08:00:00 GMT"},
+    )
+
+    assert update_page_state(release_table, url, {"ETag": None, "LastModified": None})
+
+    stored = release_table.get_item(Key={"device": f"page#{url}"})["Item"]
+    assert "ETag" not in stored and "LastModified" not in stored
+    assert get_page_states(release_table, [url]) == {url: {}}
+
+
+def test_release_state_cache_serves_warm_reads(release_table):
+    release_table.put_item(Item={"device": "iOS", "ReleaseVersion": "26.0.1"})
+    calls = count_api_calls(release_table.meta.client)
+
+    first = get_cached_device_items(release_table, ["iOS", "macOS"])
+    second = get_cached_device_items(release_table, ["iOS", "macOS"])
+
+    # macOS has no item; the absence is cached too
+    assert first == second == {"iOS": {"device": "iOS", "ReleaseVersion": "26.0.1"}}
+    assert calls == {"BatchGetItem": 1}
+    assert release_state_cache_stats() == {"hits": 2, "misses": 2, "size": 2}
+
+
+def test_release_state_cache_expires_and_stays_bounded(release_table, monkeypatch):
+    monkeypatch.setenv("release_state_cache_ttl_seconds", "60")
+    monkeypatch.setattr(apple_utils, "RELEASE_STATE_CACHE_MAX_ENTRIES", 2)
+    clock = [1000.0]
+    monkeypatch.setattr(apple_utils.time, "monotonic", lambda: clock[0])
+    calls = count_api_calls(release_table.meta.client)
+
+    get_cached_device_items(release_table, ["iOS", "macOS", "tvOS"])
+    assert release_state_cache_stats()["size"] == 2
+    get_cached_device_items(release_table, ["iOS"])
+    assert calls == {"BatchGetItem": 2}
+
+    clock[0] += 60
+    get_cached_device_items(release_table, ["tvOS"])
+    assert calls == {"BatchGetItem": 3}
+
+
+def test_release_state_cache_write_through_and_invalidate(release_table):
+    calls = count_api_calls(release_table.meta.client)
+
+    cache_release_state(release_table, "iOS", {"ReleaseVersion": "26.0.1"})
+    assert get_cached_device_items(release_table, ["iOS"]) == {
+        "iOS": {"device": "iOS", "ReleaseVersion": "26.0.1"}
+    }
+    assert calls == {}
+
+    invalidate_release_state(release_table, "iOS")
+    assert get_cached_device_items(release_table, ["iOS"]) == {}
+    assert calls == {"BatchGetItem": 1}
+
+
+def test_release_state_cache_off_with_zero_ttl(release_table, monkeypatch):
+    monkeypatch.setenv("release_state_cache_ttl_seconds", "0")
+    calls = count_api_calls(release_table.meta.client)
+
+    cache_release_state(release_table, "iOS", {"ReleaseVersion": "26.0.1"})
+    get_cached_device_items(release_table, ["iOS"])
+    get_cached_device_items(release_table, ["iOS"])
+
+    assert calls == {"BatchGetItem": 2}
+    assert release_state_cache_stats()["size"] == 0
+
+
+def test_release_history_sort_key_orders_versions():
+    versions = ["9.3.6", "26", "16.5.1 (c)", "16.5.1", "26.0.1", "16.10"]
+
+    ordered = sorted(versions, key=release_history_sort_key)
+
+    assert ordered == ["9.3.6", "16.5.1", "16.5.1 (c)", "16.10", "26", "26.0.1"]
+    assert release_history_sort_key("26") == release_history_sort_key("26.0")
+    with pytest.raises(ValueError):
+        release_history_sort_key("Tahoe")
+
+
+@pytest.fixture
+def ios_history(history_table):
+    """Fill the history table with 150 iOS releases (18.0 .. 18.149)."""
+    apple_utils._release_history_cache.clear()
+    with history_table.batch_writer() as batch:
+        for minor in range(150):
+            batch.put_item(
+                Item={
+                    "device": "iOS",
+                    "VersionKey": release_history_sort_key(f"18.{minor}"),
+                    "ReleaseVersion": f"18.{minor}",
+                }
+            )
+    yield history_table
+    apple_utils._release_history_cache.clear()
+
+
+def test_get_release_history_pages_newest_first(ios_history, monkeypatch):
+    monkeypatch.setattr(apple_utils, "HISTORY_QUERY_PAGE_SIZE", 40)
+    calls = count_api_calls(ios_history.meta.client)
+
+    items = get_release_history(ios_history, "iOS", limit=100)
+
+    assert len(items) == 100
+    assert items[0]["ReleaseVersion"] == "18.149"
+    assert items[-1]["ReleaseVersion"] == "18.50"
+    assert calls == {"Query": 3}
+
+
+def test_get_release_history_since_is_inclusive(ios_history):
+    items = get_release_history(ios_history, "iOS", since="18.145")
+
+    assert [item["ReleaseVersion"] for item in items] == [
+        "18.149",
+        "18.148",
+        "18.147",
+        "18.146",
+        "18.145",
+    ]
+    assert get_release_history(ios_history, "macOS") == []
+
+
+def test_get_release_history_caches_until_ttl(ios_history, monkeypatch):
+    calls = count_api_calls(ios_history.meta.client)
+    clock = [1000.0]
+    monkeypatch.setattr(apple_utils.time, "monotonic", lambda: clock[0])
+
+    get_release_history(ios_history, "iOS", limit=5)
+    get_release_history(ios_history, "iOS", limit=5)
+    assert calls == {"Query": 1}
+
+    clock[0] += apple_utils.HISTORY_CACHE_TTL_SECONDS
+    get_release_history(ios_history, "iOS", limit=5)
+    assert calls == {"Query": 2}
+
+
+def test_append_release_history_keeps_backfilled_attributes(ios_history):
+    ios_history.put_item(
+        Item={
+            "device": "iOS",
+            "VersionKey": release_history_sort_key("26.0.1"),
+            "ReleaseVersion": "26.0.1",
+            "ReleaseDate": "2025-09-29",
+            "NotesUrl": "https://support.apple.com/en-us/125108",
+        }
+    )
+    assert get_release_history(ios_history, "iOS", limit=1)[0]["ReleaseDate"] == (
+        "2025-09-29"
+    )
+
+    assert append_release_history(
+        ios_history, "iOS", "26.0.1", "release notice", "2025-09-30"
+    )
+    assert append_release_history(
+        ios_history, "iOS", "26.0.2", "release notice", "2025-10-01"
+    )
+
+    latest, previous = get_release_history(ios_history, "iOS", limit=2)
+    assert latest["ReleaseVersion"] == "26.0.2"
+    assert latest["ReleaseDate"] == "2025-10-01"
+    assert previous["ReleaseDate"] == "2025-09-29"
+    assert previous["NotesUrl"] == "https://support.apple.com/en-us/125108"
+    assert previous["ReleaseStatement"] == "release notice"
+
+
+ALERT_TOPIC = {"error_alert_topic_arn": "arn:aws:sns:us-east-2:123456789012:alerts"}
+
+
+@patch("lambdas.apple_utils.sns_client.publish")
+def test_coalesce_errors_flushes_one_message(mock_publish):
+    with patch.dict("os.environ", ALERT_TOPIC):
+        with coalesce_errors(source="apple_web_scrape"):
+            notify_error("apple_web_scrape", "fetch failed", {"status": 503})
+            notify_error("apple_web_scrape", "fetch failed", {"status": 503})
+            notify_error("apple_web_scrape", "parse failed")
+            mock_publish.assert_not_called()
+
+    mock_publish.assert_called_once()
+    message = json.loads(mock_publish.call_args.kwargs["Message"])
+    assert [(e["error_message"], e["occurrences"]) for e in message["errors"]] == [
+        ("fetch failed", 2),
+        ("parse failed", 1),
+    ]
+
+
+@patch("lambdas.apple_utils.sns_client.publish")
+def test_coalesce_errors_suppresses_repeats_within_window(
+    mock_publish, release_table, monkeypatch
+):
+    clock = [1_760_000_000.0]
+    monkeypatch.setattr(apple_utils.time, "time", lambda: clock[0])
+    monkeypatch.setenv("error_alert_topic_arn", ALERT_TOPIC["error_alert_topic_arn"])
+    monkeypatch.setenv("error_alert_window_seconds", "3600")
+
+    def failing_run():
+        with coalesce_errors(source="apple_web_scrape", table=release_table):
+            notify_error("apple_web_scrape", "fetch failed", {"status": 503})
+
+    failing_run()
+    assert mock_publish.call_count == 1
+
+    # Two more hourly-ish runs inside the window are suppressed and counted
+    clock[0] += 600
+    failing_run()
+    clock[0] += 600
+    failing_run()
+    assert mock_publish.call_count == 1
+
+    clock[0] += 3600
+    failing_run()
+    assert mock_publish.call_count == 2
+    message = json.loads(mock_publish.call_args.kwargs["Message"])
+    assert message["errors"][0]["suppressed_count"] == 2
+
+    alert_items = [
+        item
+        for item in release_table.scan()["Items"]
+        if item["device"].startswith("alert#")
+    ]
+    assert len(alert_items) == 1
+    assert alert_items[0]["ExpiresAt"] == int(clock[0]) + 7200
+
+
+@patch("lambdas.apple_utils.sns_client.publish")
+def test_coalesce_errors_skips_dynamodb_without_topic(mock_publish):
+    table = MagicMock()
+    with patch.dict("os.environ", {}, clear=True):
+        with coalesce_errors(source="apple_web_scrape", table=table):
+            notify_error("apple_web_scrape", "fetch failed")
+
+    table.update_item.assert_not_called()
+    mock_publish.assert_not_called()
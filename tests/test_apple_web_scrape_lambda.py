@@ -1,7 +1,11 @@
+import json
 import pytest
 import re
+import time
 from unittest.mock import patch, MagicMock
 from lambdas import apple_web_scrape as aws
+from lambdas.apple_utils import get_cached_device_items
+from tests.conftest import count_api_calls
 
 
 # -------------------------------------------------------------------------
@@ -44,10 +48,8 @@ def sample_html():
 # -------------------------------------------------------------------------
 # fetch_apple_release_page
 # -------------------------------------------------------------------------
-@patch("lambdas.apple_web_scrape.urllib3.PoolManager")
-def test_fetch_apple_release_page_success(mock_pool):
-    mock_http = MagicMock()
-    mock_pool.return_value = mock_http
+@patch("lambdas.apple_web_scrape.http_client")
+def test_fetch_apple_release_page_success(mock_http):
     mock_http.request.return_value.status = 200
     mock_http.request.return_value.data = b"<html></html>"
 
@@ -56,11 +58,9 @@ def test_fetch_apple_release_page_success(mock_pool):
     assert "<html>" in result
 
 
-@patch("lambdas.apple_web_scrape.urllib3.PoolManager")
+@patch("lambdas.apple_web_scrape.http_client")
 @patch("lambdas.apple_web_scrape.notify_error")
-def test_fetch_apple_release_page_failure(mock_notify, mock_pool):
-    mock_http = MagicMock()
-    mock_pool.return_value = mock_http
+def test_fetch_apple_release_page_failure(mock_notify, mock_http):
     mock_http.request.return_value.status = 404
 
     result = aws.fetch_apple_release_page("https://mock.url")
@@ -68,6 +68,229 @@ def test_fetch_apple_release_page_failure(mock_notify, mock_pool):
     mock_notify.assert_called_once()
 
 
+def _validator_responder(etag, last_modified, body):
+    """Answer like a server honouring If-None-Match for a single representation."""
+
+    def respond(handler):
+        if handler.headers.get("If-None-Match") == etag:
+            return 304, {"ETag": etag}, b""
+        return 200, {"ETag": etag, "Last-Modified": last_modified}, body
+
+    return respond
+
+
+def test_fetch_apple_release_page_records_validators(local_http_server):
+    local_http_server.responder = _validator_responder(
+        '"v1"', "Mon, 29 Sep 2025 17:00:00 GMT", b"<html>v1</html>"
+    )
+    page_state = {}
+
+    result = aws.fetch_apple_release_page(local_http_server.url, page_state=page_state)
+
+    assert result == "<html>v1</html>"
+    assert page_state == {
+        "ETag": '"v1"',
+        "LastModified": "Mon, 29 Sep 2025 17:00:00 GMT",
+    }
+    assert "If-None-Match" not in local_http_server.requests[0]
+
+
+def test_fetch_apple_release_page_not_modified(local_http_server):
+    local_http_server.responder = _validator_responder(
+        '"v1"', "Mon, 29 Sep 2025 17:00:00 GMT", b"<html>v1</html>"
+    )
+    page_state = {"ETag": '"v1"', "LastModified": "Mon, 29 Sep 2025 17:00:00 GMT"}
+
+    result = aws.fetch_apple_release_page(local_http_server.url, page_state=page_state)
+
+    assert result is aws.PAGE_NOT_MODIFIED
+    request_headers = local_http_server.requests[0]
+    assert request_headers["If-None-Match"] == '"v1"'
+    assert request_headers["If-Modified-Since"] == "Mon, 29 Sep 2025 17:00:00 GMT"
+
+
+def test_fetch_apple_release_page_changed_validators(local_http_server):
+    local_http_server.responder = _validator_responder(
+        '"v2"', "Tue, 30 Sep 2025 17:00:00 GMT", b"<html>v2</html>"
+    )
+    page_state = {"ETag": '"v1"', "LastModified": "Mon, 29 Sep 2025 17:00:00 GMT"}
+
+    result = aws.fetch_apple_release_page(local_http_server.url, page_state=page_state)
+
+    assert result == "<html>v2</html>"
+    assert page_state["ETag"] == '"v2"'
+    assert page_state["LastModified"] == "Tue, 30 Sep 2025 17:00:00 GMT"
+
+
+def test_fetch_apple_release_page_stream_stops_after_release_list(
+    local_http_server, sample_html
+):
+    padding = "<tr><td>security release row</td></tr>" * 200_000
+    page = sample_html.replace("</body>", f"<table>{padding}</table>FOOTER</body>")
+    local_http_server.responder = lambda handler: (200, {}, page.encode())
+
+    result = aws.fetch_apple_release_page(local_http_server.url, stream=True)
+
+    assert len(result) < len(page) // 10
+    assert "FOOTER" not in result
+    assert set(aws.parse_release_statements(result)) == set(aws.DEVICE_LIST)
+    assert local_http_server.bytes_sent < len(page)
+
+
+def test_fetch_apple_release_page_stream_ends_at_release_list(
+    local_http_server, sample_html
+):
+    # A second gb-list follows the release list; where the stream's chunk
+    # boundary falls must not change the prefix or its fingerprint
+    trailer = '<ul class="gb-list"><li>related article</li></ul>' * 2000
+    fingerprints = set()
+    for padding in (0, 123, 4567):
+        page = sample_html.replace(
+            "<body>", f"<body><div>{'x' * padding}</div>"
+        ).replace("</body>", f"{trailer}</body>")
+        local_http_server.responder = lambda handler: (200, {}, page.encode())
+
+        result = aws.fetch_apple_release_page(local_http_server.url, stream=True)
+
+        assert result.endswith("</ul>")
+        assert "related article" not in result
+        fingerprints.add(aws.compute_release_fingerprint(result))
+
+    assert len(fingerprints) == 1
+
+
+def test_fetch_apple_release_page_stream_reads_small_page_fully(
+    local_http_server, sample_html
+):
+    local_http_server.responder = lambda handler: (200, {}, sample_html.encode())
+
+    result = aws.fetch_apple_release_page(local_http_server.url, stream=True)
+
+    assert "visionOS" in result
+
+
+def test_fetch_apple_release_page_stream_not_modified(local_http_server):
+    local_http_server.responder = _validator_responder(
+        '"v1"', "Mon, 29 Sep 2025 17:00:00 GMT", b"<html>v1</html>"
+    )
+
+    result = aws.fetch_apple_release_page(
+        local_http_server.url, page_state={"ETag": '"v1"'}, stream=True
+    )
+
+    assert result is aws.PAGE_NOT_MODIFIED
+
+
+def test_fetch_apple_release_page_reuses_connection(local_http_server, sample_html):
+    local_http_server.responder = lambda handler: (200, {}, sample_html.encode())
+    aws.http_client.clear()
+
+    for _ in range(3):
+        assert "visionOS" in aws.fetch_apple_release_page(local_http_server.url)
+
+    assert len(local_http_server.requests) == 3
+    assert local_http_server.connections == 1
+
+
+@patch("urllib3.util.retry.time.sleep")
+def test_fetch_apple_release_page_retries_server_errors(
+    mock_sleep, local_http_server, sample_html
+):
+    statuses = iter([503, 503, 200])
+    local_http_server.responder = lambda handler: (
+        next(statuses),
+        {},
+        sample_html.encode(),
+    )
+
+    result = aws.fetch_apple_release_page(local_http_server.url)
+
+    assert "visionOS" in result
+    assert len(local_http_server.requests) == 3
+    # urllib3 retries the first failure immediately, then backs off
+    mock_sleep.assert_called_once()
+
+
+@patch("urllib3.util.retry.time.sleep")
+@patch("lambdas.apple_web_scrape.notify_error")
+def test_fetch_apple_release_page_stops_retrying_at_deadline(
+    mock_notify, mock_sleep, local_http_server
+):
+    local_http_server.responder = lambda handler: (503, {}, b"unavailable")
+
+    result = aws.fetch_apple_release_page(local_http_server.url, time_budget=0.5)
+
+    assert result is None
+    # The immediate first retry fits the budget; the backed-off second does not
+    assert len(local_http_server.requests) == 2
+    mock_sleep.assert_not_called()
+    mock_notify.assert_called_once()
+
+
+def test_remaining_time_budget():
+    context = MagicMock()
+    context.get_remaining_time_in_millis.return_value = 60_000
+
+    assert aws.remaining_time_budget(context) == 60 - aws.DEADLINE_SAFETY_MARGIN_SECONDS
+    assert aws.remaining_time_budget({}) is None
+
+
+# -------------------------------------------------------------------------
+# compute_release_fingerprint
+# -------------------------------------------------------------------------
+def test_compute_release_fingerprint_ignores_rest_of_page(sample_html):
+    first = aws.compute_release_fingerprint(
+        sample_html.replace("<body>", '<body><script>token="abc"</script>')
+    )
+    second = aws.compute_release_fingerprint(
+        sample_html.replace("<body>", '<body><script>token="xyz"</script>')
+    )
+    assert first is not None
+    assert first == second
+
+
+def test_compute_release_fingerprint_changes_with_release_text(sample_html):
+    before = aws.compute_release_fingerprint(sample_html)
+    after = aws.compute_release_fingerprint(sample_html.replace("26.0.2", "26.0.3"))
+    assert before != after
+
+
+def test_compute_release_fingerprint_skips_unterminated_list(sample_html):
+    complete = aws.compute_release_fingerprint(sample_html)
+    cut = sample_html.replace("</body>", '<ul class="gb-list"><li>related article</li>')
+    assert aws.compute_release_fingerprint(cut) == complete
+    assert aws.compute_release_fingerprint(cut + "<li>more</li>") == complete
+
+
+def test_compute_release_fingerprint_without_release_list():
+    assert aws.compute_release_fingerprint("<html><ul><li>x</li></ul></html>") is None
+
+
+@patch("lambdas.apple_web_scrape.parse_release_statements")
+@patch("lambdas.apple_web_scrape.fetch_apple_release_page")
+def test_get_latest_releases_fingerprint_hit(mock_fetch, mock_parse, sample_html):
+    mock_fetch.return_value = sample_html
+    page_state = {"ReleaseFingerprint": aws.compute_release_fingerprint(sample_html)}
+
+    result = aws.get_page_releases(aws.APPLE_RELEASE_URL, page_state=page_state)
+
+    assert result is aws.PAGE_NOT_MODIFIED
+    mock_parse.assert_not_called()
+
+
+@patch("lambdas.apple_web_scrape.fetch_apple_release_page")
+def test_get_latest_releases_fingerprint_miss(mock_fetch, sample_html):
+    mock_fetch.return_value = sample_html
+    page_state = {"ReleaseFingerprint": "stale"}
+
+    result = aws.get_page_releases(aws.APPLE_RELEASE_URL, page_state=page_state)
+
+    assert result["iOS"] == "26.0.1"
+    assert page_state["ReleaseFingerprint"] == aws.compute_release_fingerprint(
+        sample_html
+    )
+
+
 # -------------------------------------------------------------------------
 # parse_release_statements
 # -------------------------------------------------------------------------
@@ -92,6 +315,189 @@ def test_parse_release_statements_incomplete():
     assert isinstance(result, dict)
 
 
+def test_parse_release_paragraphs_fast_matches_soup(sample_html):
+    page = sample_html.replace(
+        "</body>",
+        '<ul class="gb-list"><li class="gb-list_item">'
+        '<p class="gb-paragraph">Security content &nbsp;table</p></li></ul></body>',
+    )
+    fast = aws.match_release_statements(aws.parse_release_paragraphs_fast(page))
+    soup = aws.match_release_statements(aws.parse_release_paragraphs_soup(page))
+    assert fast == soup
+    assert set(fast) == set(aws.DEVICE_LIST)
+
+
+def test_release_list_parser_stops_after_release_list(sample_html):
+    parser = aws.ReleaseListParser()
+    parser.feed(sample_html.replace("</body>", "<ul class='gb-list'><li>"))
+    parser.feed("<p class='gb-paragraph'>The latest version of iOS is 1.0</p>")
+
+    assert parser.done
+    assert len(parser.paragraphs) == 5
+
+
+@patch("lambdas.apple_web_scrape.parse_release_paragraphs_soup")
+def test_parse_release_statements_uses_fast_path(mock_soup, sample_html, caplog):
+    with caplog.at_level("INFO"):
+        result = aws.parse_release_statements(sample_html)
+
+    assert set(result) == set(aws.DEVICE_LIST)
+    mock_soup.assert_not_called()
+    assert "Release parse path: fast" in caplog.text
+
+
+def test_parse_release_statements_falls_back_to_soup(sample_html, caplog):
+    # The fast path stops after the first list holding release sentences, so
+    # devices split across a second list are only found by the soup path.
+    page = sample_html.replace(
+        """          <li class="gb-list_item">
+            <p class="gb-paragraph">The latest version of tvOS""",
+        """        </ul>
+        <ul class="gb-list">
+          <li class="gb-list_item">
+            <p class="gb-paragraph">The latest version of tvOS""",
+    )
+    with caplog.at_level("INFO"):
+        result = aws.parse_release_statements(page)
+
+    assert set(result) == set(aws.DEVICE_LIST)
+    assert "Release parse path: soup" in caplog.text
+
+
+# -------------------------------------------------------------------------
+# Localized pages
+# -------------------------------------------------------------------------
+def _localized_page(sentences):
+    items = "".join(
+        f'<li class="gb-list_item"><p class="gb-paragraph">{text}</p></li>'
+        for text in sentences
+    )
+    return f'<html><body><ul class="list gb-list">{items}</ul></body></html>'
+
+
+GERMAN_PAGE = _localized_page(
+    [
+        "Die neueste Version von iOS und iPadOS ist 26.1.",
+        "Die neueste Version von macOS ist 26.0.1.",
+        "Die neueste Version von watchOS ist 26.0.2.",
+        "Die neueste Version von tvOS ist 26.0.1.",
+        "Die neueste Version von visionOS ist 26.0.1.",
+    ]
+)
+
+JAPANESE_PAGE = _localized_page(
+    [
+        "iOS と iPadOS の最新バージョンは 26.0.1 です。",
+        "macOS の最新バージョンは 26.0.1 です。",
+        "watchOS の最新バージョンは 26.0.2 です。",
+        "tvOS の最新バージョンは 26.0.1 です。",
+        "visionOS の最新バージョンは 26.0.1 です。",
+    ]
+)
+
+
+def test_release_page_language():
+    assert aws.release_page_language("https://support.apple.com/de-de/100100") == "de"
+    assert aws.release_page_language("https://support.apple.com/en-gb/100100") == "en"
+    assert aws.release_page_language("https://support.apple.com/xx-yy/100100") == "en"
+
+
+def test_parse_release_statements_localized():
+    german = aws.parse_release_statements(GERMAN_PAGE, "de")
+    japanese = aws.parse_release_statements(JAPANESE_PAGE, "ja")
+
+    assert german["iOS"] == "Die neueste Version von iOS und iPadOS ist 26.1"
+    assert japanese["iOS"] == "iOS と iPadOS の最新バージョンは 26.0.1"
+    assert set(german) == set(japanese) == set(aws.DEVICE_LIST)
+    assert aws.extract_release_versions(japanese)["watchOS"] == "26.0.2"
+
+
+def test_merge_locale_releases_keeps_highest_version():
+    merged = aws.merge_locale_releases(
+        [
+            {
+                "iOS": "26.0.1",
+                "macOS": "26.0.10",
+                "release_statements": {"iOS": "en iOS", "macOS": "en macOS"},
+            },
+            {
+                "iOS": "26.1",
+                "macOS": "26.0.9",
+                "release_statements": {"iOS": "de iOS", "macOS": "de macOS"},
+            },
+        ]
+    )
+
+    assert merged["iOS"] == "26.1"
+    assert merged["macOS"] == "26.0.10"
+    assert merged["release_statements"] == {"iOS": "de iOS", "macOS": "en macOS"}
+
+
+def _locale_responder(pages, delay=0.0):
+    def respond(handler):
+        time.sleep(delay)
+        locale = handler.path.split("/")[1]
+        return 200, {"ETag": f'"{locale}"'}, pages[locale].encode()
+
+    return respond
+
+
+def test_get_latest_releases_fetches_locales_concurrently(
+    local_http_server, sample_html
+):
+    pages = {"en-us": sample_html, "de-de": GERMAN_PAGE, "ja-jp": JAPANESE_PAGE}
+    local_http_server.responder = _locale_responder(pages, delay=0.3)
+    base = local_http_server.url.rsplit("/en-us/", 1)[0]
+    urls = [f"{base}/{locale}/100100" for locale in pages]
+
+    start = time.perf_counter()
+    result = aws.get_latest_releases(urls=urls, page_states={})
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.3 * 2
+    assert result["iOS"] == "26.1"
+    assert result["release_statements"]["iOS"].startswith("Die neueste Version")
+    assert result["macOS"] == "26.0.1"
+    assert result["release_statements"]["macOS"].startswith("The latest version")
+
+
+def test_get_latest_releases_unchanged_only_when_all_locales_unchanged(
+    local_http_server, sample_html
+):
+    pages = {"en-us": sample_html, "de-de": GERMAN_PAGE}
+    local_http_server.responder = _locale_responder(pages)
+    base = local_http_server.url.rsplit("/en-us/", 1)[0]
+    urls = [f"{base}/{locale}/100100" for locale in pages]
+    page_states = {}
+
+    aws.get_latest_releases(urls=urls, page_states=page_states)
+    assert aws.get_latest_releases(urls=urls, page_states=page_states) is (
+        aws.PAGE_NOT_MODIFIED
+    )
+
+    # de-de changes: en-us is fingerprint-unchanged but is still merged
+    pages["de-de"] = GERMAN_PAGE.replace("26.1", "26.2")
+    result = aws.get_latest_releases(urls=urls, page_states=page_states)
+    assert result["iOS"] == "26.2"
+    assert result["macOS"] == "26.0.1"
+
+
+@patch("lambdas.apple_web_scrape.get_page_releases")
+def test_get_latest_releases_fails_when_a_locale_fails(mock_page_releases):
+    mock_page_releases.side_effect = lambda url, **kwargs: (
+        None if "de-de" in url else {"iOS": "26.0.1", "release_statements": {}}
+    )
+
+    result = aws.get_latest_releases(
+        urls=[
+            "https://support.apple.com/en-us/100100",
+            "https://support.apple.com/de-de/100100",
+        ]
+    )
+
+    assert result is None
+
+
 # -------------------------------------------------------------------------
 # extract_release_versions
 # -------------------------------------------------------------------------
@@ -171,6 +577,46 @@ def test_update_dynamodb_failure():
     assert result is False
 
 
+@patch("lambdas.apple_web_scrape.notify_error")
+def test_update_dynamodb_unchanged_version(mock_notify):
+    mock_table = MagicMock()
+    mock_table.update_item.side_effect = aws.ClientError(
+        {"Error": {"Code": "ConditionalCheckFailedException"}}, "update_item"
+    )
+    result = aws.update_dynamodb(mock_table, "iOS", "26.0.1", "Release info")
+    assert result is None
+    mock_notify.assert_not_called()
+
+
+def test_update_dynamodb_keeps_release_state_cache_in_step(release_table):
+    assert aws.update_dynamodb(release_table, "iOS", "26.0", "ios notice") is True
+    calls = count_api_calls(release_table.meta.client)
+    assert (
+        get_cached_device_items(release_table, aws.DEVICE_LIST)["iOS"]["ReleaseVersion"]
+        == "26.0"
+    )
+    assert "BatchGetItem" in calls and calls.pop("BatchGetItem") == 1
+
+    # Another container records 26.0.1; the rejected write drops the stale entry
+    release_table.put_item(Item={"device": "iOS", "ReleaseVersion": "26.0.1"})
+    assert aws.update_dynamodb(release_table, "iOS", "26.0.1", "ios notice") is None
+    assert (
+        get_cached_device_items(release_table, aws.DEVICE_LIST)["iOS"]["ReleaseVersion"]
+        == "26.0.1"
+    )
+    assert calls["BatchGetItem"] == 1
+
+
+def test_update_dynamodb_conditional_write(release_table):
+    assert aws.update_dynamodb(release_table, "iOS", "26.0.1", "first") is True
+    assert aws.update_dynamodb(release_table, "iOS", "26.0.1", "again") is None
+    assert aws.update_dynamodb(release_table, "iOS", "26.0.2", "newer") is True
+
+    item = release_table.get_item(Key={"device": "iOS"})["Item"]
+    assert item["ReleaseVersion"] == "26.0.2"
+    assert item["ReleaseStatement"] == "newer"
+
+
 # -------------------------------------------------------------------------
 # compare_and_update_releases
 # -------------------------------------------------------------------------
@@ -208,7 +654,6 @@ def test_update_dynamodb_failure():
 # lambda_handler
 # -------------------------------------------------------------------------
 @patch("lambdas.apple_web_scrape.update_dynamodb")
-@patch("lambdas.apple_web_scrape.get_device_item")
 @patch("lambdas.apple_web_scrape.get_latest_releases")
 @patch("lambdas.apple_web_scrape.publish_release_notification")
 @patch("lambdas.apple_web_scrape.create_dynamodb_resource")
@@ -216,7 +661,6 @@ def test_lambda_handler_success(
     mock_dynamo,
     mock_publish_release_notification,
     mock_latest,
-    mock_get_item,
     mock_update,
 ):
     mock_latest.return_value = {
@@ -234,8 +678,8 @@ def test_lambda_handler_success(
         },
     }
 
-    # Simulate DynamoDB having an older version
-    mock_get_item.return_value = {"ReleaseVersion": "25.0.9"}
+    # Simulate DynamoDB accepting every conditional write (older versions stored)
+    mock_update.return_value = True
 
     mock_table = MagicMock()
     mock_dynamo.return_value.Table.return_value = mock_table
@@ -251,8 +695,55 @@ def test_lambda_handler_success(
     assert "visionOS" in message
 
 
+@patch("lambdas.apple_web_scrape.notify_subscribers")
+@patch("lambdas.apple_web_scrape.publish_release_notification")
+@patch("lambdas.apple_web_scrape.create_dynamodb_resource")
+def test_publish_release_changes_delivers_to_registry_subscribers(
+    mock_dynamo, mock_publish_release_notification, mock_notify_subscribers, monkeypatch
+):
+    changed = [{"device": "iOS", "release_version": "26.0.1", "release_statement": "s"}]
+
+    aws.publish_release_changes(changed)
+    mock_notify_subscribers.assert_not_called()
+
+    monkeypatch.setenv("subscription_table_name", "mock_subscriptions")
+    aws.publish_release_changes(changed)
+
+    mock_dynamo.return_value.Table.assert_called_with("mock_subscriptions")
+    mock_notify_subscribers.assert_called_once_with(
+        mock_dynamo.return_value.Table.return_value, changed
+    )
+    assert mock_publish_release_notification.call_count == 2
+
+
+@patch("lambdas.apple_web_scrape.update_page_state")
+@patch("lambdas.apple_web_scrape.get_page_states", return_value={})
+@patch("lambdas.apple_web_scrape.update_dynamodb", return_value=True)
+@patch("lambdas.apple_web_scrape.get_latest_releases")
+@patch("lambdas.apple_web_scrape.publish_release_notification")
+@patch("lambdas.apple_web_scrape.create_dynamodb_resource")
+def test_lambda_handler_leaves_publishing_to_stream_mode(
+    mock_dynamo,
+    mock_publish_release_notification,
+    mock_latest,
+    mock_update,
+    mock_get_page_states,
+    mock_update_page_state,
+    monkeypatch,
+):
+    monkeypatch.setenv("release_notification_mode", "stream")
+    mock_latest.return_value = {
+        "iOS": "26.0.1",
+        "release_statements": {"iOS": "release notice"},
+    }
+
+    aws.lambda_handler({}, {})
+
+    mock_update.assert_called_once()
+    mock_publish_release_notification.assert_not_called()
+
+
 @patch("lambdas.apple_web_scrape.update_dynamodb")
-@patch("lambdas.apple_web_scrape.get_device_item")
 @patch("lambdas.apple_web_scrape.get_latest_releases")
 @patch("lambdas.apple_web_scrape.publish_release_notification")
 @patch("lambdas.apple_web_scrape.create_dynamodb_resource")
@@ -260,7 +751,6 @@ def test_lambda_handler_no_release_changes(
     mock_dynamo,
     mock_publish_release_notification,
     mock_latest,
-    mock_get_item,
     mock_update,
 ):
     mock_latest.return_value = {
@@ -278,23 +768,196 @@ def test_lambda_handler_no_release_changes(
         },
     }
 
-    mock_get_item.side_effect = [
-        {"ReleaseVersion": "26.0.1"},
-        {"ReleaseVersion": "26.0.1"},
-        {"ReleaseVersion": "26.0.2"},
-        {"ReleaseVersion": "26.0.1"},
-        {"ReleaseVersion": "26.0.1"},
-    ]
+    # Conditional writes report every version as already stored
+    mock_update.return_value = None
 
     mock_table = MagicMock()
     mock_dynamo.return_value.Table.return_value = mock_table
 
     aws.lambda_handler({}, {})
 
-    mock_update.assert_not_called()
+    assert mock_update.call_count == 5
     mock_publish_release_notification.assert_not_called()
 
 
+@patch("lambdas.apple_web_scrape.notify_error")
+@patch("lambdas.apple_web_scrape.append_release_history")
+@patch("lambdas.apple_web_scrape.update_page_state")
+@patch("lambdas.apple_web_scrape.get_page_states", return_value={})
+@patch("lambdas.apple_web_scrape.update_dynamodb")
+@patch("lambdas.apple_web_scrape.get_latest_releases")
+@patch("lambdas.apple_web_scrape.publish_release_notification")
+@patch("lambdas.apple_web_scrape.create_dynamodb_resource")
+def test_lambda_handler_appends_changes_to_history(
+    mock_dynamo,
+    mock_publish_release_notification,
+    mock_latest,
+    mock_update,
+    mock_get_page_states,
+    mock_update_page_state,
+    mock_append,
+    mock_notify,
+    monkeypatch,
+):
+    monkeypatch.setenv("history_table_name", "mock_history_table")
+    mock_latest.return_value = {
+        "iOS": "26.0.1",
+        "macOS": "26.0.1",
+        "release_statements": {"iOS": "iOS notice", "macOS": "macOS notice"},
+    }
+    # Only iOS is new; macOS was already stored
+    mock_update.side_effect = lambda table, device, **kwargs: (
+        True if device == "iOS" else None
+    )
+    mock_append.return_value = False
+
+    aws.lambda_handler({}, {})
+
+    mock_dynamo.return_value.Table.assert_any_call("mock_history_table")
+    mock_append.assert_called_once()
+    assert mock_append.call_args.kwargs["device"] == "iOS"
+    assert mock_append.call_args.kwargs["release_version"] == "26.0.1"
+    # A failed history append is reported but the run still notifies
+    mock_notify.assert_called_once()
+    mock_publish_release_notification.assert_called_once()
+
+
+@patch("lambdas.apple_web_scrape.update_page_state")
+@patch("lambdas.apple_web_scrape.get_page_states")
+@patch("lambdas.apple_web_scrape.update_dynamodb")
+@patch("lambdas.apple_web_scrape.parse_release_statements")
+@patch("lambdas.apple_web_scrape.create_dynamodb_resource")
+def test_lambda_handler_stops_on_not_modified(
+    mock_dynamo,
+    mock_parse,
+    mock_update,
+    mock_get_page_states,
+    mock_update_page_state,
+    local_http_server,
+    monkeypatch,
+):
+    local_http_server.responder = _validator_responder(
+        '"v1"', "Mon, 29 Sep 2025 17:00:00 GMT", b"<html>v1</html>"
+    )
+    monkeypatch.setattr(aws, "APPLE_RELEASE_URL", local_http_server.url)
+    mock_get_page_states.side_effect = lambda table, urls: {
+        url: {"ETag": '"v1"'} for url in urls
+    }
+
+    aws.lambda_handler({}, {})
+
+    mock_get_page_states.assert_called_once()
+    mock_parse.assert_not_called()
+    mock_update.assert_not_called()
+    mock_update_page_state.assert_not_called()
+
+
+@patch("lambdas.apple_web_scrape.update_page_state")
+@patch("lambdas.apple_web_scrape.get_page_states", return_value={})
+@patch("lambdas.apple_web_scrape.update_dynamodb", return_value=True)
+@patch("lambdas.apple_web_scrape.publish_release_notification")
+@patch("lambdas.apple_web_scrape.create_dynamodb_resource")
+def test_lambda_handler_persists_validators_after_updates(
+    mock_dynamo,
+    mock_publish,
+    mock_update,
+    mock_get_page_states,
+    mock_update_page_state,
+    local_http_server,
+    sample_html,
+    monkeypatch,
+):
+    local_http_server.responder = _validator_responder(
+        '"v2"', "Tue, 30 Sep 2025 17:00:00 GMT", sample_html.encode()
+    )
+    monkeypatch.setattr(aws, "APPLE_RELEASE_URL", local_http_server.url)
+
+    aws.lambda_handler({}, {})
+
+    assert mock_update.call_count == 5
+    mock_update_page_state.assert_called_once()
+    stored = mock_update_page_state.call_args.kwargs["page_state"]
+    assert stored["ETag"] == '"v2"'
+
+
+@patch("lambdas.apple_web_scrape.update_page_state")
+@patch("lambdas.apple_web_scrape.get_page_states", return_value={})
+@patch("lambdas.apple_web_scrape.update_dynamodb", return_value=False)
+@patch("lambdas.apple_web_scrape.publish_release_notification")
+@patch("lambdas.apple_web_scrape.create_dynamodb_resource")
+def test_lambda_handler_keeps_validators_when_update_fails(
+    mock_dynamo,
+    mock_publish,
+    mock_update,
+    mock_get_page_states,
+    mock_update_page_state,
+    local_http_server,
+    sample_html,
+    monkeypatch,
+):
+    local_http_server.responder = _validator_responder(
+        '"v2"', "Tue, 30 Sep 2025 17:00:00 GMT", sample_html.encode()
+    )
+    monkeypatch.setattr(aws, "APPLE_RELEASE_URL", local_http_server.url)
+
+    aws.lambda_handler({}, {})
+
+    mock_update_page_state.assert_not_called()
+
+
+@patch("lambdas.apple_web_scrape.update_page_state")
+@patch("lambdas.apple_web_scrape.get_page_states")
+@patch("lambdas.apple_web_scrape.update_dynamodb")
+@patch("lambdas.apple_web_scrape.create_dynamodb_resource")
+def test_lambda_handler_fingerprint_hit_refreshes_validators(
+    mock_dynamo,
+    mock_update,
+    mock_get_page_states,
+    mock_update_page_state,
+    local_http_server,
+    sample_html,
+    monkeypatch,
+):
+    local_http_server.responder = _validator_responder(
+        '"v3"', "Wed, 01 Oct 2025 17:00:00 GMT", sample_html.encode()
+    )
+    monkeypatch.setattr(aws, "APPLE_RELEASE_URL", local_http_server.url)
+    mock_get_page_states.side_effect = lambda table, urls: {
+        url: {
+            "ETag": '"v2"',
+            "ReleaseFingerprint": aws.compute_release_fingerprint(sample_html),
+        }
+        for url in urls
+    }
+
+    aws.lambda_handler({}, {})
+
+    mock_update.assert_not_called()
+    mock_update_page_state.assert_called_once()
+    assert mock_update_page_state.call_args.kwargs["page_state"]["ETag"] == '"v3"'
+
+
+@patch("lambdas.apple_web_scrape.get_latest_releases")
+@patch("lambdas.apple_web_scrape.publish_release_notification")
+@patch("lambdas.apple_web_scrape.create_dynamodb_resource")
+def test_lambda_handler_overlapping_runs_notify_once(
+    mock_dynamo, mock_publish, mock_latest, release_table
+):
+    mock_dynamo.return_value.Table.return_value = release_table
+    mock_latest.return_value = {
+        "iOS": "26.0.1",
+        "macOS": "26.0.1",
+        "release_statements": {"iOS": "ios notice", "macOS": "macos notice"},
+    }
+
+    aws.lambda_handler({}, {})
+    aws.lambda_handler({}, {})
+
+    mock_publish.assert_called_once()
+    subject, _ = mock_publish.call_args.args
+    assert "2 change(s) detected" in subject
+
+
 def test_format_combined_notification():
     subject, message = aws.format_combined_notification(
         [
@@ -323,3 +986,195 @@ def test_lambda_handler_missing_env(mock_notify, mock_dynamo, monkeypatch):
     aws.lambda_handler({}, {})
     mock_dynamo.assert_not_called()
     mock_notify.assert_called_once()
+
+
+@patch("lambdas.apple_utils.sns_client.publish")
+@patch("lambdas.apple_web_scrape.get_page_states", return_value={})
+@patch("lambdas.apple_web_scrape.get_latest_releases", return_value=None)
+@patch("lambdas.apple_web_scrape.create_dynamodb_resource")
+def test_lambda_handler_sends_one_coalesced_error_alert(
+    mock_dynamo,
+    mock_latest,
+    mock_get_page_states,
+    mock_publish,
+    release_table,
+    monkeypatch,
+):
+    monkeypatch.setenv("error_alert_topic_arn", "arn:aws:sns:us-east-2:123456789012:a")
+    mock_dynamo.return_value.Table.return_value = release_table
+
+    aws.lambda_handler({}, {})
+    aws.lambda_handler({}, {})
+
+    # The second failing run falls inside the suppression window
+    mock_publish.assert_called_once()
+    assert "apple_web_scrape" in mock_publish.call_args.kwargs["Subject"]
+
+
+@patch("lambdas.apple_web_scrape.get_page_states", return_value={})
+@patch("lambdas.apple_web_scrape.publish_release_notification")
+@patch("lambdas.apple_web_scrape.create_dynamodb_resource")
+def test_lambda_handler_emits_phase_metrics(
+    mock_dynamo,
+    mock_publish_release_notification,
+    mock_get_page_states,
+    release_table,
+    local_http_server,
+    sample_html,
+    monkeypatch,
+    capsys,
+):
+    body = sample_html.encode("utf-8")
+    local_http_server.responder = lambda handler: (200, {}, body)
+    monkeypatch.setattr(aws, "APPLE_RELEASE_URL", local_http_server.url)
+    mock_dynamo.return_value.Table.return_value = release_table
+
+    aws.lambda_handler({}, {})
+
+    documents = [
+        json.loads(line)
+        for line in capsys.readouterr().out.splitlines()
+        if line.startswith("{")
+    ]
+    (document,) = [d for d in documents if "_aws" in d]
+    names = {m["Name"] for m in document["_aws"]["CloudWatchMetrics"][0]["Metrics"]}
+    assert {
+        "FetchTime",
+        "ParseTime",
+        "ExtractTime",
+        "DynamoDBTime",
+        "SNSTime",
+        "BytesDownloaded",
+        "ColdStart",
+    } <= names
+    assert document["BytesDownloaded"] == len(body)
+    mock_publish_release_notification.assert_called_once()
+
+
+@patch("lambdas.apple_web_scrape.get_page_states", return_value={})
+@patch("lambdas.apple_web_scrape.publish_release_notification")
+@patch("lambdas.apple_web_scrape.create_dynamodb_resource")
+def test_lambda_handler_concurrent_pipeline_writes_every_device(
+    mock_dynamo,
+    mock_publish_release_notification,
+    mock_get_page_states,
+    release_table,
+    local_http_server,
+    sample_html,
+    monkeypatch,
+):
+    monkeypatch.setenv("pipeline_mode", "concurrent")
+    monkeypatch.setattr(aws, "APPLE_RELEASE_URL", local_http_server.url)
+    local_http_server.responder = lambda handler: (200, {}, sample_html.encode())
+    mock_dynamo.return_value.Table.return_value = release_table
+    latest = aws.get_latest_releases([local_http_server.url])
+    for device, version in latest.items():
+        if device != "release_statements":
+            release_table.put_item(Item={"device": device, "ReleaseVersion": version})
+    release_table.put_item(Item={"device": "iOS", "ReleaseVersion": "26.0"})
+    calls = count_api_calls(release_table.meta.client)
+
+    aws.lambda_handler({}, {})
+
+    # A conditional write per device plus the page-validator write
+    assert calls == {"UpdateItem": len(latest) - 1 + 1}
+    assert release_table.get_item(Key={"device": "iOS"})["Item"]["ReleaseVersion"] == (
+        "26.0.1"
+    )
+    subject, _ = mock_publish_release_notification.call_args.args
+    assert "1 change(s) detected" in subject
+
+
+@patch("lambdas.apple_web_scrape.get_page_states", return_value={})
+@patch("lambdas.apple_web_scrape.publish_release_notification")
+@patch("lambdas.apple_web_scrape.create_dynamodb_resource")
+def test_lambda_handler_writes_despite_a_stale_release_state_cache(
+    mock_dynamo,
+    mock_publish_release_notification,
+    mock_get_page_states,
+    release_table,
+    local_http_server,
+    sample_html,
+    monkeypatch,
+):
+    monkeypatch.setenv("pipeline_mode", "concurrent")
+    monkeypatch.setattr(aws, "APPLE_RELEASE_URL", local_http_server.url)
+    local_http_server.responder = lambda handler: (200, {}, sample_html.encode())
+    mock_dynamo.return_value.Table.return_value = release_table
+    latest = aws.get_latest_releases([local_http_server.url])
+    for device, version in latest.items():
+        if device != "release_statements":
+            release_table.put_item(Item={"device": device, "ReleaseVersion": version})
+    # The cache says iOS is current, but another writer rolled the item back
+    aws.cache_release_state(release_table, "iOS", {"ReleaseVersion": latest["iOS"]})
+    release_table.put_item(Item={"device": "iOS", "ReleaseVersion": "26.0"})
+
+    aws.lambda_handler({}, {})
+
+    assert release_table.get_item(Key={"device": "iOS"})["Item"]["ReleaseVersion"] == (
+        latest["iOS"]
+    )
+    subject, _ = mock_publish_release_notification.call_args.args
+    assert "1 change(s) detected" in subject
+
+
+@patch("lambdas.apple_web_scrape.publish_release_notification")
+@patch("lambdas.apple_web_scrape.create_dynamodb_resource")
+def test_lambda_handler_forgets_validators_the_server_stops_sending(
+    mock_dynamo,
+    mock_publish_release_notification,
+    release_table,
+    local_http_server,
+    sample_html,
+    monkeypatch,
+):
+    monkeypatch.setattr(aws, "APPLE_RELEASE_URL", local_http_server.url)
+    mock_dynamo.return_value.Table.return_value = release_table
+    local_http_server.responder = _validator_responder(
+        '"v1"', "Mon, 13 Oct 2025 08:00:00 GMT", sample_html.encode()
+    )
+    aws.lambda_handler({}, {})
+
+    # A CDN change: same page, but no validators on the 200
+    local_http_server.responder = lambda handler: (200, {}, sample_html.encode())
+    aws.lambda_handler({}, {})
+    aws.lambda_handler({}, {})
+
+    assert local_http_server.requests[1]["If-None-Match"] == '"v1"'
+    assert "If-None-Match" not in local_http_server.requests[2]
+    assert "If-Modified-Since" not in local_http_server.requests[2]
+
+
+@patch("lambdas.apple_web_scrape.publish_release_notification")
+@patch("lambdas.apple_web_scrape.create_dynamodb_resource")
+def test_lambda_handler_warm_unchanged_run_reads_nothing(
+    mock_dynamo,
+    mock_publish_release_notification,
+    release_table,
+    local_http_server,
+    sample_html,
+    monkeypatch,
+    capsys,
+):
+    monkeypatch.setenv("pipeline_mode", "concurrent")
+    monkeypatch.setattr(aws, "APPLE_RELEASE_URL", local_http_server.url)
+    local_http_server.responder = _validator_responder(
+        '"v1"', "Mon, 13 Oct 2025 08:00:00 GMT", sample_html.encode()
+    )
+    mock_dynamo.return_value.Table.return_value = release_table
+
+    aws.lambda_handler({}, {})
+    capsys.readouterr()
+    calls = count_api_calls(release_table.meta.client)
+    aws.lambda_handler({}, {})
+
+    assert not {"GetItem", "BatchGetItem", "Query", "Scan"} & set(calls)
+    assert local_http_server.requests[-1]["If-None-Match"] == '"v1"'
+    (document,) = [
+        json.loads(line)
+        for line in capsys.readouterr().out.splitlines()
+        if line.startswith("{") and "_aws" in line
+    ]
+    # The page state only; devices are never read
+    assert document["ReleaseStateCacheHits"] == 1
+    assert document["ReleaseStateCacheMisses"] == 0